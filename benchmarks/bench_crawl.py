@@ -0,0 +1,441 @@
+"""端到端抓取基准：本地模拟新闻源 + 完整 run_crawl，按阶段统计耗时
+
+本地启动一个 HTTP 模拟服务，按各新闻源真实接口的格式返回合成的列表（参考消息、澎湃、
+今日头条、华尔街见闻、财联社电报、36氪）与文章页，每个请求带可配置的延迟与抖动；
+抓取客户端的请求经 transport_hooks 转发到模拟服务。每次运行在临时工作目录中进行
+（复制 config/ 并关闭条件请求、增量解析、正文缓存、时间预算，data/ 每次清空），
+运行前清空去重缓存与熔断状态，多次运行的结果可以直接比较。
+
+输出每秒处理文章数与各阶段（list_fetch / parse / body_fetch / dedup / filter / db_write）的
+p50 / p95 耗时（多次运行取中位数）；--baseline 与之前保存的结果比较，
+超过阈值的退化逐项列出并以退出码 1 结束。
+
+用法：
+    python -m benchmarks.bench_crawl
+    python -m benchmarks.bench_crawl --items 50 --latency 50 --jitter 30 --runs 5 --output bench.json
+    python -m benchmarks.bench_crawl --baseline bench.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import yaml
+
+from benchmarks.bench_html_engine import synthetic_article
+from src.config import ConfigReader
+from src.config.models import LoggingConfig
+from src.crawlers import resilience
+from src.crawlers.spec_engine import SpecParser, parser_registry
+from src.tools.logging_setup import setup_logging, stop_logging
+
+STAGES = ("list_fetch", "parse", "body_fetch", "dedup", "filter", "db_write")
+
+# 文章页所在主机 -> 新闻源（按新闻源的正文容器生成文章页）
+ARTICLE_HOSTS = {
+    "china.cankaoxiaoxi.com": "cankaoxiaoxi",
+    "www.thepaper.cn": "thepaper",
+    "www.toutiao.com": "toutiao",
+    "wallstreetcn.com": "wallstreetcn-news",
+    "www.cls.cn": "cls-telegraph",
+    "www.36kr.com": "36kr",
+}
+
+# 标题素材：约一半标题含 news_keywords.yaml 中的关键词，能走到入库阶段
+KEYWORD_SUBJECTS = ["马斯克", "特斯拉", "星舰", "英伟达", "黄仁勋", "奥尔特曼", "SpaceX", "Grok"]
+OTHER_SUBJECTS = ["央行", "某城商行", "新能源车企", "光伏龙头", "券商研究所", "地方政府", "物流公司", "芯片设计公司"]
+ACTIONS = ["宣布", "回应", "披露", "计划推出", "被曝", "否认", "完成", "启动"]
+OBJECTS = [
+    "新一轮融资", "季度财报", "海外建厂计划", "裁员传闻", "新品发布会", "战略合作协议",
+    "监管问询", "产能扩张", "价格调整", "人事变动", "专利诉讼", "算力集群建设",
+]
+
+
+class SyntheticSites:
+    """合成的新闻源数据：列表按各接口格式生成，文章页按新闻源的正文容器生成"""
+
+    def __init__(self, items: int = 30, paragraphs: int = 40, seed: int = 0):
+        self.items = items
+        self.paragraphs = paragraphs
+        self.seed = seed
+        self.now = datetime.now()
+        # 发布时间都在今天（时间排重只保留今天的文章）
+        self.window = max(1, min(240, int((self.now - self.now.replace(hour=0, minute=0, second=0)).total_seconds() // 60)))
+        self.containers: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        for source in ConfigReader("config").load_news_sources_config().sources:
+            parser = parser_registry.get(source)
+            containers = parser.plan.containers if isinstance(parser, SpecParser) else parser.CONTENT_CONTAINERS
+            self.containers[source.id] = containers
+        self._pages: Dict[str, bytes] = {}
+
+    def _entries(self, key: str) -> List[Tuple[int, str, datetime]]:
+        """列表条目 [(编号, 标题, 发布时间)]（由 seed 与列表决定）"""
+        rng = random.Random(f"{self.seed}:{key}")
+        entries = []
+        for i in range(self.items):
+            subjects = KEYWORD_SUBJECTS if rng.random() < 0.5 else OTHER_SUBJECTS
+            title = f"{rng.choice(subjects)}{rng.choice(ACTIONS)}{rng.choice(OBJECTS)}，{rng.choice(OBJECTS)}或受影响（{key}-{i}）"
+            minutes = rng.randint(0, self.window - 1)
+            entries.append((rng.randrange(10 ** 8), title, self.now - timedelta(minutes=minutes)))
+        return entries
+
+    def listing(self, host: str, path: str) -> Optional[Tuple[str, bytes]]:
+        """列表响应 (content-type, body)，不是列表接口时返回 None"""
+        if host == "china.cankaoxiaoxi.com" and path.startswith("/json/channel/"):
+            channel = path.split("/")[3]
+            data = {"list": [
+                {"data": {
+                    "title": title,
+                    "url": f"https://china.cankaoxiaoxi.com/article/{channel}/{id_}.html",
+                    "publishTime": published.strftime("%Y-%m-%d %H:%M:%S"),
+                }}
+                for id_, title, published in self._entries(f"cankaoxiaoxi-{channel}")
+            ]}
+        elif host == "cache.thepaper.cn":
+            data = {"data": {"hotNews": [
+                {"name": title, "contId": str(id_), "pubTimeLong": int(published.timestamp() * 1000)}
+                for id_, title, published in self._entries("thepaper")
+            ]}}
+        elif host == "www.toutiao.com" and path.startswith("/hot-event/"):
+            data = {"data": [
+                {"ClusterIdStr": str(id_), "Title": title, "LabelUri": {"url": ""}}
+                for id_, title, _ in self._entries("toutiao")
+            ]}
+        elif host == "api-one.wallstcn.com" and path.endswith("/lives"):
+            data = {"data": {"items": [
+                {"title": title, "uri": f"https://wallstreetcn.com/livenews/{id_}", "display_time": int(published.timestamp())}
+                for id_, title, published in self._entries("wallstreetcn-live")
+            ]}}
+        elif host == "api-one.wallstcn.com" and path.endswith("/information-flow"):
+            data = {"data": {"items": [
+                {
+                    "resource_type": "ad" if i % 10 == 9 else "article",
+                    "resource": {
+                        "title": title,
+                        "uri": f"https://wallstreetcn.com/articles/{id_}",
+                        "display_time": int(published.timestamp()),
+                        "type": "article",
+                    },
+                }
+                for i, (id_, title, published) in enumerate(self._entries("wallstreetcn-news"))
+            ]}}
+        elif host == "www.cls.cn" and path.startswith("/nodeapi/"):
+            data = {"data": {"roll_data": [
+                {"id": id_, "title": title, "ctime": int(published.timestamp()), "is_ad": 0}
+                for id_, title, published in self._entries("cls-telegraph")
+            ]}}
+        elif host == "www.36kr.com" and path == "/newsflashes":
+            rows = "".join(
+                f"<div class='newsflash-item'><a class='item-title' href='/newsflashes/{id_}'>{title}</a>"
+                f"<span class='time'>{max(1, int((self.now - published).total_seconds() // 60))}分钟前</span></div>"
+                for id_, title, published in self._entries("36kr")
+            )
+            return "text/html; charset=utf-8", f"<html><body><div class='newsflash-list'>{rows}</div></body></html>".encode("utf-8")
+        else:
+            return None
+        return "application/json; charset=utf-8", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def article(self, host: str) -> Optional[bytes]:
+        """文章页（同一主机共用一份）"""
+        source_id = ARTICLE_HOSTS.get(host)
+        if source_id is None:
+            return None
+        if host not in self._pages:
+            self._pages[host] = synthetic_article(self.containers[source_id], self.paragraphs)
+        return self._pages[host]
+
+
+class StubServer:
+    """本地模拟服务：路径为 /{原主机}{原路径}，按种子与路径决定每个请求的延迟"""
+
+    def __init__(self, sites: SyntheticSites, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        """初始化
+
+        Args:
+            sites: 合成数据
+            latency: 每个请求的固定延迟（秒）
+            jitter: 额外随机延迟上限（秒）
+            seed: 随机种子
+        """
+        self.sites = sites
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.requests = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def delay(self, path: str) -> float:
+        if not self.jitter:
+            return self.latency
+        return self.latency + random.Random(f"{self.seed}:{path}").uniform(0, self.jitter)
+
+    def respond(self, raw_path: str) -> Tuple[int, str, bytes]:
+        """路由请求，返回 (状态码, content-type, 响应体)"""
+        host, _, rest = raw_path.lstrip("/").partition("/")
+        path = "/" + urlsplit(rest).path
+        listing = self.sites.listing(host, path)
+        if listing is not None:
+            return 200, listing[0], listing[1]
+        page = self.sites.article(host)
+        if page is not None:
+            return 200, "text/html; charset=utf-8", page
+        return 404, "text/plain", b"not found"
+
+    def start(self) -> str:
+        """在后台线程启动，返回服务地址"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests += 1
+                wait = stub.delay(self.path)
+                if wait > 0:
+                    time.sleep(wait)
+                status, content_type, body = stub.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class StubTransport(httpx.AsyncBaseTransport):
+    """把新闻源请求转发到模拟服务（https://host/path → {base}/host/path）"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, base: str):
+        self.transport = transport
+        self.base = base
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = request.url
+        target = httpx.URL(f"{self.base}/{url.host}{url.raw_path.decode('ascii')}")
+        proxied = httpx.Request(
+            request.method, target, headers=request.headers, stream=request.stream, extensions=request.extensions
+        )
+        return await self.transport.handle_async_request(proxied)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def prepare_workdir(origin: Path, workdir: Path, sources: Optional[List[str]], rate_limit: bool) -> None:
+    """复制配置到工作目录，并关闭会让多次运行结果不同的功能"""
+    shutil.copytree(origin / "config", workdir / "config", dirs_exist_ok=True)
+
+    crawler_file = workdir / "config" / "crawler_config.yaml"
+    crawler = yaml.safe_load(crawler_file.read_text(encoding="utf-8"))
+    crawler["strategy"].update({"conditional_fetch": False, "incremental": False})
+    crawler["storage"]["body_cache"] = False
+    crawler["budget"] = {"total": 0, "list": 0, "body": 0}
+    crawler.setdefault("rate_limit", {})["enabled"] = rate_limit
+    crawler_file.write_text(yaml.safe_dump(crawler, allow_unicode=True), encoding="utf-8")
+
+    if sources:
+        sources_file = workdir / "config" / "news_sources.yaml"
+        data = yaml.safe_load(sources_file.read_text(encoding="utf-8"))
+        for source in data["sources"]:
+            source["enabled"] = source["id"] in sources
+        sources_file.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+
+
+async def crawl_once(verbose: bool = False) -> Dict[str, Any]:
+    """清空缓存与数据后运行一次完整抓取"""
+    from src.api.crawl import run_crawl
+    from src.crawlers.dedup import today_news_cache
+    from src.crawlers.url_cache import url_cache
+
+    url_cache.clear()
+    today_news_cache.clear()
+    resilience.circuit_breakers.reset()
+    shutil.rmtree("data", ignore_errors=True)
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output:
+        result = await run_crawl()
+    elapsed = time.perf_counter() - start
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "articles": result["total_fetched"],
+        "saved": result["total_saved"],
+        "articles_per_sec": round(result["total_fetched"] / elapsed, 1) if elapsed else None,
+        "failed_sources": [s["id"] for s in result["sources"] if s["status"] != "success"],
+        "timings": result["timings"],
+    }
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """多次运行取中位数"""
+    stages = {}
+    for stage in STAGES:
+        timings = [run["timings"][stage] for run in runs if stage in run["timings"]]
+        if not timings:
+            continue
+        stages[stage] = {
+            key: round(statistics.median(t[key] for t in timings), 2)
+            for key in ("count", "p50_ms", "p95_ms", "total_ms")
+        }
+    return {
+        "elapsed_s": round(statistics.median(run["elapsed_s"] for run in runs), 3),
+        "articles": statistics.median(run["articles"] for run in runs),
+        "articles_per_sec": round(statistics.median(run["articles_per_sec"] or 0 for run in runs), 1),
+        "stages": stages,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_ms: float = 1.0) -> List[str]:
+    """与基准结果比较，返回退化项说明
+
+    吞吐下降超过 threshold，或某阶段 p50 / p95 增加超过 threshold（且绝对增加不少于 min_ms）记为退化。
+    """
+    regressions = []
+    base_rate, rate = baseline["summary"]["articles_per_sec"], current["summary"]["articles_per_sec"]
+    if base_rate and rate < base_rate * (1 - threshold):
+        regressions.append(f"articles_per_sec: {base_rate} -> {rate} ({(rate / base_rate - 1) * 100:+.0f}%)")
+
+    base_stages = baseline["summary"]["stages"]
+    for stage, stats in current["summary"]["stages"].items():
+        if stage not in base_stages:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            before, after = base_stages[stage][key], stats[key]
+            if after - before >= min_ms and after > before * (1 + threshold):
+                change = f"{(after / before - 1) * 100:+.0f}%" if before else "新增"
+                regressions.append(f"{stage}.{key}: {before} -> {after} ({change})")
+    return regressions
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """启动模拟服务，在临时工作目录中预热一次后运行 args.runs 次"""
+    origin = Path.cwd()
+    workdir = Path(tempfile.mkdtemp(prefix="bench_crawl_"))
+    prepare_workdir(origin, workdir, args.sources, args.rate_limit)
+
+    sites = SyntheticSites(args.items, args.paragraphs, args.seed)
+    stub = StubServer(sites, args.latency / 1000, args.jitter / 1000, args.seed)
+    base = stub.start()
+    hook = lambda transport: StubTransport(transport, base)
+    resilience.transport_hooks.append(hook)
+
+    if str(origin) not in sys.path:
+        sys.path.insert(0, str(origin))
+    os.chdir(workdir)
+    if args.verbose:
+        setup_logging(LoggingConfig(save_logs=False))
+    runs = []
+    try:
+        await crawl_once(args.verbose)  # 预热：解析进程池、关键词、分词词典
+        for i in range(args.runs):
+            run = await crawl_once(args.verbose)
+            runs.append(run)
+            print(f"[Bench] 第 {i + 1} 次: {run['articles']} 篇, {run['elapsed_s']}s, {run['articles_per_sec']} 篇/秒")
+            if run["failed_sources"]:
+                print(f"[Bench] 抓取失败的新闻源: {', '.join(run['failed_sources'])}")
+    finally:
+        from src.tools.parse_executor import parse_executor
+        parse_executor.shutdown()
+        resilience.transport_hooks.remove(hook)
+        stub.stop()
+        stop_logging()
+        os.chdir(origin)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "items": args.items,
+            "paragraphs": args.paragraphs,
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "runs": args.runs,
+            "seed": args.seed,
+            "rate_limit": args.rate_limit,
+            "sources": args.sources,
+        },
+        "requests": stub.requests,
+        "runs": runs,
+        "summary": summarize(runs),
+    }
+
+
+def print_summary(result: Dict[str, Any]) -> None:
+    summary = result["summary"]
+    print(f"\n文章数: {summary['articles']}  耗时: {summary['elapsed_s']}s  吞吐: {summary['articles_per_sec']} 篇/秒")
+    print(f"{'阶段':<12} {'次数':>6} {'p50 (ms)':>10} {'p95 (ms)':>10} {'合计 (ms)':>11}")
+    for stage, stats in summary["stages"].items():
+        print(f"{stage:<12} {stats['count']:>6.0f} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} {stats['total_ms']:>11.1f}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="端到端抓取基准")
+    parser.add_argument("--items", type=int, default=30, help="每个列表（频道）的条目数")
+    parser.add_argument("--paragraphs", type=int, default=40, help="每篇文章页的段落数")
+    parser.add_argument("--latency", type=float, default=20, help="每个请求的固定延迟（毫秒）")
+    parser.add_argument("--jitter", type=float, default=10, help="额外随机延迟上限（毫秒）")
+    parser.add_argument("--runs", type=int, default=3, help="运行次数（不含预热）")
+    parser.add_argument("--seed", type=int, default=0, help="合成数据与延迟的随机种子")
+    parser.add_argument("--sources", nargs="+", default=None, help="只抓取这些新闻源（默认配置中启用的全部）")
+    parser.add_argument("--rate-limit", action="store_true", help="保留按主机限速（默认关闭，只测处理能力）")
+    parser.add_argument("--output", type=Path, default=None, help="结果 JSON 输出路径")
+    parser.add_argument("--baseline", type=Path, default=None, help="与之前保存的结果比较")
+    parser.add_argument("--threshold", type=float, default=0.2, help="退化阈值（比例，默认 0.2 即 20%%）")
+    parser.add_argument("--verbose", action="store_true", help="显示抓取过程的输出")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run_benchmark(args))
+    print_summary(result)
+
+    if args.output:
+        args.output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n[Bench] 结果已写入 {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"\n[Bench] 相对 {args.baseline} 退化（阈值 {args.threshold:.0%}）:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n[Bench] 相对 {args.baseline} 无退化（阈值 {args.threshold:.0%}）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
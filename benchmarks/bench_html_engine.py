@@ -0,0 +1,152 @@
+"""HTML 引擎微基准：bs4（html.parser） vs lxml（预编译 XPath）
+
+对每个新闻源的正文提取（spec 的 body.containers，或解析器模块的 CONTENT_CONTAINERS）
+和 36氪列表页（spec 的 list.fields）分别计时，并校验两个引擎的提取结果一致。
+
+页面来源：
+- --pages DIR：使用录制的页面，文件名为 {source_id}.html（36氪列表页为 36kr-list.html）
+- 默认：按各新闻源的页面结构生成的模拟页面（头部脚本/样式、导航、正文、页脚）
+
+用法：
+    python -m benchmarks.bench_html_engine
+    python -m benchmarks.bench_html_engine --pages data/recordings/pages --repeat 50
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config import ConfigReader
+from src.crawlers.spec_engine import SpecParser, parser_registry
+from src.tools import html_extract
+
+
+def _container_markup(tag: str, class_: Optional[str], body: str) -> str:
+    attrs = f' class="main {class_} clearfix"' if class_ else ""
+    return f"<{tag}{attrs}>{body}</{tag}>"
+
+
+def synthetic_article(containers: List[Tuple[str, Optional[str]]], paragraphs: int = 40) -> bytes:
+    """生成模拟文章页：正文放在最后一个候选容器中（最坏情况，需要逐个尝试）"""
+    head = "".join(
+        f"<script>window.__cfg{i} = {{\"k\": {i}, \"v\": \"{'x' * 200}\"}};</script>" for i in range(20)
+    ) + "<style>" + ".c{color:red}" * 300 + "</style>"
+    nav = "<ul class='nav'>" + "".join(
+        f"<li><a href='/channel/{i}'>频道{i}</a></li>" for i in range(120)
+    ) + "</ul>"
+    body = "".join(
+        f"<p>第{i}段：前沿科技公司发布新一代模型，<strong>性能</strong>大幅提升，"
+        f"<a href='/tag/{i}'>相关阅读</a>，业内人士认为这将改变行业格局。</p>"
+        for i in range(paragraphs)
+    )
+    tag, class_ = containers[-1]
+    related = "<div class='related'>" + "".join(
+        f"<div class='card'><p>推荐文章标题 {i}</p><span>{i}小时前</span></div>" for i in range(60)
+    ) + "</div>"
+    footer = "<footer>" + "<p>版权所有</p>" * 5 + "</footer>"
+    html = (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>文章</title>{head}</head>"
+        f"<body>{nav}<div class='wrap'>{_container_markup(tag, class_, body)}{related}</div>{footer}</body></html>"
+    )
+    return html.encode("utf-8")
+
+
+def synthetic_36kr_list(items: int = 30) -> bytes:
+    """生成模拟 36氪快讯列表页"""
+    rows = "".join(
+        f"<div class='newsflash-item'><a class='item-title' href='/newsflashes/{i}'>快讯标题 {i}：某公司完成新一轮融资</a>"
+        f"<div class='item-desc'><span>{'快讯摘要内容。' * 20}</span></div><span class='time'>{i % 59 + 1}分钟前</span></div>"
+        for i in range(items)
+    )
+    return (
+        "<html><head><meta charset='utf-8'>" + "<script>var a=1;</script>" * 30 + "</head>"
+        f"<body><div class='newsflash-list'>{rows}</div></body></html>"
+    ).encode("utf-8")
+
+
+def load_cases(pages_dir: Optional[Path]) -> List[Tuple[str, Callable[[], object]]]:
+    """构造基准用例：[(名称, 提取函数)]（news_sources.yaml 中的全部新闻源，含未启用的）"""
+    cases = []
+    list_spec = None
+    for source in ConfigReader("config").load_news_sources_config().sources:
+        parser = parser_registry.get(source)
+        if isinstance(parser, SpecParser):
+            containers, body_fallback = parser.plan.containers, parser.plan.body_fallback
+            if source.id == "36kr":
+                list_spec = source.spec.list
+        else:
+            containers, body_fallback = parser.CONTENT_CONTAINERS, 0
+
+        page_file = pages_dir / f"{source.id}.html" if pages_dir else None
+        page = page_file.read_bytes() if page_file and page_file.exists() else synthetic_article(containers)
+
+        cases.append((
+            f"{source.id} 正文",
+            lambda page=page, c=containers, f=body_fallback: html_extract.extract_paragraphs(page, "utf-8", c, f),
+        ))
+
+    if list_spec is not None:
+        list_file = pages_dir / "36kr-list.html" if pages_dir else None
+        list_page = list_file.read_bytes() if list_file and list_file.exists() else synthetic_36kr_list()
+        cases.append((
+            "36kr 列表",
+            lambda: html_extract.extract_items(list_page, "utf-8", list_spec.selector, list_spec.fields, 20),
+        ))
+    return cases
+
+
+def time_case(func: Callable[[], object], repeat: int) -> float:
+    """运行 repeat 次，返回中位数耗时（毫秒）"""
+    func()  # 预热（编译选择器、解析器缓存）
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(pages_dir: Optional[Path] = None, repeat: int = 20) -> List[Dict[str, object]]:
+    """对比两个引擎，返回每个用例的耗时与加速比"""
+    results = []
+    for name, func in load_cases(pages_dir):
+        html_extract.set_engine("bs4")
+        expected = func()
+        bs4_ms = time_case(func, repeat)
+
+        html_extract.set_engine("lxml")
+        actual = func()
+        lxml_ms = time_case(func, repeat)
+
+        results.append({
+            "case": name,
+            "bs4_ms": round(bs4_ms, 2),
+            "lxml_ms": round(lxml_ms, 2),
+            "speedup": round(bs4_ms / lxml_ms, 1) if lxml_ms else None,
+            "same_output": expected == actual,
+        })
+
+    html_extract.set_engine("auto")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="HTML 引擎微基准")
+    parser.add_argument("--pages", type=Path, default=None, help="录制页面目录（{source_id}.html）")
+    parser.add_argument("--repeat", type=int, default=20, help="每个用例的重复次数")
+    args = parser.parse_args(argv)
+
+    results = run(args.pages, args.repeat)
+
+    print(f"{'用例':<24} {'bs4 (ms)':>10} {'lxml (ms)':>10} {'加速':>7}  结果一致")
+    for row in results:
+        print(
+            f"{row['case']:<24} {row['bs4_ms']:>10.2f} {row['lxml_ms']:>10.2f} "
+            f"{row['speedup']:>6.1f}x  {'是' if row['same_output'] else '否'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
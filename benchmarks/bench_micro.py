@@ -0,0 +1,353 @@
+"""热点函数微基准：去重、关键词筛选、标题清理、存储
+
+在合成输入上按规模运行，报告每秒操作数与峰值内存（tracemalloc），并按相邻规模的耗时比
+估算复杂度（耗时 ∝ 规模^k，k≈1 线性、k≈2 平方）：
+
+- for_dedup：TitleCleaner.for_dedup，N 个标题
+- simhash：TextDeduplicator._compute_simhash，N 个标题
+- cache_title：TextDeduplicator._filter_by_cache_title，今日缓存 N 个标题、一批 --batch 篇新文章
+- keywords(titles)：filter_by_keywords，N 个标题、--keywords 个关键词
+- keywords(list)：filter_by_keywords，--keyword-titles 个标题、K 个关键词
+- insert_article：TimelineDB.insert_article，逐篇插入 N 篇（每次运行前清空数据库）
+- list_articles：TimelineDB.list_articles，N 行的库上执行 --queries 次查询（最新、按 legend、按日期）
+
+所有数据库、分词缓存都在临时工作目录中，不影响项目的 data/。
+
+用法：
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --sizes 1000 10000 100000 --keyword-sizes 100 1000 10000
+    python -m benchmarks.bench_micro --only simhash cache_title --repeat 5 --output micro.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import CorpusGenerator
+
+# 合成关键词用字
+KEYWORD_CHARS = "科技芯片模型算力能源汽车电池机器人卫星火箭量子云端数据平台金融银行证券基金"
+
+
+def synthetic_titles(n: int, seed: int = 0) -> List[str]:
+    """生成 n 个标题（语料生成器：中英混合、约 10% 近似重复、一半不含关键词）"""
+    from src.config import ConfigReader
+
+    generator = CorpusGenerator(ConfigReader("config").load_news_keywords_config(), seed)
+    return generator.titles(n, miss_rate=0.5)
+
+
+def synthetic_articles(titles: List[str], seed: int = 0) -> List[Any]:
+    """标题转为 Article（今天的发布时间，来源轮换）"""
+    from src.models import Article
+
+    rng = random.Random(f"{seed}:articles")
+    now = datetime.now()
+    sources = ["cls-telegraph", "wallstreetcn-live", "thepaper", "36kr"]
+    return [
+        Article(
+            title=title,
+            url=f"https://example.com/{i}",
+            source=sources[i % len(sources)],
+            publish_time=now - timedelta(minutes=rng.randrange(600)),
+            legend=rng.choice([None, None, "musk", "huang"]),
+        )
+        for i, title in enumerate(titles)
+    ]
+
+
+def synthetic_keywords(k: int, seed: int = 0) -> Dict[str, Any]:
+    """生成 k 个关键词，按 _KEYWORDS_CACHE 的结构：约 10% 分给 4 个 legend，其余为 front"""
+    rng = random.Random(f"{seed}:keywords")
+    keywords = set()
+    while len(keywords) < k:
+        keywords.add("".join(rng.choice(KEYWORD_CHARS) for _ in range(rng.randint(2, 4))))
+    keywords = sorted(keywords)
+    legend_count = max(4, k // 10)
+    legend = {legend_id: set() for legend_id in ("musk", "huang", "altman", "zuck")}
+    for i, keyword in enumerate(keywords[:legend_count]):
+        legend[list(legend)[i % 4]].add(keyword)
+    front = set(keywords[legend_count:])
+    return {"legend": legend, "新星": front, "涟漪": set(), "中国": set(), "front": front, "initialized": True}
+
+
+class Case:
+    """基准用例：run 执行 ops 次操作；setup（可选）在每次运行前执行，不计时"""
+
+    def __init__(self, name: str, size: int, ops: int, run: Callable[[], Any], setup: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.size = size
+        self.ops = ops
+        self.run = run
+        self.setup = setup
+
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    """预热一次后运行 repeat 次取中位数；另运行一次用 tracemalloc 记录峰值内存"""
+    samples = []
+    for i in range(repeat + 1):
+        if case.setup:
+            case.setup()
+        start = time.perf_counter()
+        case.run()
+        elapsed = time.perf_counter() - start
+        if i:  # 第一次为预热（分词词典、关键词、数据库连接）
+            samples.append(elapsed)
+
+    if case.setup:
+        case.setup()
+    tracemalloc.start()
+    case.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(samples)
+    return {
+        "case": case.name,
+        "size": case.size,
+        "ops": case.ops,
+        "median_ms": round(median * 1000, 2),
+        "ops_per_sec": round(case.ops / median, 1) if median else None,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def quiet(func: Callable[[], Any]) -> Callable[[], Any]:
+    """屏蔽被测函数的 print 输出"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+
+def text_cases(sizes: List[int], seed: int):
+    from src.crawlers.dedup import TextDeduplicator
+    from src.tools import TitleCleaner
+
+    deduplicator = TextDeduplicator()
+    for n in sizes:
+        titles = synthetic_titles(n, seed)
+        yield Case("for_dedup", n, n, lambda titles=titles: [TitleCleaner.for_dedup(t) for t in titles])
+    for n in sizes:
+        titles = synthetic_titles(n, seed)
+        yield Case("simhash", n, n, lambda titles=titles: [deduplicator._compute_simhash(t) for t in titles])
+
+
+def cache_title_cases(sizes: List[int], batch: int, seed: int):
+    from src.crawlers.dedup import TextDeduplicator, today_news_cache
+
+    deduplicator = TextDeduplicator()
+    incoming = synthetic_articles(synthetic_titles(batch, seed + 1), seed + 1)
+    for n in sizes:
+        cached = synthetic_articles(synthetic_titles(n, seed), seed)
+
+        def setup(cached=cached):
+            today_news_cache.clear()
+            today_news_cache.add_batch(cached)
+
+        yield Case("cache_title", n, batch, lambda: deduplicator._filter_by_cache_title(incoming), setup)
+    today_news_cache.clear()
+
+
+def keyword_cases(sizes: List[int], keyword_sizes: List[int], keywords: int, keyword_titles: int, seed: int):
+    from src.crawlers.keywords_filter import filter_by_keywords
+
+    for n in sizes:
+        articles = synthetic_articles(synthetic_titles(n, seed), seed)
+        installed = synthetic_keywords(keywords, seed)
+        yield Case(
+            "keywords(titles)", n, n, quiet(lambda a=articles: filter_by_keywords(a)),
+            lambda k=installed: _install_keywords(k),
+        )
+    articles = synthetic_articles(synthetic_titles(keyword_titles, seed), seed)
+    for k in keyword_sizes:
+        installed = synthetic_keywords(k, seed)
+        yield Case(
+            "keywords(list)", k, keyword_titles, quiet(lambda: filter_by_keywords(articles)),
+            lambda k=installed: _install_keywords(k),
+        )
+
+
+def _install_keywords(keywords: Dict[str, Any]) -> None:
+    from src.crawlers import keywords_filter
+
+    keywords_filter._KEYWORDS_CACHE.update(keywords)
+
+
+def storage_cases(sizes: List[int], queries: int, seed: int):
+    from src.storage import TimelineDB
+
+    db = TimelineDB(date.today())
+
+    def reset():
+        if db.db_path.exists():
+            db.db_path.unlink()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.init_db()
+
+    for n in sizes:
+        articles = synthetic_articles(synthetic_titles(n, seed), seed)
+        yield Case("insert_article", n, n, lambda a=articles: [db.insert_article(x) for x in a], reset)
+
+    today = date.today().isoformat()
+    for n in sizes:
+        articles = synthetic_articles(synthetic_titles(n, seed), seed)
+
+        def fill(articles=articles):
+            # 批量写入（不计时），用于查询基准
+            reset()
+            conn = sqlite3.connect(str(db.db_path))
+            conn.executemany(
+                "INSERT INTO articles (id, title, url, source, publish_time, legend) VALUES (?, ?, ?, ?, ?, ?)",
+                [(a.id, a.title, a.url, a.source, a.publish_time.isoformat(), a.legend) for a in articles],
+            )
+            conn.commit()
+            conn.close()
+
+        def run():
+            for i in range(queries):
+                kind = i % 3
+                if kind == 0:
+                    db.list_articles(limit=100)
+                elif kind == 1:
+                    db.list_articles(limit=100, legend="musk")
+                else:
+                    db.list_articles(limit=100, start_date=today, end_date=today)
+
+        fill()
+        yield Case("list_articles", n, queries, run)
+
+
+def growth(results: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """按相邻规模估算复杂度指数 k（耗时 ∝ 规模^k，取最后两个规模）"""
+    by_case: Dict[str, List[Dict[str, Any]]] = {}
+    for row in results:
+        by_case.setdefault(row["case"], []).append(row)
+    exponents = {}
+    for name, rows in by_case.items():
+        rows = sorted(rows, key=lambda r: r["size"])
+        if len(rows) < 2 or not rows[-2]["median_ms"]:
+            exponents[name] = None
+            continue
+        small, large = rows[-2], rows[-1]
+        exponents[name] = round(
+            math.log(large["median_ms"] / small["median_ms"]) / math.log(large["size"] / small["size"]), 2
+        )
+    return exponents
+
+
+GROUPS = {
+    "for_dedup": "text", "simhash": "text", "cache_title": "cache_title",
+    "keywords": "keywords", "insert_article": "storage", "list_articles": "storage",
+}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """在临时工作目录中运行所选用例"""
+    origin = Path.cwd()
+    workdir = Path(tempfile.mkdtemp(prefix="bench_micro_"))
+    shutil.copytree(origin / "config", workdir / "config")
+    if str(origin) not in sys.path:
+        sys.path.insert(0, str(origin))
+    os.chdir(workdir)
+
+    groups = {GROUPS[name] for name in args.only} if args.only else set(GROUPS.values())
+    factories = []
+    if "text" in groups:
+        factories.append(lambda: text_cases(args.sizes, args.seed))
+    if "cache_title" in groups:
+        factories.append(lambda: cache_title_cases(args.sizes, args.batch, args.seed))
+    if "keywords" in groups:
+        factories.append(lambda: keyword_cases(
+            args.sizes, args.keyword_sizes, args.keywords, args.keyword_titles, args.seed
+        ))
+    if "storage" in groups:
+        factories.append(lambda: storage_cases(args.storage_sizes, args.queries, args.seed))
+
+    from src.crawlers import keywords_filter
+
+    # 关键词用例会替换关键词缓存，结束后恢复
+    saved_keywords = dict(keywords_filter._KEYWORDS_CACHE)
+    results = []
+    try:
+        for factory in factories:
+            for case in factory():
+                if args.only and not any(case.name.startswith(name) for name in args.only):
+                    continue
+                row = measure(case, args.repeat)
+                results.append(row)
+                print(
+                    f"{row['case']:<18} {row['size']:>8} {row['median_ms']:>11.2f} "
+                    f"{row['ops_per_sec']:>13.1f} {row['peak_kb']:>11.1f}"
+                )
+    finally:
+        keywords_filter._KEYWORDS_CACHE.clear()
+        keywords_filter._KEYWORDS_CACHE.update(saved_keywords)
+        os.chdir(origin)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "sizes": args.sizes,
+            "storage_sizes": args.storage_sizes,
+            "keyword_sizes": args.keyword_sizes,
+            "keywords": args.keywords,
+            "keyword_titles": args.keyword_titles,
+            "batch": args.batch,
+            "queries": args.queries,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+        "growth": growth(results),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="热点函数微基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="标题数规模")
+    parser.add_argument("--storage-sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="存储用例的行数规模（逐篇插入 10 万篇需要数分钟）")
+    parser.add_argument("--keyword-sizes", type=int, nargs="+", default=[100, 1000, 10000], help="关键词数规模")
+    parser.add_argument("--keywords", type=int, default=1000, help="keywords(titles) 用例的关键词数")
+    parser.add_argument("--keyword-titles", type=int, default=1000, help="keywords(list) 用例的标题数")
+    parser.add_argument("--batch", type=int, default=100, help="cache_title 用例每批新文章数")
+    parser.add_argument("--queries", type=int, default=30, help="list_articles 用例每次运行的查询数")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例的重复次数（不含预热）")
+    parser.add_argument("--seed", type=int, default=0, help="合成数据的随机种子")
+    parser.add_argument("--only", nargs="+", choices=sorted(GROUPS), default=None, help="只运行这些用例")
+    parser.add_argument("--output", type=Path, default=None, help="结果 JSON 输出路径")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    print(f"{'用例':<18} {'规模':>8} {'中位数 (ms)':>11} {'每秒操作数':>13} {'峰值内存 (KB)':>11}")
+    result = run(args)
+
+    print("\n复杂度估算（耗时 ∝ 规模^k）:")
+    for name, exponent in result["growth"].items():
+        print(f"  {name:<18} k = {exponent if exponent is not None else '-'}")
+
+    if args.output:
+        args.output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n[Bench] 结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""合成语料生成：多年的 timeline 数据库与正文文件
+
+生成与线上结构一致的数据目录，用于压测与基准（查询、跨年读取、去重、静态页生成）：
+
+    {out}/data/db/timeline_{年}.sqlite        articles 表（TimelineDB 建表）
+    {out}/data/articles/YYYY/MM/DD/标题.md    正文文件（与抓取入库的格式相同）
+
+标题：
+- 中文 / 英文比例可调（--english），关键词取自 config/news_keywords.yaml
+- 入库的文章都命中关键词（与 keywords 筛选一致）：legend 按 --legend-rate，各 legend 按关键词组数加权，
+  其余命中新星 / 涟漪 / 中国；titles(n, miss_rate) 可生成含未命中标题的输入流，供去重、筛选基准使用
+- --near-dup 比例的标题由近期标题改写而来（换前缀、改标点、加后缀），模拟多个新闻源转载同一消息
+
+发布时间：每天的文章数在 --per-day 上下浮动（周末减少），按新闻源的权重与活跃时段分布。
+
+用法（在 {out} 目录中运行服务或基准即读取这些数据）：
+    python -m benchmarks.corpus --out data/corpus --start 2023-01-01 --end 2025-12-31 --per-day 1000
+    python -m benchmarks.corpus --out /tmp/corpus --per-day 300 --english 0.3 --near-dup 0.15 --bodies 0.1
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config import ConfigReader
+from src.tools import TitleCleaner
+
+# 新闻源：(每日文章数权重, 活跃时段权重 0~23 点)
+DAYTIME = [1, 1, 1, 1, 1, 1, 2, 4, 6, 8, 8, 8, 7, 7, 8, 8, 7, 6, 5, 5, 4, 3, 2, 1]
+MARKET = [1, 1, 1, 1, 1, 1, 2, 3, 6, 12, 12, 10, 5, 8, 12, 10, 6, 4, 3, 3, 3, 2, 2, 1]
+SOURCES: Dict[str, Tuple[float, List[int]]] = {
+    "cls-telegraph": (5, MARKET),
+    "wallstreetcn-live": (4, MARKET),
+    "wallstreetcn-news": (2, DAYTIME),
+    "thepaper": (2, DAYTIME),
+    "36kr": (2, DAYTIME),
+    "cankaoxiaoxi": (1, DAYTIME),
+}
+
+ZH_TEMPLATES = [
+    "{kw}{action}{obj}", "{kw}{action}{obj}，{effect}", "{kw}：{obj}{effect}",
+    "{kw}最新{obj}曝光，{effect}", "消息称{kw}{action}{obj}", "{kw}回应{obj}：{effect}",
+]
+ZH_ACTIONS = ["宣布", "披露", "计划推出", "被曝", "否认", "完成", "启动", "暂停", "加码", "发布"]
+ZH_OBJECTS = [
+    "新一轮融资", "季度财报", "海外建厂计划", "裁员传闻", "新品发布会", "战略合作协议", "监管问询",
+    "产能扩张", "价格调整", "人事变动", "专利诉讼", "算力集群建设", "开源新模型", "卫星发射任务",
+]
+ZH_EFFECTS = ["股价盘中大涨", "市场反应平淡", "分析师上调目标价", "业内人士表示影响有限", "产业链公司集体走强", "引发热议"]
+ZH_FILLER = ["央行", "沪深两市", "某城商行", "光伏龙头", "物流公司", "地方政府", "券商研究所", "新能源车企"]
+
+EN_TEMPLATES = [
+    "{kw} {action} {obj}", "{kw} {action} {obj}, {effect}", "{kw}: {obj} {effect}",
+    "Report: {kw} {action} {obj}", "{kw} responds to {obj} as {effect}",
+]
+EN_ACTIONS = ["announces", "unveils", "denies", "confirms", "delays", "expands", "launches", "cuts"]
+EN_OBJECTS = [
+    "new funding round", "quarterly results", "overseas factory plan", "layoff rumors", "product event",
+    "strategic partnership", "regulatory probe", "capacity expansion", "price changes", "open model release",
+]
+EN_EFFECTS = ["shares jump", "markets shrug", "analysts raise targets", "suppliers rally", "sparking debate"]
+EN_FILLER = ["Central bank", "Wall Street", "A regional lender", "Solar maker", "Logistics firm", "EV startup"]
+
+# 近似重复的改写方式
+DUP_PREFIXES = ["【快讯】", "突发！", "独家：", "财联社消息，", "Breaking: "]
+DUP_SUFFIXES = ["（更新）", "（附全文）", "——最新进展", " | 视频", "（图）"]
+
+
+def _flatten(groups: Any) -> List[str]:
+    """关键词组（列表或嵌套列表）展平"""
+    keywords = []
+    for group in groups or []:
+        items = group if isinstance(group, list) else [group]
+        keywords.extend(str(kw).strip() for kw in items if kw and str(kw).strip())
+    return keywords
+
+
+class CorpusGenerator:
+    """按 news_keywords.yaml 生成标题与文章行"""
+
+    def __init__(
+        self,
+        keywords_config: Dict[str, Any],
+        seed: int = 0,
+        english: float = 0.2,
+        near_dup: float = 0.1,
+        legend_rate: float = 0.5
+    ):
+        """初始化
+
+        Args:
+            keywords_config: news_keywords.yaml 的内容
+            seed: 随机种子
+            english: 英文标题比例
+            near_dup: 近似重复标题比例
+            legend_rate: 命中 legend 关键词的比例（其余命中新星 / 涟漪 / 中国）
+        """
+        self.rng = random.Random(seed)
+        self.english = english
+        self.near_dup = near_dup
+        self.legend_rate = legend_rate
+
+        # legend 按关键词组数加权（关注越多的人物新闻越多）
+        self.legends: Dict[str, List[str]] = {}
+        weights = []
+        for legend_id, groups in (keywords_config.get("legend") or {}).items():
+            keywords = _flatten(groups)
+            if keywords:
+                self.legends[legend_id] = keywords
+                weights.append(len(groups))
+        self.legend_ids = list(self.legends)
+        self.legend_weights = weights
+        self.front = [kw for category in ("新星", "涟漪", "中国") for kw in _flatten(keywords_config.get(category))]
+        if not self.legends and not self.front:
+            raise ValueError("news_keywords.yaml 中没有关键词")
+
+        self.recent: List[str] = []  # 近期标题（近似重复的来源）
+        self.counts: Counter = Counter()
+
+    def _keyword(self, english: bool) -> Tuple[str, Optional[str]]:
+        """选取关键词，返回 (关键词, legend_id)；英文标题优先使用 ASCII 关键词"""
+        if self.legends and (not self.front or self.rng.random() < self.legend_rate):
+            legend_id = self.rng.choices(self.legend_ids, self.legend_weights)[0]
+            pool = self.legends[legend_id]
+        else:
+            legend_id, pool = None, self.front
+        if english:
+            ascii_pool = [kw for kw in pool if kw.isascii()]
+            pool = ascii_pool or pool
+        return self.rng.choice(pool), legend_id
+
+    def _compose(self, keyword: str, english: bool) -> str:
+        rng = self.rng
+        if english:
+            return rng.choice(EN_TEMPLATES).format(
+                kw=keyword, action=rng.choice(EN_ACTIONS), obj=rng.choice(EN_OBJECTS), effect=rng.choice(EN_EFFECTS)
+            )
+        return rng.choice(ZH_TEMPLATES).format(
+            kw=keyword, action=rng.choice(ZH_ACTIONS), obj=rng.choice(ZH_OBJECTS), effect=rng.choice(ZH_EFFECTS)
+        )
+
+    def _near_duplicate(self, title: str) -> str:
+        """改写近期标题：换前缀、改标点或加后缀"""
+        rng = self.rng
+        choice = rng.random()
+        if choice < 0.35:
+            return rng.choice(DUP_PREFIXES) + title
+        if choice < 0.7:
+            return title + rng.choice(DUP_SUFFIXES)
+        return title.replace("，", " ").replace("：", ":").replace(", ", "，")
+
+    def title(self, miss: bool = False) -> Tuple[str, Optional[str]]:
+        """生成一个标题，返回 (标题, legend_id)；miss=True 时生成不含关键词的标题"""
+        rng = self.rng
+        if self.recent and not miss and rng.random() < self.near_dup:
+            self.counts["near_dup"] += 1
+            return self._near_duplicate(rng.choice(self.recent)), None
+
+        english = rng.random() < self.english
+        if miss:
+            keyword, legend_id = rng.choice(EN_FILLER if english else ZH_FILLER), None
+            self.counts["miss"] += 1
+        else:
+            keyword, legend_id = self._keyword(english)
+            self.counts[legend_id or "front"] += 1
+        title = self._compose(keyword, english)
+        if not miss:
+            self.recent.append(title)
+            if len(self.recent) > 200:
+                self.recent.pop(0)
+        return title, legend_id
+
+    def titles(self, n: int, miss_rate: float = 0.0) -> List[str]:
+        """生成 n 个标题（含 miss_rate 比例的未命中标题），用于去重、筛选基准的输入"""
+        return [self.title(miss=self.rng.random() < miss_rate)[0] for _ in range(n)]
+
+    def day_rows(self, day: date, per_day: int) -> Iterator[Dict[str, Any]]:
+        """生成某一天的文章行（发布时间按新闻源权重与活跃时段分布）"""
+        rng = self.rng
+        count = per_day * (0.6 if day.weekday() >= 5 else 1.0) * rng.uniform(0.8, 1.2)
+        source_ids = list(SOURCES)
+        source_weights = [weight for weight, _ in SOURCES.values()]
+        midnight = datetime.combine(day, datetime.min.time())
+        beijing = timezone(timedelta(hours=8))
+
+        for _ in range(int(count)):
+            source = rng.choices(source_ids, source_weights)[0]
+            hour = rng.choices(range(24), SOURCES[source][1])[0]
+            published = midnight + timedelta(hours=hour, seconds=rng.randrange(3600))
+            title, legend_id = self.title()
+            # 近似重复的标题仍按关键词归类（与入库前的 keywords 筛选一致）
+            if legend_id is None:
+                legend_id = self._legend_of(title)
+            yield {
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "title": title,
+                "url": f"https://{source}.example.com/{day:%Y%m%d}/{rng.getrandbits(48):x}",
+                "source": source,
+                "publish_time": published,
+                "legend": legend_id,
+                "created_at": (published + timedelta(seconds=rng.randrange(60, 1800))).replace(tzinfo=beijing),
+            }
+
+    def _legend_of(self, title: str) -> Optional[str]:
+        lowered = title.lower()
+        for legend_id, keywords in self.legends.items():
+            if any(kw.lower() in lowered for kw in keywords):
+                return legend_id
+        return None
+
+    def body(self, title: str, paragraphs: int = 8) -> str:
+        """正文（围绕标题的若干段落）"""
+        rng = self.rng
+        return "\n\n".join(
+            f"{title}。{rng.choice(ZH_FILLER)}{rng.choice(ZH_ACTIONS)}{rng.choice(ZH_OBJECTS)}，{rng.choice(ZH_EFFECTS)}。"
+            * rng.randint(2, 5)
+            for _ in range(paragraphs)
+        )
+
+
+@contextmanager
+def _in_directory(path: Path):
+    origin = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(origin)
+
+
+def write_body(row: Dict[str, Any], content: str) -> str:
+    """按抓取入库的格式写正文文件，返回相对路径"""
+    published = row["publish_time"]
+    file_dir = Path(f"data/articles/{published:%Y/%m/%d}")
+    file_dir.mkdir(parents=True, exist_ok=True)
+    file_path = file_dir / f"{TitleCleaner.clean_filename(row['title'], 50)}.md"
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(f"# {row['title']}\n\n")
+        f.write(f"> 来源: {row['source']}\n")
+        f.write(f"> 时间: {published}\n")
+        f.write(f"> URL: {row['url']}\n\n")
+        f.write(content)
+    return str(file_path)
+
+
+def generate(
+    out: Path,
+    start: date,
+    end: date,
+    per_day: int,
+    generator: CorpusGenerator,
+    bodies: float = 0.0,
+    batch: int = 5000
+) -> Dict[int, Dict[str, int]]:
+    """生成 [start, end] 的数据，返回每年的统计
+
+    Raises:
+        FileExistsError: 目标目录中已有对应年份的数据库
+    """
+    from src.storage import TimelineDB
+
+    out.mkdir(parents=True, exist_ok=True)
+    stats: Dict[int, Dict[str, int]] = {}
+    with _in_directory(out):
+        years = range(start.year, end.year + 1)
+        existing = [year for year in years if TimelineDB(date(year, 1, 1)).db_path.exists()]
+        if existing:
+            raise FileExistsError(f"{out / 'data' / 'db'} 中已有 {existing} 年的数据库，请换目录或先删除")
+
+        for year in years:
+            db = TimelineDB(date(year, 1, 1))
+            db.init_db()
+            conn = sqlite3.connect(str(db.db_path))
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("PRAGMA journal_mode = WAL")
+            rows, year_stats = [], Counter()
+            day = max(start, date(year, 1, 1))
+            last = min(end, date(year, 12, 31))
+            while day <= last:
+                for row in generator.day_rows(day, per_day):
+                    file_path = None
+                    if bodies and generator.rng.random() < bodies:
+                        file_path = write_body(row, generator.body(row["title"]))
+                        year_stats["bodies"] += 1
+                    rows.append((
+                        row["id"], row["title"], row["url"], row["source"], row["publish_time"].isoformat(),
+                        file_path, row["legend"], row["created_at"].isoformat(),
+                    ))
+                    year_stats["legend" if row["legend"] else "front"] += 1
+                    if len(rows) >= batch:
+                        _insert(conn, rows)
+                        year_stats["rows"] += len(rows)
+                        rows = []
+                day += timedelta(days=1)
+            _insert(conn, rows)
+            year_stats["rows"] += len(rows)
+            conn.close()
+            stats[year] = dict(year_stats)
+            print(f"[Corpus] {db.db_path}: {year_stats['rows']} 行，正文 {year_stats['bodies']} 篇")
+    return stats
+
+
+def _insert(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+    conn.executemany("""
+        INSERT OR IGNORE INTO articles (id, title, url, source, publish_time, file_path, legend, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    today = date.today()
+    parser = argparse.ArgumentParser(description="生成合成的多年 timeline 数据库与正文文件")
+    parser.add_argument("--out", type=Path, required=True, help="输出目录（生成 data/db、data/articles）")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(today.year - 2, 1, 1), help="开始日期")
+    parser.add_argument("--end", type=date.fromisoformat, default=today, help="结束日期")
+    parser.add_argument("--per-day", type=int, default=500, help="平均每天的文章数")
+    parser.add_argument("--english", type=float, default=0.2, help="英文标题比例")
+    parser.add_argument("--near-dup", type=float, default=0.1, help="近似重复标题比例")
+    parser.add_argument("--legend-rate", type=float, default=0.5, help="命中 legend 关键词的比例")
+    parser.add_argument("--bodies", type=float, default=0.0, help="生成正文文件的比例")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--config", default="config", help="配置目录（读取 news_keywords.yaml）")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    keywords_config = ConfigReader(args.config).load_news_keywords_config()
+    generator = CorpusGenerator(keywords_config, args.seed, args.english, args.near_dup, args.legend_rate)
+
+    started = time.perf_counter()
+    try:
+        stats = generate(args.out, args.start, args.end, args.per_day, generator, args.bodies)
+    except FileExistsError as e:
+        print(f"[Corpus] {e}")
+        return 1
+    total = sum(year.get("rows", 0) for year in stats.values())
+    print(f"[Corpus] 共 {total} 行，用时 {time.perf_counter() - started:.1f}s，输出目录: {args.out}")
+
+    counts = generator.counts
+    generated = sum(counts.values()) or 1
+    print(f"[Corpus] 近似重复 {counts['near_dup'] / generated:.1%}，"
+          f"front {counts['front'] / generated:.1%}，legend 分布:")
+    for legend_id in generator.legend_ids:
+        print(f"  - {legend_id}: {counts[legend_id]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
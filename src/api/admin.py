@@ -5,15 +5,24 @@
 所有管理功能统一走 /admin/ 前缀，方便后期加权限管理
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from datetime import date
 from pathlib import Path
 
+from ..config import ConfigReader
+from ..config.service import config_service
 from ..crawlers.dedup import today_news_cache
 from ..crawlers.url_cache import url_cache
 from ..crawlers.source_tester import SourceTester
+from ..scheduler.source_health import get_source_health_store, parse_window
+from ..scheduler.source_state import get_source_state_store
+from ..storage.body_cache import get_body_cache
 from ..storage.timeline_db import TimelineDB
+from ..tools import single_flight
+from ..tools.metrics import api_cache_requests
+from ..tools.profiling import request_profiler
 from fastapi_cache import FastAPICache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -43,6 +52,8 @@ async def clear_today_data() -> Dict[str, Any]:
     print(f"[Admin] 清空前 url_cache.count={url_cache.count}, today_news_cache.count={today_news_cache.count}")
     url_cache.clear()
     today_news_cache.clear()
+    # 列表校验信息与高水位一并清除，否则已处理的条目会被跳过，清空后无法重新抓取
+    get_source_state_store().clear()
     print(f"[Admin] 清空后 url_cache.count={url_cache.count}, today_news_cache.count={today_news_cache.count}")
 
     return {
@@ -58,11 +69,27 @@ async def clear_today_data() -> Dict[str, Any]:
 
 
 @router.get("/source_test")
-async def test_sources() -> Dict[str, Any]:
-    """测试所有新闻源，返回每个源的连接状态和数据量"""
+@single_flight()
+async def test_sources(history: Optional[str] = None) -> Dict[str, Any]:
+    """测试所有新闻源，返回每个源的连接状态、数据量和耗时分解，结果记入健康历史
+
+    并发的测试请求合并为一次测试，避免重复请求所有新闻源
+
+    Args:
+        history: 时间窗口（如 7d、12h），传入时不做测试，返回该窗口内各源的 p50 / p95 趋势与变慢的源
+    """
+    if history is not None:
+        try:
+            window = parse_window(history)
+        except ValueError as e:
+            return {"code": 400, "message": str(e), "data": None}
+        data = await run_in_threadpool(get_source_health_store().history, window)
+        return {"code": 200, "message": "查询成功", "data": data}
+
     tester = SourceTester()
     try:
         result = await tester.test_all()
+        await run_in_threadpool(get_source_health_store().record, result["sources"])
         return {
             "code": 200,
             "message": "测试完成",
@@ -74,16 +101,23 @@ async def test_sources() -> Dict[str, Any]:
 
 @router.get("/cache/stats")
 async def get_cache_stats() -> Dict[str, Any]:
-    """获取 API 缓存统计"""
-    # fastapi-cache 的 InMemoryBackend 不直接提供统计接口
-    # 返回基本信息
+    """获取 API 缓存统计（命中数为本 worker 启动以来的累计，同见 /metrics）"""
     backend = FastAPICache.get_backend()
+    storage = ConfigReader().load_crawler_config().storage
+    hits, misses = api_cache_requests.value("hit"), api_cache_requests.value("miss")
     return {
         "code": 200,
         "data": {
-            "backend": type(backend).__name__,
+            "backend": type(getattr(backend, "backend", backend)).__name__,
             "prefix": "sfapi-cache",
-            "note": "InMemoryBackend does not provide detailed stats"
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "body_cache": (
+                get_body_cache(storage.body_cache_path, storage.body_cache_max_mb).stats()
+                if storage.body_cache else None
+            ),
+            "config": config_service.stats(),
         }
     }
 
@@ -98,3 +132,31 @@ async def clear_api_cache() -> Dict[str, Any]:
         "message": "已清除 API 缓存",
         "data": {"cleared": True}
     }
+
+
+@router.post("/profile")
+async def start_request_profile(route: str, count: int = 1, mode: str = "cpu") -> Dict[str, Any]:
+    """剖析指定路由接下来的 count 个请求（count=0 停止）
+
+    Args:
+        route: 路由模板，如 /api/articles 或 /api/articles/{article_id}
+        count: 剖析的请求数（1 ~ 100）
+        mode: cpu（.pstats）| wall（speedscope JSON）| alloc（tracemalloc 快照）
+    """
+    if not 0 <= count <= 100:
+        return {"code": 400, "message": "count 须在 0 ~ 100 之间", "data": None}
+    try:
+        status = request_profiler.arm(route, count, mode)
+    except ValueError as e:
+        return {"code": 400, "message": str(e), "data": None}
+    return {
+        "code": 200,
+        "message": f"将剖析 {route} 接下来的 {count} 个请求" if count else "已停止剖析",
+        "data": status,
+    }
+
+
+@router.get("/profile")
+async def get_request_profile() -> Dict[str, Any]:
+    """查看请求剖析状态与已生成的文件"""
+    return {"code": 200, "message": "success", "data": request_profiler.status()}
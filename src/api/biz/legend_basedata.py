@@ -3,7 +3,10 @@
 /biz/legend_basedata 路由 - Legend 档案管理 API
 """
 
+from functools import lru_cache
+
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, List
 
 from ...models.legend import (
@@ -20,6 +23,7 @@ from ...models.legend import (
 from ...services.legend_db import LegendDB
 from ...services.legend_file import LegendFileService
 from ...services.legend_sync import LegendSyncService
+from ...tools import single_flight
 
 
 router = APIRouter(
@@ -27,10 +31,27 @@ router = APIRouter(
     tags=["legend-basedata"]
 )
 
-# 初始化服务
-db = LegendDB()
-file_service = LegendFileService()
-sync_service = LegendSyncService(db=db)
+# 服务延迟初始化：LegendSyncService 会初始化数据库并构建 Researcher，
+# 放在模块级会拖慢应用导入，改为首次请求时创建
+@lru_cache(maxsize=None)
+def get_db() -> LegendDB:
+    return LegendDB()
+
+
+@lru_cache(maxsize=None)
+def get_file_service() -> LegendFileService:
+    return LegendFileService()
+
+
+@lru_cache(maxsize=None)
+def get_sync_service() -> LegendSyncService:
+    return LegendSyncService(db=get_db())
+
+
+def init_services() -> None:
+    """预先创建服务（应用启动后在后台线程调用，首个请求无需等待）"""
+    get_file_service()
+    get_sync_service()
 
 
 # =============================================================================
@@ -39,6 +60,7 @@ sync_service = LegendSyncService(db=db)
 
 
 @router.get("/", response_model=dict)
+@single_flight()
 async def list_legends(
     type: Optional[LegendType] = None,
     tier: Optional[LegendTier] = None,
@@ -54,7 +76,7 @@ async def list_legends(
         limit=limit,
         offset=offset
     )
-    legends = db.list_legends(filters)
+    legends = await run_in_threadpool(get_db().list_legends, filters)
 
     return {
         "code": 200,
@@ -65,11 +87,26 @@ async def list_legends(
 
 
 @router.get("/{legend_id}", response_model=dict)
+@single_flight()
 async def get_legend(legend_id: str):
     """获取单个 Legend 详情（含关联数据）"""
+    detail = await run_in_threadpool(_load_legend_detail, legend_id)
+    if not detail:
+        raise HTTPException(status_code=404, detail=f"Legend {legend_id} not found")
+
+    return {
+        "code": 200,
+        "message": "success",
+        "data": detail.model_dump(mode="json")
+    }
+
+
+def _load_legend_detail(legend_id: str) -> Optional[LegendDetail]:
+    """读取 Legend 详情（多次数据库查询 + Markdown 文件，在线程池中执行）"""
+    db = get_db()
     legend = db.get_legend(legend_id)
     if not legend:
-        raise HTTPException(status_code=404, detail=f"Legend {legend_id} not found")
+        return None
 
     # 获取关联数据
     keywords = db.get_keywords(legend_id)
@@ -81,9 +118,9 @@ async def get_legend(legend_id: str):
         companies = db.list_person_companies(legend_id)
 
     # 读取 Markdown 文件内容
-    markdown_content = file_service.read_file(legend_id, legend.type)
+    markdown_content = get_file_service().read_file(legend_id, legend.type)
 
-    detail = LegendDetail(
+    return LegendDetail(
         **legend.model_dump(),
         keywords=keywords,
         products=products,
@@ -91,16 +128,11 @@ async def get_legend(legend_id: str):
         markdown_content=markdown_content
     )
 
-    return {
-        "code": 200,
-        "message": "success",
-        "data": detail.model_dump(mode="json")
-    }
-
 
 @router.post("/", response_model=dict)
 async def create_legend(data: LegendCreate):
     """手动创建 Legend"""
+    db = get_db()
     if db.legend_exists(data.id):
         raise HTTPException(status_code=400, detail=f"Legend {data.id} already exists")
 
@@ -116,6 +148,7 @@ async def create_legend(data: LegendCreate):
 @router.put("/{legend_id}", response_model=dict)
 async def update_legend(legend_id: str, data: LegendUpdate):
     """更新 Legend"""
+    db = get_db()
     if not db.legend_exists(legend_id):
         raise HTTPException(status_code=404, detail=f"Legend {legend_id} not found")
 
@@ -133,6 +166,7 @@ async def update_legend(legend_id: str, data: LegendUpdate):
 @router.delete("/{legend_id}", response_model=dict)
 async def delete_legend(legend_id: str):
     """删除 Legend（软删除/归档）"""
+    db = get_db()
     if not db.legend_exists(legend_id):
         raise HTTPException(status_code=404, detail=f"Legend {legend_id} not found")
 
@@ -158,7 +192,7 @@ async def sync_legends(auto_fetch: bool = False):
         auto_fetch: 是否自动调用 /baidu-ai-search 采集数据（暂未实现）
     """
     try:
-        result = sync_service.sync(auto_fetch=auto_fetch)
+        result = get_sync_service().sync(auto_fetch=auto_fetch)
 
         return {
             "code": 200,
@@ -172,7 +206,7 @@ async def sync_legends(auto_fetch: bool = False):
 @router.get("/sync/log", response_model=dict)
 async def get_sync_logs(limit: int = Query(50, ge=1, le=500)):
     """查看同步日志"""
-    logs = db.get_sync_logs(limit=limit)
+    logs = get_db().get_sync_logs(limit=limit)
 
     return {
         "code": 200,
@@ -188,9 +222,10 @@ async def get_sync_logs(limit: int = Query(50, ge=1, le=500)):
 
 
 @router.get("/keywords", response_model=dict)
+@single_flight()
 async def get_all_keywords():
     """获取所有关键词配置（从 YAML 读取）"""
-    yaml_config = sync_service.get_yaml_legends()
+    yaml_config = await run_in_threadpool(lambda: get_sync_service().get_yaml_legends())
 
     return {
         "code": 200,
@@ -205,6 +240,7 @@ async def get_all_keywords():
 @router.get("/{legend_id}/keywords", response_model=dict)
 async def get_legend_keywords(legend_id: str):
     """获取单个 Legend 的关键词"""
+    db = get_db()
     if not db.legend_exists(legend_id):
         raise HTTPException(status_code=404, detail=f"Legend {legend_id} not found")
 
@@ -226,6 +262,7 @@ async def get_legend_keywords(legend_id: str):
 @router.get("/{legend_id}/products", response_model=dict)
 async def get_legend_products(legend_id: str):
     """获取 Legend 的产品列表"""
+    db = get_db()
     if not db.legend_exists(legend_id):
         raise HTTPException(status_code=404, detail=f"Legend {legend_id} not found")
 
@@ -247,6 +284,7 @@ async def get_legend_products(legend_id: str):
 @router.get("/people/{person_id}/companies", response_model=dict)
 async def get_person_companies(person_id: str):
     """获取人物关联的公司列表"""
+    db = get_db()
     if not db.legend_exists(person_id):
         raise HTTPException(status_code=404, detail=f"Legend {person_id} not found")
 
@@ -263,6 +301,7 @@ async def get_person_companies(person_id: str):
 @router.get("/orgs/{company_id}/people", response_model=dict)
 async def get_company_people(company_id: str):
     """获取公司关联的人物列表"""
+    db = get_db()
     if not db.legend_exists(company_id):
         raise HTTPException(status_code=404, detail=f"Legend {company_id} not found")
 
@@ -0,0 +1,61 @@
+"""FastAPI Cache 后端
+
+- SQLiteCacheBackend：多 worker 部署时替代 InMemoryBackend，响应缓存存放在 SharedStateDB 的
+  kv_cache 表中，各 worker 共享同一份缓存，不会各自重复查询数据库
+- MeteredBackend：包装实际后端，统计缓存命中 / 未命中（sf_api_cache_requests_total 指标）
+"""
+
+from typing import Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi_cache.types import Backend
+
+from ..storage.shared_state import SharedStateDB
+from ..tools.metrics import api_cache_requests
+
+
+class SQLiteCacheBackend(Backend):
+    """基于 SharedStateDB 的 fastapi-cache 后端"""
+
+    def __init__(self, store: SharedStateDB):
+        self.store = store
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        return await run_in_threadpool(self.store.kv_get, key)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        _, value = await run_in_threadpool(self.store.kv_get, key)
+        return value
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        await run_in_threadpool(self.store.kv_set, key, value, expire)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        if namespace:
+            return await run_in_threadpool(self.store.kv_delete, None, namespace)
+        if key:
+            return await run_in_threadpool(self.store.kv_delete, key)
+        return 0
+
+
+class MeteredBackend(Backend):
+    """统计命中情况的 fastapi-cache 后端包装"""
+
+    def __init__(self, backend: Backend):
+        self.backend = backend
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        ttl, value = await self.backend.get_with_ttl(key)
+        api_cache_requests.inc("miss" if value is None else "hit")
+        return ttl, value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.backend.get(key)
+        api_cache_requests.inc("miss" if value is None else "hit")
+        return value
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        await self.backend.set(key, value, expire)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        return await self.backend.clear(namespace, key)
@@ -4,42 +4,85 @@
 """
 
 import asyncio
+import logging
+import time
+from collections import Counter
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 
 from ..config import ConfigReader
+from ..crawlers.budget import CrawlBudget
 from ..crawlers.dedup import TextDeduplicator
+from ..crawlers.http_archive import archive_mode
+from ..crawlers.resilience import CircuitOpenError, circuit_breakers
 from ..crawlers.universal import UniversalCrawler
 from ..models import Article
+from ..scheduler.jobs import crawl_jobs
+from ..scheduler.source_state import get_source_state_store
 from ..storage import TimelineDB
+from ..storage.shared_state import get_shared_state
+from ..tools.metrics import crawl_source_seconds, last_crawl_success
+from ..tools.stage_timer import StageTimer, current_source, current_timer
 
 router = APIRouter(prefix="/api/crawl", tags=["crawl"])
+logger = logging.getLogger(__name__)
 
-# 内存中保存最后刷新时间
+# 内存中保存最后刷新时间（启用共享状态时存入共享存储，各 worker 一致）
 _last_crawl_time: Optional[datetime] = None
+_LAST_CRAWL_KEY = "crawl:last_time"
 # 最小抓取间隔（秒）
 MIN_CRAWL_INTERVAL = 30  # 30秒
+# 抓取阶段整体等待在正文截止时间之外多留的秒数，让各新闻源先按自身截止时间收尾（保留部分结果）
+BUDGET_GRACE = 5
 
 
-async def run_crawl(source_id: str = None) -> Dict[str, Any]:
+def _get_last_crawl_time() -> Optional[datetime]:
+    """获取最后刷新时间"""
+    store = get_shared_state()
+    if store is None:
+        return _last_crawl_time
+    _, value = store.kv_get(_LAST_CRAWL_KEY)
+    return datetime.fromisoformat(value) if value else None
+
+
+def _set_last_crawl_time(value: datetime) -> None:
+    """记录最后刷新时间"""
+    global _last_crawl_time
+    _last_crawl_time = value
+    store = get_shared_state()
+    if store is not None:
+        store.kv_set(_LAST_CRAWL_KEY, value.isoformat())
+
+
+async def run_crawl(
+    source_id: str = None,
+    progress: Optional[Callable[..., None]] = None,
+    target_date: Optional[date] = None
+) -> Dict[str, Any]:
     """执行抓取任务
 
     使用通用爬虫框架，支持动态加载解析器。
 
     流程：
-    1. 并发抓取所有启用的新闻源
+    1. 并发抓取所有启用的新闻源（受时间预算限制，未完成的新闻源记为 timeout）
     2. 四层去重（时间、URL、标题相似度、批次内）
     3. keywords 筛选
     4. 统一入库
 
     Args:
         source_id: 指定新闻源ID，None表示抓取所有启用的源
+        progress: 进度回调 progress(stage, status, **info)（可选）
+        target_date: 去重与入库的目标日期，默认今天（回放归档时使用录制日期）
 
     Returns:
         抓取结果统计
     """
+    def report(stage: str, status: str = "running", **info):
+        if progress:
+            progress(stage, status, **info)
+
     # 加载配置
     reader = ConfigReader()
     sources_config = reader.load_news_sources_config()
@@ -53,6 +96,20 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
     # 并发数配置
     concurrent_limit = crawler_config.strategy.concurrent
 
+    # 抓取状态：列表未变化（304 / 响应体相同）的新闻源跳过解析、去重、筛选；
+    # 配置了 watermark 的新闻源只解析高水位之后的新条目
+    strategy = crawler_config.strategy
+    state = None
+    # 录制 / 回放时不发条件请求，保证归档中是完整的列表响应
+    conditional = strategy.conditional_fetch and not archive_mode.active
+    if conditional or strategy.incremental:
+        state = get_source_state_store().session(conditional, strategy.incremental)
+
+    # 时间预算：列表、正文按截止时间取消，已完成的部分照常入库
+    budget = CrawlBudget.from_config(crawler_config.budget)
+    # 各阶段耗时（列表请求、解析、正文、去重、筛选、入库）与计数，按新闻源区分，随结果返回
+    timer = StageTimer()
+
     # 统计数据
     all_articles: List[Article] = []
     source_results = []
@@ -60,28 +117,51 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
     async def fetch_single_source(source):
         """抓取单个新闻源"""
         crawler = None
+        # 任务内设置，本任务中的计时与计数（含 HTTP 请求数、字节数）记到该新闻源
+        current_source.set(source.id)
         try:
-            print(f"[Crawl] 开始抓取: {source.name} ({source.id})")
-            crawler = UniversalCrawler(source)
+            logger.info("[Crawl] 开始抓取: %s (%s)", source.name, source.id)
+            crawler = UniversalCrawler(source, state=state)
 
             # 抓取文章
-            articles = await crawler.fetch()
+            articles = await crawler.fetch(budget)
 
-            print(f"[Crawl] {source.name}: 抓取 {len(articles)} 条")
-            # 打印每篇文章的详细信息
-            for art in articles:
-                print(f"  - {art.title[:40]}... | {art.publish_time} | {art.url[:50]}...")
+            if crawler.not_modified:
+                logger.info("[Crawl] %s: 列表未变化，跳过", source.name)
+            logger.info("[Crawl] %s: 抓取 %d 条", source.name, len(articles))
+            timer.count("fetched", len(articles), source.id)
+            # 每篇文章的详细信息（DEBUG）
+            if logger.isEnabledFor(logging.DEBUG):
+                for art in articles:
+                    logger.debug("  - %.40s... | %s | %.50s...", art.title, art.publish_time, art.url)
 
             return {
                 "source": source.name,
                 "id": source.id,
                 "fetched": len(articles),
                 "status": "success",
+                "not_modified": crawler.not_modified,
+                "bodies_missing": crawler.bodies_missing,
+                "bodies_cached": crawler.bodies_cached,
                 "articles": articles
             }
 
+        except asyncio.TimeoutError:
+            logger.warning("[Crawl] 超时: %s 未在列表预算内完成", source.name)
+            return timeout_result(source)
+
+        except CircuitOpenError as e:
+            logger.warning("[Crawl] 跳过: %s - %s", source.name, e)
+            return {
+                "source": source.name,
+                "id": source.id,
+                "status": "circuit_open",
+                "error": str(e),
+                "articles": []
+            }
+
         except ImportError as e:
-            print(f"[Crawl] 解析器不存在: {source.id} - {e}")
+            logger.error("[Crawl] 解析器不存在: %s - %s", source.id, e)
             return {
                 "source": source.name,
                 "id": source.id,
@@ -91,9 +171,7 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
             }
 
         except Exception as e:
-            import traceback
-            print(f"[Crawl] 抓取失败: {source.name} - {e}")
-            traceback.print_exc()
+            logger.exception("[Crawl] 抓取失败: %s - %s", source.name, e)
             return {
                 "source": source.name,
                 "id": source.id,
@@ -106,65 +184,125 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
             if crawler:
                 await crawler.close()
 
+    def timeout_result(source):
+        return {
+            "source": source.name,
+            "id": source.id,
+            "status": "timeout",
+            "error": f"抓取超时（已用 {budget.elapsed():.0f}s）",
+            "articles": []
+        }
+
     # 并发抓取（限制并发数）
     semaphore = asyncio.Semaphore(concurrent_limit)
+    fetched_sources = 0
+    report("fetch", total=len(enabled_sources), done=0)
 
     async def fetch_with_semaphore(source):
+        nonlocal fetched_sources
         async with semaphore:
-            return await fetch_single_source(source)
-
-    results = await asyncio.gather(
-        *[fetch_with_semaphore(s) for s in enabled_sources],
-        return_exceptions=True
-    )
+            started = time.perf_counter()
+            result = await fetch_single_source(source)
+            crawl_source_seconds.observe(time.perf_counter() - started, source.id, result["status"])
+        fetched_sources += 1
+        report("fetch", total=len(enabled_sources), done=fetched_sources)
+        return result
+
+    # 抓取任务创建时复制当前上下文，各新闻源的列表、正文耗时记入本次的计时器
+    token = current_timer.set(timer)
+    tasks = [asyncio.ensure_future(fetch_with_semaphore(s)) for s in enabled_sources]
+    current_timer.reset(token)
+    if tasks:
+        remaining = budget.remaining("body")
+        _, pending = await asyncio.wait(tasks, timeout=remaining + BUDGET_GRACE if remaining is not None else None)
+        # 到期仍未结束的新闻源取消（等待其 finally 关闭连接）
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
     # 整理结果
-    for result in results:
-        if isinstance(result, Exception):
-            print(f"[Crawl] 任务异常: {result}")
+    for source, task in zip(enabled_sources, tasks):
+        if task.cancelled():
+            logger.warning("[Crawl] 超时取消: %s", source.name)
+            result = timeout_result(source)
+        elif task.exception() is not None:
+            logger.error("[Crawl] 任务异常: %s", task.exception())
             continue
+        else:
+            result = task.result()
 
         source_results.append({
             "source": result["source"],
             "id": result["id"],
-            "fetched": result["fetched"],
-            "status": result["status"]
+            "fetched": result.get("fetched", 0),
+            "status": result["status"],
+            "not_modified": result.get("not_modified", False),
+            "error": result.get("error"),
+            "bodies_missing": result.get("bodies_missing", 0),
+            "bodies_cached": result.get("bodies_cached", 0),
+            "circuit": circuit_breakers.get(result["id"]).to_dict(),
         })
 
         if result["status"] == "success":
             all_articles.extend(result["articles"])
 
-    print(f"[Crawl] 总抓取: {len(all_articles)} 条")
+    logger.info("[Crawl] 总抓取: %d 条", len(all_articles))
+    report("fetch", "done", total=len(enabled_sources), done=fetched_sources,
+           articles=len(all_articles))
 
     # 四层去重：时间 → URL → 标题 → 批次内
     original_count = len(all_articles)
+    report("dedup", input=original_count)
     if all_articles:
-        deduplicator = TextDeduplicator()
-        deduped_articles = deduplicator.dedup(all_articles)
-        print(f"[Crawl] 去重: {original_count} -> {len(deduped_articles)} 条")
+        with timer.stage("dedup"):
+            # 去重要读写数据库 / 共享缓存，放到线程中执行，不阻塞事件循环
+            deduplicator = await asyncio.to_thread(TextDeduplicator, target_date)
+            deduped_articles = await asyncio.to_thread(deduplicator.dedup, all_articles)
+        for layer, drops in deduplicator.dropped.items():
+            for sid, dropped in drops.items():
+                timer.count(f"dedup_{layer}_dropped", dropped, sid)
+        logger.info("[Crawl] 去重: %d -> %d 条", original_count, len(deduped_articles))
     else:
         deduped_articles = []
+    report("dedup", "done", input=original_count, output=len(deduped_articles))
+
+    # 各新闻源的新条目数（去重后、筛选前），用于自适应调度
+    new_by_source = Counter(article.source for article in deduped_articles)
+    for source_result in source_results:
+        source_result["new"] = new_by_source.get(source_result["id"], 0)
 
     # 第五层：keywords 筛选
+    report("filter", input=len(deduped_articles))
     if deduped_articles:
         from ..crawlers.keywords_filter import filter_by_keywords
-        keyword_filtered = filter_by_keywords(deduped_articles)
-        print(f"[Crawl] keywords筛选: {len(deduped_articles)} -> {len(keyword_filtered)} 条")
+        with timer.stage("filter"):
+            keyword_filtered = filter_by_keywords(deduped_articles)
+        logger.info("[Crawl] keywords筛选: %d -> %d 条", len(deduped_articles), len(keyword_filtered))
+        for article in keyword_filtered:
+            timer.count("keyword_legend" if article.legend else "keyword_front", 1, article.source)
+        dropped = Counter(a.source for a in deduped_articles) - Counter(a.source for a in keyword_filtered)
+        for sid, count in dropped.items():
+            timer.count("keyword_dropped", count, sid)
         deduped_articles = keyword_filtered
+    report("filter", "done", output=len(deduped_articles))
 
     # 统一入库
     saved_count = 0
-    db = TimelineDB(date.today())
+    db = TimelineDB(target_date or date.today())
     db.init_db()
+    # 一次查询取出已入库的 URL，避免逐条查询
+    existing_urls = await asyncio.to_thread(db.existing_urls, [a.url for a in deduped_articles])
 
     # 读取存储配置（已在开头读取 crawler_config）
     save_content = crawler_config.storage.save_content
+    report("save", total=len(deduped_articles), saved=0)
 
     for article in deduped_articles:
+        started = time.perf_counter()
         try:
             # 检查是否已存在
-            if not db.article_exists(article.url):
-                print(f"[Crawl] 准备入库: {article.title[:40]}..., content={'有' if article.content else '无'}")
+            if article.url not in existing_urls:
+                logger.debug("[Crawl] 准备入库: %.40s..., content=%s", article.title, "有" if article.content else "无")
 
                 # 保存正文文件
                 if save_content and article.content:
@@ -204,71 +342,137 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
                     article.file_path = str(file_path)
 
                 db.insert_article(article)
+                existing_urls.add(article.url)
                 saved_count += 1
+                timer.count("saved", 1, article.source)
+                report("save", total=len(deduped_articles), saved=saved_count)
         except Exception as e:
-            print(f"[Crawl] 入库失败: {article.title} - {e}")
+            logger.error("[Crawl] 入库失败: %s - %s", article.title, e)
+        finally:
+            timer.add("db_write", time.perf_counter() - started, article.source)
 
-    print(f"[Crawl] 入库: {saved_count} 条")
+    logger.info("[Crawl] 入库: %d 条", saved_count)
+    report("save", "done", total=len(deduped_articles), saved=saved_count)
+
+    # 结果已入库，提交抓取成功的新闻源的校验信息与高水位
+    if state is not None:
+        state.commit(r["id"] for r in source_results if r["status"] == "success")
+    # 至少一个新闻源抓取成功才算成功（全部失败 / 超时时不更新，便于告警）
+    if any(r["status"] == "success" for r in source_results):
+        last_crawl_success.set(time.time())
 
     return {
         "total_fetched": original_count,
         "after_dedup": len(deduped_articles),
         "total_saved": saved_count,
         "sources": source_results,
+        "timings": timer.summary(),
+        "profile": timer.profile(),
+        "budget": {
+            **budget.to_dict(),
+            "timeouts": [r["id"] for r in source_results if r["status"] == "timeout"],
+        },
     }
 
 
 @router.post("/trigger")
-async def trigger_crawl(source_id: str = None, force: bool = False) -> Dict[str, Any]:
+async def trigger_crawl(source_id: str = None, force: bool = False, wait: bool = False) -> Dict[str, Any]:
     """手动触发抓取
 
+    抓取在后台执行，立即返回任务 ID，通过 GET /api/crawl/jobs/{id} 查询进度。
+    已有抓取任务在运行时（包括定时任务），本次触发合并到该任务。
+
     Args:
         source_id: 可选，指定抓取的新闻源ID
         force: 是否强制跳过频率限制（默认否）
+        wait: 是否等待抓取完成后再返回（默认否，兼容旧调用方式）
 
     Returns:
-        抓取结果统计
+        任务信息；wait=True 时返回抓取结果统计
     """
-    global _last_crawl_time
+    running = crawl_jobs.current
+    last_crawl_time = _get_last_crawl_time()
 
-    # 检查抓取频率（除非强制）
-    if not force and _last_crawl_time:
-        elapsed = (datetime.now() - _last_crawl_time).total_seconds()
+    # 检查抓取频率（除非强制，或直接合并到运行中的任务）
+    if not running and not force and last_crawl_time:
+        elapsed = (datetime.now() - last_crawl_time).total_seconds()
         if elapsed < MIN_CRAWL_INTERVAL:
             remaining = int(MIN_CRAWL_INTERVAL - elapsed)
             return {
                 "code": 429,
                 "message": f"刷新过于频繁，请等待 {remaining} 秒后再试",
                 "data": {
-                    "last_crawl_time": _last_crawl_time.isoformat(),
+                    "last_crawl_time": last_crawl_time.isoformat(),
                     "remaining_seconds": remaining,
                 },
             }
 
-    try:
-        result = await run_crawl(source_id)
-
+    job, created = crawl_jobs.submit(source_id=source_id, trigger="api")
+    if created:
         # 更新最后刷新时间
-        _last_crawl_time = datetime.now()
+        _set_last_crawl_time(datetime.now())
 
-        if result["total_saved"] == 0:
-            return {
-                "code": 200,
-                "message": "抓取完成，但未找到符合条件的新闻或新闻已存在",
-                "data": result,
-            }
+    if not wait:
+        return {
+            "code": 202,
+            "message": "抓取任务已提交" if created else "已有抓取任务在运行，已合并到该任务",
+            "data": job.to_dict(),
+        }
+
+    try:
+        result = await crawl_jobs.wait(job)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"抓取失败: {str(e)}")
 
+    if job.status == "skipped":
+        # 其他 worker 持有抓取租约，本次未执行
+        return {
+            "code": 409,
+            "message": f"抓取未执行: {job.error}",
+            "data": job.to_dict(),
+        }
+
+    if result["total_saved"] == 0:
         return {
             "code": 200,
-            "message": f"成功抓取并保存 {result['total_saved']} 条新闻",
+            "message": "抓取完成，但未找到符合条件的新闻或新闻已存在",
             "data": result,
         }
 
-    except Exception as e:
-        import traceback
+    return {
+        "code": 200,
+        "message": f"成功抓取并保存 {result['total_saved']} 条新闻",
+        "data": result,
+    }
 
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"抓取失败: {str(e)}")
+
+@router.get("/jobs")
+async def list_crawl_jobs(limit: int = 10) -> Dict[str, Any]:
+    """获取最近的抓取任务"""
+    jobs = crawl_jobs.list_jobs(limit=limit)
+    return {
+        "code": 200,
+        "message": "success",
+        "data": [job.to_dict() for job in jobs],
+        "total": len(jobs),
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_crawl_job(job_id: str) -> Dict[str, Any]:
+    """查询抓取任务进度"""
+    job = crawl_jobs.get(job_id)
+    if not job:
+        return {
+            "code": 404,
+            "message": "Job not found",
+            "data": None,
+        }
+    return {
+        "code": 200,
+        "message": "success",
+        "data": job.to_dict(),
+    }
 
 
 @router.get("/status")
@@ -279,6 +483,7 @@ async def get_crawl_status() -> Dict[str, Any]:
     db = TimelineDB(date.today())
     db.init_db()
     articles = db.list_articles(limit=1000)
+    last_crawl_time = _get_last_crawl_time()
 
     return {
         "code": 200,
@@ -286,7 +491,7 @@ async def get_crawl_status() -> Dict[str, Any]:
         "data": {
             "today_count": len(articles),
             "date": date.today().isoformat(),
-            "last_crawl_time": _last_crawl_time.isoformat() if _last_crawl_time else None,
+            "last_crawl_time": last_crawl_time.isoformat() if last_crawl_time else None,
         },
     }
 
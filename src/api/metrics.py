@@ -0,0 +1,54 @@
+"""指标 API
+
+GET /metrics 输出 Prometheus 文本格式的进程内指标（见 tools.metrics）；
+MetricsMiddleware 按路由模板记录每个请求的耗时。
+"""
+
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..crawlers.dedup import today_news_cache
+from ..crawlers.url_cache import url_cache
+from ..tools.metrics import http_request_seconds, registry
+
+router = APIRouter(tags=["metrics"])
+
+# 缓存大小在采集时读取
+registry.gauge("sf_dedup_cache_size", "Entries in the today-news dedup cache",
+               collect=lambda: today_news_cache.count)
+registry.gauge("sf_url_cache_size", "URLs in the URL cache", collect=lambda: url_cache.count)
+
+
+class MetricsMiddleware:
+    """记录请求耗时的 ASGI 中间件（route 取匹配到的路由模板，避免路径参数撑大标签数量）"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_request_seconds.observe(time.perf_counter() - started, scope["method"], route, str(status))
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus 指标"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
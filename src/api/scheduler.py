@@ -0,0 +1,34 @@
+"""调度器 API
+
+定时抓取的执行记录（见 JobExecutionStore）
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+
+from ..scheduler.store import JobExecutionStore
+
+router = APIRouter(prefix="/api/scheduler", tags=["scheduler"])
+
+
+@router.get("/jobs/{job_id}/profile")
+async def get_job_profile(job_id: str) -> Dict[str, Any]:
+    """查询一次定时抓取的耗时与计数
+
+    Args:
+        job_id: 执行记录 ID，或任务 ID（如 news_crawl_20250101_080000）
+    """
+    profile = await run_in_threadpool(JobExecutionStore().get_profile, job_id)
+    if profile is None:
+        return {
+            "code": 404,
+            "message": "Job not found",
+            "data": None,
+        }
+    return {
+        "code": 200,
+        "message": "success",
+        "data": profile,
+    }
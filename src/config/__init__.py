@@ -8,9 +8,12 @@ from .models import (
     CrawlerConfig,
 )
 from .reader import ConfigReader
+from .service import ConfigService, config_service
 
 __all__ = [
     "ConfigReader",
+    "ConfigService",
+    "config_service",
     "LegendConfig",
     "CompanyConfig",
     "NewsKeywordsConfig",
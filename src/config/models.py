@@ -1,10 +1,15 @@
 """配置数据模型"""
 
-from typing import List, Optional, Dict
-from pydantic import BaseModel, Field
+from typing import Any, List, Literal, Optional, Dict, Union
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class Legend(BaseModel):
+class ConfigModel(BaseModel):
+    """配置模型基类：不可修改（配置快照在调用方之间共用，修改须用 model_copy(update=...)）"""
+    model_config = ConfigDict(frozen=True)
+
+
+class Legend(ConfigModel):
     """奇点人物"""
     id: str
     name: str
@@ -15,12 +20,12 @@ class Legend(BaseModel):
     description: Optional[str] = None
 
 
-class LegendConfig(BaseModel):
+class LegendConfig(ConfigModel):
     """奇点人物配置"""
     legends: List[Legend]
 
 
-class Company(BaseModel):
+class Company(ConfigModel):
     """公司"""
     id: str
     name: str
@@ -32,7 +37,7 @@ class Company(BaseModel):
     keywords: Optional[List[str]] = None
 
 
-class CompanyConfig(BaseModel):
+class CompanyConfig(ConfigModel):
     """公司档案配置"""
     companies: List[Company]
 
@@ -41,7 +46,7 @@ class CompanyConfig(BaseModel):
         extra = "allow"
 
 
-class Relation(BaseModel):
+class Relation(ConfigModel):
     """公司关系"""
     from_id: str
     to_id: str
@@ -49,13 +54,50 @@ class Relation(BaseModel):
     description: Optional[str] = None
 
 
-class CompanyRelationsConfig(BaseModel):
+class CompanyRelationsConfig(ConfigModel):
     """公司关系配置"""
     companies: List[Company]
     relations: List[Relation]
 
 
-class NewsSource(BaseModel):
+class SourcePollConfig(ConfigModel):
+    """单个新闻源的抓取间隔上下限（秒）"""
+    min_interval: Optional[int] = None
+    max_interval: Optional[int] = None
+
+
+class SourceListSpec(ConfigModel):
+    """声明式新闻源：列表提取规则"""
+    format: Literal["json", "html", "json_var"] = "json"
+    path: str = ""  # json / json_var：列表在文档中的路径（点号分隔，如 data.roll_data）
+    selector: str = ""  # html：列表项 CSS 选择器
+    fields: Dict[str, str] = Field(default_factory=dict)  # html：条目字段选择器（@ 后为属性名）
+    pattern: str = ""  # json_var：提取脚本中 JSON 变量的正则（第 1 个分组）
+
+
+class SourceBodySpec(ConfigModel):
+    """声明式新闻源：正文提取规则"""
+    containers: List[List[Optional[str]]] = Field(default_factory=list)  # [[标签, class 或 null], ...]
+    body_fallback: int = 0  # 找不到容器时取 <body> 下前 N 段（0 表示不回退）
+
+
+class SourceWatermarkSpec(ConfigModel):
+    """声明式新闻源：增量解析（高水位）"""
+    overlap: int = 300  # 重叠窗口（秒）：早于 高水位 - overlap 的条目视为已处理
+    ordered: bool = True  # 列表按发布时间倒序：遇到已处理的条目即停止（否则逐条跳过）
+
+
+class SourceSpec(ConfigModel):
+    """声明式新闻源规则（编译为提取计划，由通用引擎执行，无需编写解析器）"""
+    list: SourceListSpec
+    fields: Dict[str, str]  # title / url / publish_time 的取值表达式
+    time_format: Union[str, List[str]] = "timestamp"  # timestamp | timestamp_ms | relative | strptime 格式
+    exclude: Dict[str, Any] = Field(default_factory=dict)  # 路径 -> 排除值列表 / true（为真即排除）
+    body: SourceBodySpec = Field(default_factory=SourceBodySpec)
+    watermark: Optional[SourceWatermarkSpec] = None  # 配置后按高水位只解析新增条目
+
+
+class NewsSource(ConfigModel):
     """新闻源"""
     id: str
     name: str
@@ -63,17 +105,19 @@ class NewsSource(BaseModel):
     enabled: bool = True
     url: str
     channels: Optional[List[str]] = None
+    spec: Optional[SourceSpec] = None  # 为空时使用 parsers/{id}.py 解析器
+    poll: Optional[SourcePollConfig] = None  # 自适应抓取间隔上下限（覆盖 crawler_config.yaml 的 polling）
 
     class Config:
         extra = "allow"  # 允许额外字段，向后兼容
 
 
-class NewsSourcesConfig(BaseModel):
+class NewsSourcesConfig(ConfigModel):
     """新闻源配置"""
     sources: List[NewsSource]
 
 
-class NewsKeywordsConfig(BaseModel):
+class NewsKeywordsConfig(ConfigModel):
     """新闻关键词配置（动态结构）"""
     people: Dict[str, List[str]] = {}
     companies: Dict[str, List[str]] = {}
@@ -83,40 +127,100 @@ class NewsKeywordsConfig(BaseModel):
         extra = "allow"
 
 
-class StrategyConfig(BaseModel):
+class StrategyConfig(ConfigModel):
     """抓取策略"""
     interval: int  # 抓取间隔（秒）
     min_interval: int  # 最小抓取间隔限制
     concurrent: int  # 并发抓取数量
     news_batch_limit: int = 20  # 每个新闻源每次抓取的条数限制
+    conditional_fetch: bool = True  # 列表接口条件请求（ETag / Last-Modified / 响应体哈希），未变化时跳过解析
+    incremental: bool = True  # 按新闻源高水位只解析新增条目（需在 spec 中配置 watermark）
 
 
-class NetworkConfig(BaseModel):
+class NetworkConfig(ConfigModel):
     """网络配置"""
     timeout: int = 30
-    retry: int = 3
-    retry_delay: int = 5
+    retry: int = 3  # 临时错误（连接失败、超时、429 / 5xx）重试次数
+    retry_delay: int = 5  # 首次重试等待（秒），之后指数增长并加随机抖动
+    retry_max_delay: int = 60  # 单次重试等待上限（秒）
+    breaker_threshold: int = 3  # 新闻源连续失败多少次后熔断
+    breaker_cooldown: int = 600  # 熔断冷却时间（秒），期间跳过该新闻源
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
 
-class StorageConfig(BaseModel):
+class StorageConfig(ConfigModel):
     """存储配置"""
     save_content: bool = True
     dedup: bool = True
     content_format: str = "markdown"
     db_path: str = "data/db/scheduler.sqlite"  # 调度器数据库路径
+    body_cache: bool = True  # 正文缓存：同一 URL 的正文只下载、提取一次
+    body_cache_path: str = "data/db/body_cache.sqlite"  # 正文缓存数据库路径
+    body_cache_max_mb: int = 200  # 正文缓存大小上限（MB），超出按最近访问时间淘汰
 
 
-class LoggingConfig(BaseModel):
+class LoggingConfig(ConfigModel):
     """日志配置"""
-    level: str = "INFO"
+    level: str = "INFO"  # DEBUG 时输出逐条文章的信息
     save_logs: bool = True
     log_dir: str = "logs"
+    format: Literal["text", "json"] = "text"  # json：每行一个 JSON 对象
+    max_mb: int = 20  # 单个日志文件大小上限（MB），超出后轮转
+    backup_count: int = 5  # 保留的轮转文件数
+
+
+class ParseConfig(ConfigModel):
+    """解析执行配置"""
+    executor: Literal["process", "thread", "inline"] = "process"  # HTML 解析执行位置
+    max_workers: int = 2  # 解析进程/线程数
+    html_engine: Literal["auto", "lxml", "bs4"] = "auto"  # HTML 引擎（auto：优先 lxml，缺依赖时用 bs4）
+
+
+class PollingConfig(ConfigModel):
+    """自适应抓取（每个新闻源单独调度）"""
+    adaptive: bool = False  # 开启后按新闻源分别调度，间隔随新条目速率、失败率调整
+    min_interval: int = 900  # 间隔下限（秒），不低于调度器的 MIN_INTERVAL
+    max_interval: int = 7200  # 间隔上限（秒）
+    target_new: float = 3  # 期望每次抓取获得的新条目数
+    jitter: float = 0.1  # 随机延后比例（0.1 表示最多延后间隔的 10%），错开各源的请求
+
+
+class HostRateConfig(ConfigModel):
+    """单个主机的限速"""
+    rate: float  # 每秒请求数
+    burst: int = 1  # 允许的突发请求数
+
+
+class RateLimitConfig(ConfigModel):
+    """按主机限速（令牌桶，列表、正文、新闻源测试共用）"""
+    enabled: bool = True
+    rate: float = 2.0  # 每个主机每秒请求数
+    burst: int = 4  # 每个主机允许的突发请求数
+    hosts: Dict[str, HostRateConfig] = {}  # 按主机（或上级域名）覆盖
+
+
+class BudgetConfig(ConfigModel):
+    """抓取时间预算（秒，0 表示不限）"""
+    total: int = 600  # 整次抓取的上限，列表、正文子预算均不超过它
+    list: int = 120  # 列表抓取：抓取开始后多少秒内各新闻源须拿到列表，否则记为 timeout
+    body: int = 300  # 正文抓取：列表预算之后再给多少秒，超时未取到的正文留空
+
+
+class DeployConfig(ConfigModel):
+    """部署配置（多 worker）"""
+    shared_state: bool = False  # 多 worker 部署时开启：去重缓存、API 缓存等进程间共享
+    state_db_path: str = "data/db/shared_state.sqlite"  # 共享状态数据库路径
+    leader_ttl: int = 60  # 调度器选主租约时长（秒）
 
 
-class CrawlerConfig(BaseModel):
+class CrawlerConfig(ConfigModel):
     """抓取器配置"""
     strategy: StrategyConfig
     network: NetworkConfig
     storage: StorageConfig
     logging: LoggingConfig
+    parse: ParseConfig = ParseConfig()
+    deploy: DeployConfig = DeployConfig()
+    polling: PollingConfig = PollingConfig()
+    budget: BudgetConfig = BudgetConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
@@ -1,8 +1,11 @@
-"""配置读取器"""
+"""配置读取器
+
+读取经过 config_service 缓存：同一文件只在内容变化后重新解析，返回的配置模型在调用方之间共用、不可修改。
+"""
 
 from pathlib import Path
-from typing import Dict, Any
-import yaml
+from typing import Dict, Any, Type, TypeVar
+from pydantic import BaseModel
 
 from .models import (
     LegendConfig,
@@ -11,6 +14,9 @@ from .models import (
     NewsSourcesConfig,
     CrawlerConfig,
 )
+from .service import config_service
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
 
 
 class ConfigReader:
@@ -20,23 +26,20 @@ class ConfigReader:
         self.config_dir = Path(config_dir)
 
     def _load_yaml(self, filename: str) -> Dict[str, Any]:
-        """加载 YAML 文件"""
-        path = self.config_dir / filename
-        if not path.exists():
-            raise FileNotFoundError(f"配置文件不存在: {path}")
+        """加载 YAML 文件（副本）"""
+        return config_service.load_data(self.config_dir / filename)
 
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+    def _load_model(self, filename: str, model: Type[ModelT]) -> ModelT:
+        """加载 YAML 文件并校验为配置模型（缓存的快照）"""
+        return config_service.load(self.config_dir / filename, lambda data: model(**data), model.__name__)
 
     def load_legend_config(self) -> LegendConfig:
         """加载奇点人物配置"""
-        data = self._load_yaml("legend.yaml")
-        return LegendConfig(**data)
+        return self._load_model("legend.yaml", LegendConfig)
 
     def load_company_config(self) -> CompanyRelationsConfig:
         """加载公司档案配置"""
-        data = self._load_yaml("company.yaml")
-        return CompanyRelationsConfig(**data)
+        return self._load_model("company.yaml", CompanyRelationsConfig)
 
     def load_news_keywords_config(self) -> Dict[str, Any]:
         """加载新闻关键词配置"""
@@ -44,13 +47,11 @@ class ConfigReader:
 
     def load_news_sources_config(self) -> NewsSourcesConfig:
         """加载新闻源配置"""
-        data = self._load_yaml("news_sources.yaml")
-        return NewsSourcesConfig(**data)
+        return self._load_model("news_sources.yaml", NewsSourcesConfig)
 
     def load_crawler_config(self) -> CrawlerConfig:
         """加载抓取器配置"""
-        data = self._load_yaml("crawler_config.yaml")
-        return CrawlerConfig(**data)
+        return self._load_model("crawler_config.yaml", CrawlerConfig)
 
     def load_all(self) -> Dict[str, Any]:
         """加载所有配置"""
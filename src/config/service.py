@@ -0,0 +1,110 @@
+"""配置缓存（进程内共用）
+
+每个配置文件只解析、校验一次，缓存校验后的快照；再次读取时只 stat 文件，
+修改时间 / 大小 / inode 变化时才读取内容，内容哈希也变化时才重新解析。
+
+快照在各调用方之间共用：配置模型不可修改（frozen，修改须用 model_copy(update=...)），
+未建模的配置（新闻关键词）每次返回一份副本。
+"""
+
+import copy
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+import yaml
+
+
+@dataclass
+class _Snapshot:
+    """一个配置文件的缓存"""
+    stat: Tuple[int, int, int]  # (mtime_ns, size, inode)
+    digest: str
+    value: Any
+    parses: int = 1
+    hits: int = 0
+
+
+class ConfigService:
+    """按文件缓存配置快照，文件变化时重新加载"""
+
+    def __init__(self):
+        self._snapshots: Dict[Tuple[Path, str], _Snapshot] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: Path, build: Callable[[Any], Any] = None, kind: str = "yaml") -> Any:
+        """读取配置文件的快照
+
+        Args:
+            path: 配置文件路径
+            build: 将 YAML 数据转换为配置对象（如 pydantic 模型），为空时返回 YAML 数据
+            kind: 缓存键的一部分，同一文件以不同方式构建时互不影响
+
+        Raises:
+            FileNotFoundError: 配置文件不存在
+        """
+        display = path
+        path = Path(path).resolve()
+        key = (path, kind)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._snapshots.pop(key, None)
+            raise FileNotFoundError(f"配置文件不存在: {display}") from None
+        stat = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.stat == stat:
+                snapshot.hits += 1
+                return snapshot.value
+
+            content = path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if snapshot is not None and snapshot.digest == digest:
+                # 只是 touch / 原样重写：内容未变，沿用快照
+                snapshot.stat = stat
+                snapshot.hits += 1
+                return snapshot.value
+
+            data = yaml.safe_load(content.decode("utf-8"))
+            value = build(data) if build is not None else data
+            if snapshot is None:
+                self._snapshots[key] = _Snapshot(stat, digest, value)
+            else:
+                self._snapshots[key] = _Snapshot(stat, digest, value, snapshot.parses + 1, snapshot.hits)
+            return value
+
+    def load_data(self, path: Path) -> Any:
+        """读取未建模的 YAML 数据（返回副本，调用方修改不影响缓存）"""
+        return copy.deepcopy(self.load(path))
+
+    def clear(self) -> None:
+        """清空缓存（下次读取时重新解析）"""
+        with self._lock:
+            self._snapshots.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """各配置文件的解析次数与缓存命中次数"""
+        with self._lock:
+            files = {
+                f"{path.name}:{kind}" if kind != "yaml" else path.name: {
+                    "parses": snapshot.parses,
+                    "hits": snapshot.hits,
+                    "digest": snapshot.digest[:12],
+                }
+                for (path, kind), snapshot in self._snapshots.items()
+            }
+        return {
+            "files": files,
+            "parses": sum(f["parses"] for f in files.values()),
+            "hits": sum(f["hits"] for f in files.values()),
+        }
+
+
+# 全局单例
+config_service = ConfigService()
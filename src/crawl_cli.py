@@ -1,23 +1,117 @@
 """爬虫 CLI 入口
 
 独立运行爬虫，无需 FastAPI 服务。
+
+    python -m src.crawl_cli                      # 正常抓取
+    python -m src.crawl_cli --record DIR         # 正常抓取，并把所有新闻源请求 / 响应录制到 DIR
+    python -m src.crawl_cli --replay DIR         # 离线回放 DIR 中的归档（不访问网络）
+    python -m src.crawl_cli --log-level DEBUG    # 输出逐条文章的信息
+    python -m src.crawl_cli --profile cpu        # 剖析抓取（cpu / wall / alloc，见 tools.profiling）
+
+回放在临时工作目录中运行（复制 config/，data/ 从空开始），不影响本地数据库与缓存，
+多次回放的结果与耗时可以直接比较；去重、入库的目标日期使用录制日期。
 """
 
+import argparse
 import asyncio
+import os
+import shutil
 import sys
+import tempfile
+from pathlib import Path
 
 from src.api.crawl import run_crawl
+from src.config import ConfigReader
+from src.crawlers.http_archive import archive_mode
+from src.tools.logging_setup import setup_logging, stop_logging
+from src.tools.profiling import PROFILE_MODES, default_path, profiled, summarize
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.crawl_cli", description="运行新闻抓取")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="DIR", help="录制所有新闻源请求与响应到 DIR")
+    mode.add_argument("--replay", metavar="DIR", help="离线回放 DIR 中录制的请求")
+    parser.add_argument("--latency", type=float, default=0, help="回放时每个请求的固定延迟（毫秒）")
+    parser.add_argument("--jitter", type=float, default=0, help="回放时额外随机延迟上限（毫秒）")
+    parser.add_argument("--seed", type=int, default=0, help="回放延迟的随机种子")
+    parser.add_argument("--workdir", metavar="DIR", help="回放的工作目录（默认临时目录，结束后删除）")
+    parser.add_argument("--log-level", metavar="LEVEL", help="日志级别（默认取 logging.level，DEBUG 输出逐条文章）")
+    parser.add_argument("--profile", choices=PROFILE_MODES,
+                        help="剖析抓取：cpu（cProfile .pstats）| wall（采样，speedscope JSON）| alloc（tracemalloc 快照）")
+    parser.add_argument("--profile-out", metavar="FILE", help="剖析文件路径（默认 data/profiles/ 下按时间命名）")
+    return parser.parse_args(argv)
+
 
+def _enter_workdir(workdir: str = None) -> str:
+    """切换到回放工作目录（复制 config/），返回原工作目录"""
+    origin = os.getcwd()
+    target = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix="crawl_replay_"))
+    target.mkdir(parents=True, exist_ok=True)
+    shutil.copytree(Path(origin) / "config", target / "config", dirs_exist_ok=True)
+    # 已导入的 src 包不受影响；确保函数内的延迟导入仍能找到项目代码
+    if origin not in sys.path:
+        sys.path.insert(0, origin)
+    os.chdir(target)
+    print(f"[CLI] 回放工作目录: {target}")
+    return origin
 
-async def main():
+
+async def main(argv=None):
     """运行爬虫（独立 CLI 入口）"""
-    result = await run_crawl()
+    args = parse_args(argv)
+    target_date = None
+    origin = None
+    workdir = None
+    profile_path = None
+    if args.profile:
+        # 回放会切换工作目录，先确定绝对路径
+        profile_path = Path(args.profile_out or default_path(args.profile, "crawl")).resolve()
+
+    if args.record:
+        archive_mode.record(args.record)
+    elif args.replay:
+        archive = archive_mode.replay(
+            os.path.abspath(args.replay), args.latency / 1000, args.jitter / 1000, args.seed
+        )
+        target_date = archive.recorded_at.date()
+        origin = _enter_workdir(args.workdir)
+        workdir = os.getcwd()
+
+    # 回放时已切换到工作目录，日志文件写在工作目录下
+    logging_config = ConfigReader().load_crawler_config().logging
+    if args.log_level:
+        logging_config = logging_config.model_copy(update={"level": args.log_level})
+    setup_logging(logging_config)
+
+    try:
+        if profile_path is not None:
+            with profiled(args.profile, profile_path, "crawl"):
+                result = await run_crawl(target_date=target_date)
+        else:
+            result = await run_crawl(target_date=target_date)
+    finally:
+        if archive_mode.mode == "replay" and archive_mode.archive.misses:
+            print(f"[CLI] 回放时归档中缺少 {len(archive_mode.archive.misses)} 个请求（返回 404）")
+        archive_mode.stop()
+        stop_logging()
+        if origin is not None:
+            os.chdir(origin)
+            if not args.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
 
     # 打印结果摘要
     print(f"\n抓取完成:")
     print(f"  - 原始抓取: {result['total_fetched']} 条")
     print(f"  - 去重后: {result['after_dedup']} 条")
     print(f"  - 新增入库: {result['total_saved']} 条")
+    budget = result.get("budget", {})
+    print(f"  - 耗时: {budget.get('elapsed')} 秒（预算 {budget.get('total') or '不限'} 秒）")
+    if budget.get("timeouts"):
+        print(f"  - 超时新闻源: {', '.join(budget['timeouts'])}")
+    if profile_path is not None:
+        print(f"\n剖析结果（{args.profile}）: {profile_path}")
+        print(summarize(args.profile, profile_path))
 
     return 0
 
@@ -14,6 +14,7 @@ class BaseCrawler(ABC):
 
     def __init__(self, timeout: int = 30, config_dir: str = "config"):
         self.timeout = timeout
+        self.config_dir = config_dir
         self.client = httpx.AsyncClient(
             timeout=timeout,
             headers={
@@ -0,0 +1,67 @@
+"""抓取时间预算
+
+一次抓取从开始计时，按截止时间（而不是每个请求各自的超时）限制：
+
+- 列表截止：开始 + list 秒。到期仍未拿到列表的新闻源取消并记为 timeout
+- 正文截止：开始 + list + body 秒。到期取消剩余正文请求，已取到的保留，其余正文留空
+- 两个截止时间都不超过开始 + total 秒
+
+截止时间由调用方用 asyncio.wait_for 等按 remaining() 取消；去重、入库在本地执行，不受预算限制，
+已完成的部分照常入库。
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..config.models import BudgetConfig
+
+
+class CrawlBudget:
+    """一次抓取的时间预算（秒，0 / None 表示不限）"""
+
+    def __init__(
+        self,
+        total: Optional[float] = None,
+        list_budget: Optional[float] = None,
+        body_budget: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.total = total or None
+        self.list_budget = list_budget or None
+        self.body_budget = body_budget or None
+        self.clock = clock
+        self.started = clock()
+
+    @classmethod
+    def from_config(cls, config: BudgetConfig) -> "CrawlBudget":
+        return cls(config.total, config.list, config.body)
+
+    def deadline(self, stage: str) -> Optional[float]:
+        """阶段截止时间（clock 时间），None 表示不限"""
+        if stage == "list":
+            offset = self.list_budget
+        elif stage == "body":
+            offset = self.list_budget + self.body_budget if self.list_budget and self.body_budget else None
+        else:
+            raise ValueError(f"未知的抓取阶段: {stage}")
+
+        if self.total is not None:
+            offset = self.total if offset is None else min(offset, self.total)
+        return self.started + offset if offset is not None else None
+
+    def remaining(self, stage: str) -> Optional[float]:
+        """阶段剩余秒数（不小于 0），None 表示不限"""
+        deadline = self.deadline(stage)
+        return max(0.0, deadline - self.clock()) if deadline is not None else None
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        """预算与实际耗时（用于抓取结果）"""
+        return {
+            "total": self.total,
+            "list": self.list_budget,
+            "body": self.body_budget,
+            "elapsed": round(self.elapsed(), 2),
+        }
@@ -1,12 +1,23 @@
 """参考消息爬虫"""
 
-from typing import List
+import asyncio
+from typing import List, Optional
 from datetime import datetime
 import httpx
-from bs4 import BeautifulSoup
 
 from .base import BaseCrawler
+from ..config import ConfigReader
 from ..models import Article, SourceType
+from ..storage.body_cache import BodyCache, get_body_cache
+from ..tools.html_extract import extract_paragraphs
+from ..tools.parse_executor import parse_executor
+
+
+# 正文容器（按顺序匹配第一个存在的，找不到时取 <body> 下前 20 段）
+CONTENT_CONTAINERS = [
+    ("div", "article-content"),
+    ("div", "content"),
+]
 
 
 class CankaoxiaoxiCrawler(BaseCrawler):
@@ -45,40 +56,49 @@ class CankaoxiaoxiCrawler(BaseCrawler):
         # 过滤关键词
         filtered = self.filter_keywords(articles)
 
-        # 获取文章正文内容
+        # 获取文章正文内容（与通用爬虫共用正文缓存，SQLite 读写放到线程中执行）
+        body_cache = self._body_cache()
+        cached = {}
+        if body_cache is not None:
+            cached = await asyncio.to_thread(body_cache.get_many, [a.url for a in filtered])
         for article in filtered:
+            if article.url in cached:
+                article.content = cached[article.url]
+                continue
             try:
                 content = await self._fetch_content(article.url)
                 article.content = content
             except Exception as e:
                 print(f"Error fetching content for {article.url}: {e}")
                 article.content = None
+        if body_cache is not None:
+            await asyncio.to_thread(
+                body_cache.put_many, {a.url: a.content for a in filtered if a.url not in cached and a.content}
+            )
 
         return filtered
 
+    def _body_cache(self) -> Optional[BodyCache]:
+        """按 storage 配置获取正文缓存（未开启时返回 None）"""
+        try:
+            storage = ConfigReader(self.config_dir).load_crawler_config().storage
+        except Exception as e:
+            print(f"Warning: Failed to load crawler config: {e}")
+            return None
+        if not storage.body_cache:
+            return None
+        return get_body_cache(storage.body_cache_path, storage.body_cache_max_mb)
+
     async def _fetch_content(self, url: str) -> str:
         """获取文章正文内容"""
         try:
             response = await self.client.get(url, timeout=15)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # 参考消息的文章正文通常在 .article-content 或类似容器中
-            content_div = soup.find("div", class_="article-content") or soup.find("div", class_="content")
-            if content_div:
-                # 提取段落文本
-                paragraphs = content_div.find_all("p")
-                if paragraphs:
-                    return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-            # 如果找不到特定容器，尝试获取主要内容区域
-            body = soup.find("body")
-            if body:
-                paragraphs = body.find_all("p")
-                if paragraphs:
-                    return "\n\n".join(p.get_text(strip=True) for p in paragraphs[:20] if p.get_text(strip=True))
-
-            return "无法提取文章内容"
+            # 正文提取在解析进程池中执行，不阻塞事件循环
+            content = await parse_executor.run(
+                extract_paragraphs, response.content, response.encoding, CONTENT_CONTAINERS, 20
+            )
+            return content or "无法提取文章内容"
         except Exception as e:
             return f"获取内容失败: {e}"
 
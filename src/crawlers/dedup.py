@@ -7,20 +7,31 @@
 4. 批次内排重：本批次内的文章再互相做标题近似排重
 """
 
+from collections import Counter
 from datetime import date, datetime
-from typing import List, Dict
-from simhash import Simhash
-import jieba
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set
+import logging
 import threading
 
 from ..models import Article
 from ..storage import TimelineDB
 from ..tools import TitleCleaner
+from ..tools.segment import get_jieba
+
+if TYPE_CHECKING:
+    from simhash import Simhash
 from .url_cache import url_cache
 
+logger = logging.getLogger(__name__)
+
 
 class TodayNewsCache:
-    """今日新闻缓存 - 存储 {url: title}，每天0点清空"""
+    """今日新闻缓存 - 存储 {url: title}，每天0点清空
+
+    多 worker 部署时可通过 use_shared_store 切换到进程间共享存储。
+    """
+
+    KIND = "news"
 
     _instance = None
     _lock = threading.Lock()
@@ -41,46 +52,82 @@ class TodayNewsCache:
 
         self._cache_date: date = date.today()
         self._news: Dict[str, str] = {}  # {url: title}
+        self._store = None  # 进程间共享存储（SharedStateDB），None 表示仅内存
         self._initialized = True
 
+    def use_shared_store(self, store) -> None:
+        """切换到进程间共享存储（多 worker 部署时调用）
+
+        Args:
+            store: SharedStateDB 实例，None 表示切回内存
+        """
+        if store is not None and self._news:
+            store.dedup_add(self.KIND, self._news, self._cache_date.isoformat())
+        self._store = store
+
     def _check_and_reset(self):
         """检查日期，如果新的一天则清空缓存"""
         today = date.today()
         if self._cache_date != today:
             self._cache_date = today
             self._news.clear()
-            print(f"[TodayNewsCache] 缓存已清零，新日期: {today}")
+            if self._store is not None:
+                self._store.dedup_purge(self.KIND, keep_date=today.isoformat())
+            logger.info("[TodayNewsCache] 缓存已清零，新日期: %s", today)
 
     def add(self, url: str, title: str):
         """添加新闻到缓存"""
         self._check_and_reset()
+        if self._store is not None:
+            self._store.dedup_add(self.KIND, {url: title}, self._cache_date.isoformat())
+            return
         self._news[url] = title
 
     def add_batch(self, articles: List[Article]):
         """批量添加新闻到缓存"""
         self._check_and_reset()
+        if self._store is not None:
+            self._store.dedup_add(
+                self.KIND, {a.url: a.title for a in articles}, self._cache_date.isoformat()
+            )
+            return
         for article in articles:
             self._news[article.url] = article.title
 
     def exists_url(self, url: str) -> bool:
         """检查 URL 是否已存在"""
         self._check_and_reset()
+        if self._store is not None:
+            return self._store.dedup_exists(self.KIND, url, self._cache_date.isoformat())
         return url in self._news
 
+    def existing_urls(self, urls: Iterable[str]) -> Set[str]:
+        """批量检查 URL，返回其中已存在的 URL"""
+        self._check_and_reset()
+        if self._store is not None:
+            return self._store.dedup_exists_many(self.KIND, urls, self._cache_date.isoformat())
+        return {url for url in urls if url in self._news}
+
     def get_all_titles(self) -> List[str]:
         """获取所有缓存的标题"""
         self._check_and_reset()
+        if self._store is not None:
+            return self._store.dedup_values(self.KIND, self._cache_date.isoformat())
         return list(self._news.values())
 
     def clear(self):
         """手动清空缓存"""
         self._news.clear()
+        if self._store is not None:
+            self._store.dedup_purge(self.KIND)
         self._cache_date = date.today()
 
     @property
     def count(self) -> int:
         """获取当前缓存中的新闻数量"""
         self._check_and_reset()
+        if self._store is not None:
+            return self._store.dedup_count(self.KIND, self._cache_date.isoformat())
         return len(self._news)
 
     def init_from_db(self, db, limit: int = 100):
@@ -94,10 +141,13 @@ class TodayNewsCache:
         """
         articles = db.list_articles_latest(limit=limit)
 
-        for article in articles:
-            self._news[article['url']] = article['title']
+        entries = {article['url']: article['title'] for article in articles}
+        if self._store is not None:
+            self._store.dedup_add(self.KIND, entries, self._cache_date.isoformat())
+        else:
+            self._news.update(entries)
 
-        print(f"[TodayNewsCache] 从数据库加载了 {len(articles)} 条到缓存")
+        logger.info("[TodayNewsCache] 从数据库加载了 %d 条到缓存", len(articles))
 
     @property
     def cache_date(self) -> date:
@@ -124,6 +174,8 @@ class TextDeduplicator:
         self.target_date = target_date or date.today()
         self.db = TimelineDB(self.target_date)
         self.db.init_db()
+        # 最近一次去重各层丢弃的条数：{layer: Counter(source_id -> 条数)}
+        self.dropped: Dict[str, Counter] = {}
 
     def dedup(self, articles: List[Article]) -> List[Article]:
         """执行四层去重
@@ -134,33 +186,44 @@ class TextDeduplicator:
         Returns:
             去重后的文章列表
         """
-        print(f"[Dedup] 开始去重，原始文章数: {len(articles)}")
-        print(f"[Dedup] url_cache.count={url_cache.count}, today_news_cache.count={today_news_cache.count}")
+        logger.info("[Dedup] 开始去重，原始文章数: %d", len(articles))
+        if logger.isEnabledFor(logging.DEBUG):
+            # count 在共享存储模式下要查库，只在 DEBUG 时读取
+            logger.debug("[Dedup] url_cache.count=%d, today_news_cache.count=%d", url_cache.count, today_news_cache.count)
 
         # 第一层：时间排重 - 只保留今天的文章
         today_articles = self._filter_by_date(articles)
-        print(f"[Dedup] 时间排重后: {len(today_articles)}")
+        logger.debug("[Dedup] 时间排重后: %d", len(today_articles))
+        self._record_drops("date", articles, today_articles)
 
         # 第二层：URL 排重 - 与 today_news_cache 对比 URL
         url_unique = self._filter_by_url(today_articles)
-        print(f"[Dedup] URL排重后: {len(url_unique)}")
+        logger.debug("[Dedup] URL排重后: %d", len(url_unique))
+        self._record_drops("url", today_articles, url_unique)
 
         # 第三层：标题近似排重 - 与 today_news_cache 中的标题对比
         title_unique = self._filter_by_cache_title(url_unique)
-        print(f"[Dedup] 标题排重后: {len(title_unique)}")
+        logger.debug("[Dedup] 标题排重后: %d", len(title_unique))
+        self._record_drops("title", url_unique, title_unique)
 
         # 第四层：批次内排重 - 本批次内的文章互相做标题近似排重
         deduped = self._filter_by_batch_similarity(title_unique)
-        print(f"[Dedup] 批次内排重后: {len(deduped)}")
+        logger.debug("[Dedup] 批次内排重后: %d", len(deduped))
+        self._record_drops("batch", title_unique, deduped)
 
         # 将最终留存的新闻添加到缓存
         today_news_cache.add_batch(deduped)
 
         return deduped
 
+    def _record_drops(self, layer: str, before: List[Article], after: List[Article]) -> None:
+        """记录某一层按新闻源丢弃的条数"""
+        self.dropped[layer] = Counter(a.source for a in before) - Counter(a.source for a in after)
+
     def _filter_by_date(self, articles: List[Article]) -> List[Article]:
         """时间排重：只保留目标日期及之后的文章（财经新闻会提前发次日新闻）"""
         result = []
+        debug = logger.isEnabledFor(logging.DEBUG)
         for a in articles:
             # 获取文章日期（publish_time 已经是北京时间，直接取 date 即可）
             article_date = a.publish_time.date()
@@ -168,13 +231,15 @@ class TextDeduplicator:
             match = article_date >= self.target_date
             if match:
                 result.append(a)
-            else:
-                print(f"[Dedup] 时间过滤: {a.title[:30]}... | publish_time={a.publish_time}, target={self.target_date}")
+            elif debug:
+                logger.debug("[Dedup] 时间过滤: %.30s... | publish_time=%s, target=%s",
+                             a.title, a.publish_time, self.target_date)
         return result
 
     def _filter_by_url(self, articles: List[Article]) -> List[Article]:
         """URL 排重：与 today_news_cache 中的 URL 对比"""
-        return [a for a in articles if not today_news_cache.exists_url(a.url)]
+        existing = today_news_cache.existing_urls(a.url for a in articles)
+        return [a for a in articles if a.url not in existing]
 
     def _filter_by_cache_title(self, articles: List[Article]) -> List[Article]:
         """标题近似排重：与 today_news_cache 中已有的标题对比"""
@@ -221,7 +286,7 @@ class TextDeduplicator:
 
         return deduped
 
-    def _compute_simhash(self, text: str) -> Simhash:
+    def _compute_simhash(self, text: str) -> "Simhash":
         """计算文本的 SimHash 值
 
         使用 jieba 分词提取关键词作为特征
@@ -229,8 +294,9 @@ class TextDeduplicator:
         """
         # 使用 TitleCleaner 清理标题（默认20个字）
         text = TitleCleaner.for_dedup(text)
-        # 使用 jieba 分词
-        words = list(jieba.cut(text))
+        # 使用 jieba 分词（jieba / simhash 延迟导入，不拖慢应用启动）
+        from simhash import Simhash
+        words = list(get_jieba().cut(text))
         return Simhash(words)
 
     def get_stats(self, original_count: int, final_count: int) -> dict:
@@ -0,0 +1,202 @@
+"""新闻源 HTTP 录制 / 回放
+
+录制：抓取时经 create_client 创建的客户端（列表、正文、新闻源测试）的每个请求与响应都写入归档目录；
+回放：同样的客户端改由本地传输层按归档返回响应，不访问网络，可配置固定延迟与随机抖动。
+用于离线、可重复地跑完整的 run_crawl（性能对比、调试）。
+
+归档目录：
+- manifest.json：录制时间、请求数
+- responses.jsonl.gz：每行一个请求 {method, url, status, headers, body(base64)} 或 {method, url, error}
+
+同一 URL 被请求多次（如重试）时按录制顺序依次返回，超出后重复最后一次；归档中没有的请求返回 404。
+回放的延迟由 (seed, 请求, 第几次) 决定，不受并发顺序影响，多次回放的耗时可以直接比较。
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+MANIFEST = "manifest.json"
+RESPONSES = "responses.jsonl.gz"
+
+# 响应体以解码后的内容保存，这些头不再适用
+DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class HttpArchive:
+    """HTTP 请求 / 响应归档"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.entries: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.recorded_at: Optional[datetime] = None
+        # 回放状态（各客户端共用）：每个请求已返回的次数、归档中没有的 URL
+        self.served: Dict[Tuple[str, str], int] = {}
+        self.misses: List[str] = []
+
+    def add(self, method: str, url: str, entry: Dict[str, Any]) -> None:
+        self.entries.setdefault((method, url), []).append(entry)
+
+    def lookup(self, method: str, url: str, index: int) -> Optional[Dict[str, Any]]:
+        """第 index 次请求对应的录制（超出后重复最后一次）"""
+        recorded = self.entries.get((method, url))
+        if not recorded:
+            return None
+        return recorded[min(index, len(recorded) - 1)]
+
+    @property
+    def count(self) -> int:
+        return sum(len(recorded) for recorded in self.entries.values())
+
+    def save(self) -> None:
+        """写入归档目录"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.recorded_at = self.recorded_at or datetime.now()
+        with gzip.open(self.directory / RESPONSES, "wt", encoding="utf-8") as f:
+            for (method, url), recorded in self.entries.items():
+                for entry in recorded:
+                    f.write(json.dumps({"method": method, "url": url, **entry}, ensure_ascii=False) + "\n")
+        manifest = {"recorded_at": self.recorded_at.isoformat(), "requests": self.count}
+        (self.directory / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[Archive] 已录制 {self.count} 个请求: {self.directory}")
+
+    @classmethod
+    def load(cls, directory: str) -> "HttpArchive":
+        """读取归档目录
+
+        Raises:
+            FileNotFoundError: 目录中没有归档
+        """
+        archive = cls(directory)
+        manifest = json.loads((archive.directory / MANIFEST).read_text(encoding="utf-8"))
+        archive.recorded_at = datetime.fromisoformat(manifest["recorded_at"])
+        with gzip.open(archive.directory / RESPONSES, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                archive.add(entry.pop("method"), entry.pop("url"), entry)
+        return archive
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """透传请求并录制响应（响应体读入内存后重新包装返回）"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, archive: HttpArchive):
+        self.transport = transport
+        self.archive = archive
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        method, url = request.method, str(request.url)
+        try:
+            response = await self.transport.handle_async_request(request)
+            body = await response.aread()
+        except httpx.TransportError as e:
+            self.archive.add(method, url, {"error": type(e).__name__, "message": str(e)})
+            raise
+
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in DROP_HEADERS]
+        self.archive.add(method, url, {
+            "status": response.status_code,
+            "headers": headers,
+            "body": base64.b64encode(body).decode("ascii"),
+        })
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """按归档返回响应的本地传输层"""
+
+    def __init__(self, archive: HttpArchive, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        """初始化
+
+        Args:
+            archive: 归档
+            latency: 每个请求的固定延迟（秒）
+            jitter: 额外随机延迟上限（秒）
+            seed: 随机种子
+        """
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+
+    def delay(self, method: str, url: str, index: int) -> float:
+        """第 index 次请求的延迟（由种子与请求决定）"""
+        if not self.jitter:
+            return self.latency
+        return self.latency + random.Random(f"{self.seed}:{method}:{url}:{index}").uniform(0, self.jitter)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        method, url = request.method, str(request.url)
+        index = self.archive.served.get((method, url), 0)
+        self.archive.served[(method, url)] = index + 1
+
+        wait = self.delay(method, url, index)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        entry = self.archive.lookup(method, url, index)
+        if entry is None:
+            self.archive.misses.append(url)
+            return httpx.Response(404, content=b"not in archive", request=request)
+        if "error" in entry:
+            error_type = getattr(httpx, entry["error"], httpx.ConnectError)
+            raise error_type(entry.get("message", ""), request=request)
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=base64.b64decode(entry["body"]),
+            request=request,
+        )
+
+
+class ArchiveMode:
+    """进程内的录制 / 回放状态（create_client 据此包装传输层）"""
+
+    def __init__(self):
+        self.mode: Optional[str] = None  # None | "record" | "replay"
+        self.archive: Optional[HttpArchive] = None
+        self.replay_options: Dict[str, Any] = {}
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    def record(self, directory: str) -> HttpArchive:
+        """开始录制"""
+        self.mode, self.archive = "record", HttpArchive(directory)
+        return self.archive
+
+    def replay(self, directory: str, latency: float = 0.0, jitter: float = 0.0, seed: int = 0) -> HttpArchive:
+        """开始回放"""
+        self.mode, self.archive = "replay", HttpArchive.load(directory)
+        self.replay_options = {"latency": latency, "jitter": jitter, "seed": seed}
+        print(f"[Archive] 回放 {self.archive.count} 个请求（录制于 {self.archive.recorded_at}）")
+        return self.archive
+
+    def wrap(self, transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        """按当前模式包装实际传输层"""
+        if self.mode == "record":
+            return RecordingTransport(transport, self.archive)
+        if self.mode == "replay":
+            return ReplayTransport(self.archive, **self.replay_options)
+        return transport
+
+    def stop(self) -> None:
+        """结束录制 / 回放（录制时写入归档）"""
+        if self.mode == "record":
+            self.archive.save()
+        self.mode, self.archive, self.replay_options = None, None, {}
+
+
+# 全局单例
+archive_mode = ArchiveMode()
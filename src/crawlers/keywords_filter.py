@@ -1,9 +1,14 @@
 """关键词筛选模块"""
+import logging
+import time
 from typing import List, Dict, Optional
 from functools import lru_cache
 
 from ..models import Article
 from ..config.reader import ConfigReader
+from ..tools.metrics import keywords_load_seconds
+
+logger = logging.getLogger(__name__)
 
 
 # 全局缓存关键词（小写版本，用于快速匹配）
@@ -31,6 +36,7 @@ def _init_keywords():
     if _KEYWORDS_CACHE["initialized"]:
         return
 
+    started = time.perf_counter()
     try:
         reader = ConfigReader()
         config = reader.load_news_keywords_config()
@@ -87,18 +93,17 @@ def _init_keywords():
         _ORIGINAL_KEYWORDS["front"] = front_all_original
 
         _KEYWORDS_CACHE["initialized"] = True
+        keywords_load_seconds.set(time.perf_counter() - started)
 
-        # 打印调试信息
+        # 调试信息
         total_legend_kw = sum(len(kws) for kws in _KEYWORDS_CACHE["legend"].values())
-        print(f"[Debug] Legend 关键词数: {total_legend_kw}")
-        print(f"[Debug] 新星关键词数: {len(_KEYWORDS_CACHE['新星'])}")
-        print(f"[Debug] 涟漪关键词数: {len(_KEYWORDS_CACHE['涟漪'])}")
-        print(f"[Debug] 中国关键词数: {len(_KEYWORDS_CACHE['中国'])}")
-        print(f"[Debug] Front 关键词数: {len(_KEYWORDS_CACHE['front'])}")
+        logger.debug("[Keywords] Legend 关键词数: %d", total_legend_kw)
+        logger.debug("[Keywords] 新星关键词数: %d", len(_KEYWORDS_CACHE['新星']))
+        logger.debug("[Keywords] 涟漪关键词数: %d", len(_KEYWORDS_CACHE['涟漪']))
+        logger.debug("[Keywords] 中国关键词数: %d", len(_KEYWORDS_CACHE['中国']))
+        logger.debug("[Keywords] Front 关键词数: %d", len(_KEYWORDS_CACHE['front']))
     except Exception as e:
-        print(f"Warning: Failed to load keywords config: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Keywords] Failed to load keywords config: %s", e)
 
 
 def _match_legend(text: str) -> Optional[str]:
@@ -174,15 +179,13 @@ def filter_by_keywords(articles: List[Article]) -> List[Article]:
             filtered.append(article)
         else:
             unmatched_count += 1
-            if unmatched_count <= 5:  # 打印前5个没匹配的
-                print(f"[Filter] 未匹配: {article.title[:50]}...")
-
-    # 打印统计信息
-    total_legend = sum(legend_counts.values())
-    print(f"[Filter] Legend 匹配: {total_legend} (详情: {legend_counts})")
-    print(f"[Filter] Front 匹配: {front_count}")
-    print(f"[Filter] 未匹配: {unmatched_count}")
-    print(f"[Filter] 总计: {len(filtered)}/{len(articles)}")
+            if unmatched_count <= 5:  # 输出前5个没匹配的（DEBUG）
+                logger.debug("[Filter] 未匹配: %.50s...", article.title)
+
+    # 统计信息
+    logger.info("[Filter] Legend 匹配: %d, Front 匹配: %d, 未匹配: %d, 总计: %d/%d",
+                sum(legend_counts.values()), front_count, unmatched_count, len(filtered), len(articles))
+    logger.debug("[Filter] Legend 匹配详情: %s", legend_counts)
 
     return filtered
 
@@ -1,13 +1,15 @@
 """解析器模块
 
-每个解析器文件对应一个新闻源，文件名 = news_sources.yaml 中的 source.id
+大多数新闻源在 news_sources.yaml 中以 spec 声明解析规则（见 crawlers/spec_engine.py），
+无需编写解析器。无法声明式描述的特殊情况才在这里编写解析器，文件名 = source.id
 
 解析器标准接口：
-    async def parse(response: httpx.Response, source_config: dict) -> List[Article]
+    async def parse(response: httpx.Response, source_config: dict, client, limit) -> List[Article]
+    async def fetch_content(url: str, client) -> str
 
 示例：
-    # parsers/cankaoxiaoxi.py
-    async def parse(response, source_config):
+    # parsers/toutiao.py
+    async def parse(response, source_config, client=None, limit=20):
         # 解析逻辑
         return [Article(...)]
 """
@@ -5,9 +5,10 @@
 
 from typing import List, Dict, Any, Optional
 from httpx import Response
-from bs4 import BeautifulSoup
 import json
 
+from ...tools.html_extract import extract_items
+
 
 def get_features(text: str, top_k: int = 20) -> List[tuple]:
     """提取文本特征用于 SimHash
@@ -19,7 +20,9 @@ def get_features(text: str, top_k: int = 20) -> List[tuple]:
     Returns:
         [(keyword, weight), ...] 特征列表
     """
+    from ...tools.segment import get_jieba
     import jieba.analyse
+    get_jieba()
     return jieba.analyse.extract_tags(text, topK=top_k, withWeight=True)
 
 
@@ -43,26 +46,7 @@ def parse_html(response: Response, selector: str, **fields) -> List[Dict[str, An
             time=".time"
         )
     """
-    soup = BeautifulSoup(response.text, "html.parser")
-    items = soup.select(selector)
-    results = []
-
-    for item in items:
-        row = {}
-        for field_name, field_selector in fields.items():
-            # 处理属性选择器，如 "a@href"
-            if "@" in field_selector:
-                elem_selector, attr = field_selector.split("@", 1)
-                elem = item.select_one(elem_selector)
-                value = elem.get(attr) if elem else None
-            else:
-                elem = item.select_one(field_selector)
-                value = elem.get_text(strip=True) if elem else None
-
-            row[field_name] = value
-        results.append(row)
-
-    return results
+    return extract_items(response.content, response.encoding, selector, fields)
 
 
 def parse_json(response: Response, data_path: str = None) -> Dict[str, Any]:
@@ -8,6 +8,16 @@ from httpx import Response, AsyncClient
 from datetime import datetime
 
 from ...models import Article, SourceType
+from ...tools.html_extract import extract_paragraphs
+from ...tools.parse_executor import parse_executor
+
+
+# 今日头条正文容器（按顺序匹配第一个存在的）
+CONTENT_CONTAINERS = [
+    ("div", "article-content"),
+    ("div", "syl-article-base"),
+    ("article", None),
+]
 
 
 async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
@@ -79,19 +89,10 @@ async def fetch_content(url: str, client: AsyncClient) -> str:
         response = await client.get(url, timeout=15)
         response.raise_for_status()
 
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # 今日头条正文选择器
-        content_div = soup.find("div", class_="article-content") or \
-                      soup.find("div", class_="syl-article-base") or \
-                      soup.find("article")
-
-        if content_div:
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        # 正文提取在解析进程池中执行，不阻塞事件循环
+        content = await parse_executor.run(
+            extract_paragraphs, response.content, response.encoding, CONTENT_CONTAINERS
+        )
+        return content or "无法提取文章内容"
     except Exception as e:
         return f"获取内容失败: {e}"
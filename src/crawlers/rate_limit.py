@@ -0,0 +1,93 @@
+"""按主机限速（令牌桶）
+
+同一进程内所有抓取请求（列表、正文、新闻源测试）共用一个 HostRateLimiter：每个主机一个令牌桶，
+以 rate 个/秒补充，最多积攒 burst 个。请求发出前取一个令牌，取不到就排队等待，
+因此并发再高，单个主机的请求速率也不会超过配置；不同主机互不影响。
+
+限速在 RetryTransport 中执行，重试的请求同样要取令牌。
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+from ..config.models import RateLimitConfig
+
+
+class TokenBucket:
+    """令牌桶（预约式：令牌可以透支，透支部分换算为等待时间，先到先得）"""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        """初始化
+
+        Args:
+            rate: 每秒补充的令牌数
+            burst: 桶容量（允许的突发请求数）
+            clock: 时钟（测试用）
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        """取一个令牌，返回需要等待的秒数（0 表示立即可用）"""
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    async def acquire(self) -> float:
+        """取一个令牌（必要时等待），返回等待的秒数"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """各主机的令牌桶"""
+
+    def __init__(self, config: Optional[RateLimitConfig] = None):
+        self.config = config or RateLimitConfig()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def configure(self, config: RateLimitConfig) -> None:
+        """更新配置（配置变化时重建令牌桶）"""
+        if config != self.config:
+            self.config = config
+            self._buckets.clear()
+
+    def _limits(self, host: str):
+        """主机的 (rate, burst)：按主机覆盖，支持上级域名（cls.cn 匹配 www.cls.cn）"""
+        for name, override in self.config.hosts.items():
+            if host == name or host.endswith("." + name):
+                return override.rate, override.burst
+        return self.config.rate, self.config.burst
+
+    def bucket(self, host: str) -> TokenBucket:
+        """获取主机的令牌桶（不存在时创建）"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(*self._limits(host))
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, host: str) -> float:
+        """请求主机前取令牌，返回等待的秒数（未启用时不等待）"""
+        if not self.config.enabled or not host:
+            return 0.0
+        return await self.bucket(host).acquire()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """各主机令牌桶状态"""
+        return {
+            host: {"rate": bucket.rate, "burst": bucket.burst, "tokens": round(bucket.tokens, 2)}
+            for host, bucket in self._buckets.items()
+        }
+
+
+# 全局单例
+host_limiter = HostRateLimiter()
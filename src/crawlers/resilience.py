@@ -0,0 +1,310 @@
+"""新闻源请求的重试与熔断
+
+- 重试（RetryTransport）：连接失败、超时、429 / 5xx 等临时错误按指数退避重试 network.retry 次，
+  第 n 次等待约 retry_delay * 2^n 秒（带随机抖动，不超过 retry_max_delay；
+  429 / 503 带 Retry-After 时按其等待）。只重试 GET / HEAD
+- 熔断（CircuitBreaker）：每个新闻源连续失败 network.breaker_threshold 次后熔断，
+  冷却 network.breaker_cooldown 秒内直接跳过，不再每次等满超时；冷却结束后放行一次试探，
+  成功则恢复，失败则重新熔断
+
+熔断状态在进程内存中（每个 worker 各自一份），随抓取结果与 /admin/source_test 返回。
+每次请求（含重试）发出前还要取所在主机的令牌（见 rate_limit）；请求数与响应字节数记入当前抓取的计数
+（http_requests / http_bytes，见 stage_timer），有当前计时器时还记录建连、TLS 握手与首字节耗时（ConnectionTrace）。
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from ..config.models import NetworkConfig
+from ..tools.stage_timer import count, current_timer, observe
+from .http_archive import archive_mode
+from .rate_limit import HostRateLimiter, host_limiter
+
+logger = logging.getLogger(__name__)
+
+RETRY_METHODS = {"GET", "HEAD"}
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RETRY_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+# 额外的传输层包装（在录制 / 回放之后、重试之前依次应用），基准测试用于把请求转到本地模拟服务
+transport_hooks: List[Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]] = []
+
+
+class CountingStream(httpx.AsyncByteStream):
+    """读取响应体时累加字节数（http_bytes）"""
+
+    def __init__(self, stream: httpx.AsyncByteStream):
+        self.stream = stream
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            count("http_bytes", len(chunk))
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+
+
+class ConnectionTrace:
+    """httpcore 的 trace 回调：记录 connect（DNS + TCP）、tls、ttfb（发出请求头到收到响应头）
+
+    复用连接池中的连接时没有 connect / tls 样本。
+    """
+
+    STAGES = {
+        "connection.connect_tcp": "connect",
+        "connection.start_tls": "tls",
+    }
+
+    def __init__(self):
+        self._started: Dict[str, float] = {}
+
+    async def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        name, _, phase = event.rpartition(".")
+        now = time.perf_counter()
+        if phase == "started":
+            self._started[name] = now
+            return
+        if phase != "complete":
+            return
+        if name in self.STAGES:
+            observe(self.STAGES[name], now - self._started.pop(name, now))
+        elif name.endswith(".receive_response_headers"):
+            # http11 / http2：从发出请求头开始计
+            sent = self._started.pop(name.replace("receive_response_headers", "send_request_headers"), None)
+            if sent is not None:
+                observe("ttfb", now - sent)
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """按主机限速、对临时错误做指数退避重试的传输层（包装实际传输层）"""
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        retries: int = 3,
+        delay: float = 5,
+        max_delay: float = 60,
+        limiter: Optional[HostRateLimiter] = None,
+        seed: Optional[int] = None
+    ):
+        """初始化
+
+        Args:
+            transport: 实际传输层，默认 httpx.AsyncHTTPTransport()
+            retries: 最大重试次数（不含首次请求）
+            delay: 首次重试的基准等待（秒）
+            max_delay: 单次等待上限（秒）
+            limiter: 按主机限速器（可选），每次请求前取令牌
+            seed: 抖动的随机种子（回放时传入，等待只由种子、URL 与重试次数决定）
+        """
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.retries = max(retries, 0)
+        self.delay = delay
+        self.max_delay = max_delay
+        self.limiter = limiter
+        self.seed = seed
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        if self.limiter is not None:
+            await self.limiter.acquire(request.url.host)
+        count("http_requests")
+        if current_timer.get() is not None and "trace" not in request.extensions:
+            request.extensions["trace"] = ConnectionTrace()
+        response = await self.transport.handle_async_request(request)
+        if response.is_stream_consumed:
+            # 传输层已读完响应体（如 MockTransport、回放归档）
+            count("http_bytes", len(response.content))
+        else:
+            response.stream = CountingStream(response.stream)
+        return response
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] = None, url: str = "") -> float:
+        """第 attempt 次重试前的等待（秒）：基准的一半 + 随机抖动"""
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        base = min(self.max_delay, self.delay * (2 ** attempt))
+        rng = random.Random(f"{self.seed}:{url}:{attempt}") if self.seed is not None else random
+        return base / 2 + rng.uniform(0, base / 2)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in RETRY_METHODS:
+            return await self._send(request)
+
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self._send(request)
+            except RETRY_ERRORS as e:
+                if attempt >= self.retries:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code not in RETRY_STATUS or attempt >= self.retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                await response.aclose()
+
+            wait = self.backoff(attempt, response, str(request.url))
+            attempt += 1
+            logger.warning("[Retry] %s %s，%.1fs 后第 %d 次重试", request.url, reason, wait, attempt)
+            await asyncio.sleep(wait)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def create_client(
+    network: Optional[NetworkConfig] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    limits: Optional[httpx.Limits] = None,
+    limiter: Optional[HostRateLimiter] = host_limiter
+) -> httpx.AsyncClient:
+    """创建抓取新闻源用的 HTTP 客户端（超时、User-Agent、重试取自网络配置，按主机限速）
+
+    Args:
+        network: 网络配置，默认使用 NetworkConfig 默认值
+        transport: 实际传输层（测试时传入 MockTransport）
+        limits: 连接池限制
+        limiter: 按主机限速器，默认进程内共用的 host_limiter；None 表示不限速
+    """
+    network = network or NetworkConfig()
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(limits=limits) if limits else httpx.AsyncHTTPTransport()
+    # 录制 / 回放模式下包装实际传输层（见 http_archive）
+    transport = archive_mode.wrap(transport)
+    for hook in transport_hooks:
+        transport = hook(transport)
+    # 回放时重试等待的抖动取自回放种子，同一归档多次回放的耗时一致
+    seed = archive_mode.replay_options.get("seed", 0) if archive_mode.mode == "replay" else None
+    return httpx.AsyncClient(
+        timeout=network.timeout,
+        headers={"User-Agent": network.user_agent},
+        transport=RetryTransport(
+            transport, network.retry, network.retry_delay, network.retry_max_delay, limiter, seed
+        ),
+    )
+
+
+class CircuitOpenError(Exception):
+    """新闻源处于熔断冷却期，本次跳过"""
+
+    def __init__(self, source_id: str, retry_after: float):
+        self.source_id = source_id
+        self.retry_after = retry_after
+        super().__init__(f"{source_id} 连续失败已熔断，{int(retry_after)} 秒后重试")
+
+
+class CircuitBreaker:
+    """单个新闻源的熔断器（closed → open → half_open → closed / open）"""
+
+    def __init__(self, source_id: str, threshold: int = 3, cooldown: float = 600):
+        """初始化
+
+        Args:
+            source_id: 新闻源 ID
+            threshold: 连续失败多少次后熔断
+            cooldown: 熔断冷却时间（秒）
+        """
+        self.source_id = source_id
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0  # 连续失败次数
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.skipped = 0  # 熔断期间跳过的次数
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        """距冷却结束的秒数（未熔断时为 0）"""
+        if self.state != "open":
+            return 0.0
+        now = time.time() if now is None else now
+        return max(0.0, self.opened_at + self.cooldown - now)
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """是否放行本次请求；冷却结束后转为 half_open 放行一次试探"""
+        if self.state != "open":
+            return True
+        if self.retry_after(now) > 0:
+            self.skipped += 1
+            return False
+        self.state = "half_open"
+        logger.info("[Circuit] %s 冷却结束，试探请求", self.source_id)
+        return True
+
+    def success(self) -> None:
+        """记录成功：恢复为 closed"""
+        if self.state != "closed":
+            logger.info("[Circuit] %s 已恢复", self.source_id)
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+
+    def failure(self, error: Any = None, now: Optional[float] = None) -> None:
+        """记录失败：试探失败或连续失败达到阈值时熔断"""
+        self.failures += 1
+        self.last_error = str(error) if error is not None else None
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                logger.warning("[Circuit] %s 连续失败 %d 次，熔断 %s 秒", self.source_id, self.failures, self.cooldown)
+            self.state = "open"
+            self.opened_at = time.time() if now is None else now
+
+    def to_dict(self) -> Dict[str, Any]:
+        """状态（用于抓取结果、新闻源测试）"""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_after": round(self.retry_after()),
+            "last_error": self.last_error,
+            "skipped": self.skipped,
+        }
+
+
+class CircuitBreakers:
+    """各新闻源熔断器"""
+
+    def __init__(self, threshold: int = 3, cooldown: float = 600):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def configure(self, threshold: int, cooldown: float) -> None:
+        """更新阈值与冷却时间（已有熔断器一并更新）"""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        for breaker in self._breakers.values():
+            breaker.threshold = threshold
+            breaker.cooldown = cooldown
+
+    def get(self, source_id: str) -> CircuitBreaker:
+        """获取新闻源的熔断器（不存在时创建）"""
+        breaker = self._breakers.get(source_id)
+        if breaker is None:
+            breaker = CircuitBreaker(source_id, self.threshold, self.cooldown)
+            self._breakers[source_id] = breaker
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """全部熔断器状态"""
+        return {source_id: breaker.to_dict() for source_id, breaker in self._breakers.items()}
+
+    def reset(self, source_id: Optional[str] = None) -> None:
+        """重置熔断器，None 表示全部"""
+        if source_id is None:
+            self._breakers.clear()
+        else:
+            self._breakers.pop(source_id, None)
+
+
+# 全局单例
+circuit_breakers = CircuitBreakers()
@@ -4,14 +4,24 @@
 - 不进行关键词过滤
 - 不获取文章正文
 - 只测试 API 连接和数据返回量
+- 不受熔断限制（相当于一次试探），结果同样计入熔断器
+- 与抓取共用按主机限速
+
+各新闻源通过同一个客户端并发测试（并发数同 strategy.concurrent），每个源给出耗时分解 timings：
+总耗时、建连（DNS + TCP + TLS，复用连接时为 0）、首字节、解析（仅 spec 新闻源）、下载字节数与请求数。
 """
 
-import importlib
+import asyncio
+import time
 import httpx
 from typing import List, Dict, Any
 from datetime import datetime
 
 from ..config import ConfigReader
+from ..tools.stage_timer import StageTimer, current_source, current_timer
+from .rate_limit import host_limiter
+from .resilience import circuit_breakers, create_client
+from .spec_engine import parser_registry
 
 
 class SourceTester:
@@ -24,33 +34,39 @@ class SourceTester:
             config_dir: 配置文件目录
         """
         self.config_dir = config_dir
-        self.client = httpx.AsyncClient(
-            timeout=30,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-        )
+        self.concurrent = 5
+        try:
+            crawler_config = ConfigReader(config_dir).load_crawler_config()
+            network = crawler_config.network
+            host_limiter.configure(crawler_config.rate_limit)
+            self.concurrent = crawler_config.strategy.concurrent
+        except Exception as e:
+            print(f"Warning: Failed to load network config: {e}")
+            network = None
+        if network is not None:
+            circuit_breakers.configure(network.breaker_threshold, network.breaker_cooldown)
+        self.client = create_client(network)
 
     async def test_all(self) -> Dict[str, Any]:
-        """测试所有启用的新闻源
+        """并发测试所有启用的新闻源
 
         Returns:
             测试结果字典
         """
         reader = ConfigReader(self.config_dir)
         sources_config = reader.load_news_sources_config()
+        semaphore = asyncio.Semaphore(max(self.concurrent, 1))
 
-        results = []
+        async def test_with_semaphore(source):
+            async with semaphore:
+                return await self.test_single(source)
 
-        for source in sources_config.sources:
-            if not source.enabled:
-                continue
-
-            result = await self.test_single(source)
-            results.append(result)
+        results = await asyncio.gather(
+            *[test_with_semaphore(source) for source in sources_config.sources if source.enabled]
+        )
 
         return {
-            "sources": results,
+            "sources": list(results),
             "total": len(results),
             "timestamp": datetime.now().isoformat()
         }
@@ -71,13 +87,16 @@ class SourceTester:
             "status": "error",
             "message": ""
         }
+        breaker = circuit_breakers.get(source.id)
+        # 本源的请求、解析耗时记到单独的计时器（在 gather 创建的任务中设置，不影响其他源）
+        timer = StageTimer()
+        timer_token = current_timer.set(timer)
+        source_token = current_source.set(source.id)
+        started = time.perf_counter()
 
         try:
-            # 动态加载解析器 - source.id 就是 parser 文件名
-            module_name = f"src.crawlers.parsers.{source.id}"
-
-            module = importlib.import_module(module_name)
-            parse_func = getattr(module, "parse")
+            # 获取解析器（spec 或 parsers/{id}.py，与 UniversalCrawler 共用注册表）
+            parse_func = parser_registry.get(source).parse
 
             # 构建 source_config（与 UniversalCrawler 一致）
             source_config = self._source_to_dict(source)
@@ -91,6 +110,7 @@ class SourceTester:
             )
 
             result["count"] = len(articles)
+            breaker.success()
 
             if len(articles) > 0:
                 result["status"] = "ok"
@@ -102,18 +122,46 @@ class SourceTester:
         except ImportError as e:
             result["status"] = "error"
             result["message"] = f"解析器不存在: {e}"
+        except ValueError as e:
+            result["status"] = "error"
+            result["message"] = f"spec 配置错误: {e}"
         except httpx.HTTPStatusError as e:
             result["status"] = "error"
             result["message"] = f"HTTP错误: {e.response.status_code}"
+            breaker.failure(e)
         except httpx.RequestError as e:
             result["status"] = "error"
             result["message"] = f"连接失败: {e}"
+            breaker.failure(e)
         except Exception as e:
             result["status"] = "error"
             result["message"] = f"错误: {e}"
-
+            breaker.failure(e)
+        finally:
+            total = time.perf_counter() - started
+            current_timer.reset(timer_token)
+            current_source.reset(source_token)
+
+        result["timings"] = self._timings(timer, source.id, total)
+        result["circuit"] = breaker.to_dict()
         return result
 
+    @staticmethod
+    def _timings(timer: StageTimer, source_id: str, total: float) -> Dict[str, Any]:
+        """单个新闻源的耗时分解（毫秒）"""
+        def total_ms(*stages: str):
+            samples = [s for stage in stages for s in timer.source_samples.get((source_id, stage), [])]
+            return round(sum(samples) * 1000, 2) if samples else None
+
+        return {
+            "total_ms": round(total * 1000, 2),
+            "connect_ms": total_ms("connect", "tls") or 0.0,
+            "ttfb_ms": total_ms("ttfb"),
+            "parse_ms": total_ms("parse"),
+            "bytes": timer.counters.get((source_id, "http_bytes"), 0),
+            "requests": timer.counters.get((source_id, "http_requests"), 0),
+        }
+
     def _source_to_dict(self, source: Any) -> Dict[str, Any]:
         """将配置对象转换为字典（与 UniversalCrawler 一致）"""
         if hasattr(source, "dict"):
@@ -0,0 +1,445 @@
+"""声明式新闻源引擎
+
+大多数新闻源的解析器只有几处不同：列表在 JSON 中的路径（或列表项 CSS 选择器）、
+字段名、时间格式、正文容器。这些差异可以直接写在 news_sources.yaml 的 spec 中：
+
+    - id: "cls-telegraph"
+      url: "https://www.cls.cn/nodeapi/updateTelegraphList"
+      spec:
+        list: {format: json, path: data.roll_data}
+        fields:
+          title: title|brief
+          url: shareurl|https://www.cls.cn/detail/{id}
+          publish_time: ctime
+        time_format: timestamp
+        exclude: {is_ad: true}
+        body:
+          containers: [[div, content], [div, article-content]]
+
+spec 在启动时编译为 ExtractionPlan（路径、模板、时间解析、排除规则都预先处理好），
+由 SpecParser 执行；没有 spec 的新闻源仍使用 parsers/{id}.py 解析器（处理特殊情况）。
+
+字段表达式：
+- 点号分隔的路径：resource.title（列表下标写作数字，如 items.0.title）
+- | 分隔多个候选，取第一个非空值：title|brief
+- 含 {路径} 的候选为模板，占位值全部非空时才生效：https://www.cls.cn/detail/{id}
+
+解析器统一由 parser_registry 按新闻源缓存，抓取时不再逐次 import 模块。
+"""
+
+import importlib
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from httpx import AsyncClient, Response
+
+from ..config.models import SourceSpec
+from ..models import Article
+from ..tools.html_extract import extract_items, extract_json_var, extract_paragraphs
+from ..tools.parse_executor import parse_executor
+from ..tools.stage_timer import timed
+
+if TYPE_CHECKING:
+    from ..scheduler.source_state import SourceStateSession
+
+logger = logging.getLogger(__name__)
+
+# 必须提供的 Article 字段
+REQUIRED_FIELDS = ("title", "url", "publish_time")
+
+# 预置时间格式（其余按 strptime 格式处理）
+TIME_FORMATS = ("timestamp", "timestamp_ms", "relative")
+
+_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
+Path = Tuple[str, ...]
+
+
+def _compile_path(expr: str) -> Path:
+    """路径表达式预先拆分为键序列"""
+    return tuple(key for key in expr.strip().split(".") if key)
+
+
+def _get_path(data: Any, path: Path) -> Any:
+    """按键序列取值，任一层缺失返回 None"""
+    for key in path:
+        if isinstance(data, dict):
+            data = data.get(key)
+        elif isinstance(data, list) and key.isdigit():
+            index = int(key)
+            data = data[index] if index < len(data) else None
+        else:
+            return None
+        if data is None:
+            return None
+    return data
+
+
+class FieldExpr:
+    """编译后的字段表达式（候选路径 / URL 模板）"""
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        # 每个候选：(None, 路径) 或 (模板字面量片段, 占位路径列表)
+        self._alternatives: List[Tuple[Optional[List[str]], Any]] = []
+        for alternative in expr.split("|"):
+            alternative = alternative.strip()
+            if not alternative:
+                continue
+            if "{" in alternative:
+                parts = _PLACEHOLDER.split(alternative)
+                self._alternatives.append((parts[0::2], [_compile_path(p) for p in parts[1::2]]))
+            else:
+                self._alternatives.append((None, _compile_path(alternative)))
+        if not self._alternatives:
+            raise ValueError(f"字段表达式为空: {expr!r}")
+
+    def __call__(self, record: Any) -> Any:
+        for literals, paths in self._alternatives:
+            if literals is None:
+                value = _get_path(record, paths)
+            else:
+                values = [_get_path(record, path) for path in paths]
+                if not all(values):
+                    continue
+                value = literals[0] + "".join(
+                    f"{v}{literal}" for v, literal in zip(values, literals[1:])
+                )
+            if value:
+                return value
+        return None
+
+
+def parse_relative_time(time_str: str) -> Optional[datetime]:
+    """解析相对时间字符串（如 "3小时前"、"30分钟前"），解析失败返回 None"""
+    if not time_str:
+        return None
+
+    now = datetime.now()
+    time_str = str(time_str).strip().lower()
+
+    try:
+        if "分钟前" in time_str:
+            return now - timedelta(minutes=int(time_str.replace("分钟前", "").strip()))
+        elif "小时前" in time_str:
+            return now - timedelta(hours=int(time_str.replace("小时前", "").strip()))
+        elif "天前" in time_str:
+            return now - timedelta(days=int(time_str.replace("天前", "").strip()))
+    except (ValueError, AttributeError):
+        pass
+
+    return None
+
+
+def _compile_time_parser(time_format: str) -> Callable[[Any], Optional[datetime]]:
+    """时间格式编译为解析函数"""
+    if time_format == "timestamp":
+        return lambda value: datetime.fromtimestamp(int(value))
+    if time_format == "timestamp_ms":
+        return lambda value: datetime.fromtimestamp(int(value) / 1000)
+    if time_format == "relative":
+        return parse_relative_time
+    if "%" not in time_format:
+        raise ValueError(
+            f"未知的时间格式: {time_format!r}，可选: {', '.join(TIME_FORMATS)} 或 strptime 格式"
+        )
+    return lambda value: datetime.strptime(str(value), time_format)
+
+
+def _compile_exclude(path: str, rule: Any) -> Callable[[Any], bool]:
+    """排除规则：true 表示值为真即排除，列表表示值在其中即排除，其他表示值相等即排除"""
+    keys = _compile_path(path)
+    if rule is True:
+        return lambda record: bool(_get_path(record, keys))
+    if isinstance(rule, list):
+        values = frozenset(rule)
+        return lambda record: _get_path(record, keys) in values
+    return lambda record: _get_path(record, keys) == rule
+
+
+class ExtractionPlan:
+    """由 SourceSpec 编译得到的提取计划"""
+
+    def __init__(self, source_id: str, spec: SourceSpec):
+        """编译 spec
+
+        Raises:
+            ValueError: spec 不完整或格式错误
+        """
+        self.source_id = source_id
+        self.spec = spec
+
+        list_spec = spec.list
+        if list_spec.format == "html" and not list_spec.selector:
+            raise ValueError(f"[{source_id}] spec.list.format=html 需要 selector")
+        if list_spec.format == "json_var":
+            if not list_spec.pattern:
+                raise ValueError(f"[{source_id}] spec.list.format=json_var 需要 pattern")
+            re.compile(list_spec.pattern)
+        self.format = list_spec.format
+        self.list_path = _compile_path(list_spec.path)
+
+        missing = [name for name in REQUIRED_FIELDS if name not in spec.fields]
+        if missing:
+            raise ValueError(f"[{source_id}] spec.fields 缺少: {', '.join(missing)}")
+        self.title = FieldExpr(spec.fields["title"])
+        self.url = FieldExpr(spec.fields["url"])
+        self.publish_time = FieldExpr(spec.fields["publish_time"])
+
+        formats = [spec.time_format] if isinstance(spec.time_format, str) else spec.time_format
+        try:
+            self.time_parsers = [_compile_time_parser(fmt) for fmt in formats]
+        except ValueError as e:
+            raise ValueError(f"[{source_id}] {e}") from e
+
+        self.excludes = [_compile_exclude(path, rule) for path, rule in spec.exclude.items()]
+
+        self.containers: List[Tuple[str, Optional[str]]] = []
+        for container in spec.body.containers:
+            if not container or len(container) > 2 or not container[0]:
+                raise ValueError(f"[{source_id}] spec.body.containers 应为 [标签, class]: {container}")
+            self.containers.append((container[0], container[1] if len(container) > 1 else None))
+        self.body_fallback = spec.body.body_fallback
+
+        self.incremental = spec.watermark is not None
+        self.overlap = spec.watermark.overlap if spec.watermark else 0
+        self.ordered = spec.watermark.ordered if spec.watermark else False
+
+    def parse_time(self, value: Any) -> Optional[datetime]:
+        """按配置的时间格式依次尝试解析"""
+        for parser in self.time_parsers:
+            try:
+                publish_time = parser(value)
+            except (ValueError, TypeError, OverflowError, OSError):
+                continue
+            if publish_time:
+                return publish_time
+        return None
+
+    def records_from(self, document: Any) -> List[Any]:
+        """从 JSON 文档中取出列表"""
+        records = _get_path(document, self.list_path) if self.list_path else document
+        return records if isinstance(records, list) else []
+
+    def extract(self, records: Iterable[Any], since: Optional[datetime] = None) -> List[Article]:
+        """列表条目转换为文章（缺少标题 / 链接 / 发布时间的条目跳过）
+
+        Args:
+            records: 列表条目
+            since: 增量解析起点，早于此时间的条目视为已处理（ordered 时遇到即停止）
+        """
+        articles = []
+        for record in records:
+            if any(excluded(record) for excluded in self.excludes):
+                continue
+
+            # 必须有有效的发布时间才添加（不允许使用当前时间替代）
+            raw_time = self.publish_time(record)
+            publish_time = self.parse_time(raw_time) if raw_time else None
+            if not publish_time:
+                continue
+            if since is not None and publish_time < since:
+                if self.ordered:
+                    break
+                continue
+
+            title = self.title(record)
+            url = self.url(record)
+            if not title or not url:
+                continue
+
+            articles.append(Article(
+                title=str(title),
+                url=str(url),
+                source=self.source_id,
+                publish_time=publish_time,
+            ))
+        return articles
+
+
+class SpecParser:
+    """声明式新闻源解析器（接口与 parsers/{id}.py 模块一致）"""
+
+    def __init__(self, source_id: str, spec: SourceSpec):
+        self.source_id = source_id
+        self.spec = spec
+        self.plan = ExtractionPlan(source_id, spec)
+
+    def _list_urls(self, source_config: Dict[str, Any]) -> List[str]:
+        """列表 URL，含 {channel} 时按频道展开"""
+        url = source_config["url"]
+        if "{channel}" not in url:
+            return [url]
+        return [url.replace("{channel}", channel) for channel in source_config.get("channels") or []]
+
+    async def _fetch_list(
+        self,
+        url: str,
+        client: AsyncClient,
+        state: Optional["SourceStateSession"] = None
+    ) -> Optional[Response]:
+        """抓取列表页
+
+        Returns:
+            响应；列表与上次相同（304 或响应体哈希相同）时返回 None
+        """
+        headers = state.headers(self.source_id, url) if state else None
+        resp = await client.get(url, headers=headers, timeout=30)
+        if state and state.unchanged(self.source_id, url, resp):
+            return None
+        resp.raise_for_status()
+        return resp
+
+    async def _records(self, resp: Response, limit: int) -> List[Any]:
+        """从列表页取出条目（HTML / 脚本变量在解析进程池中提取）"""
+        plan = self.plan
+        if plan.format == "html":
+            list_spec = self.spec.list
+            return await parse_executor.run(
+                extract_items, resp.content, resp.encoding, list_spec.selector, list_spec.fields, limit
+            )
+        if plan.format == "json_var":
+            document = await parse_executor.run(
+                extract_json_var, resp.content, resp.encoding, self.spec.list.pattern
+            )
+        else:
+            document = resp.json()
+        return plan.records_from(document)[:limit]
+
+    async def parse(
+        self,
+        response: Optional[Response],
+        source_config: Dict[str, Any],
+        client: AsyncClient = None,
+        limit: int = 20,
+        state: Optional["SourceStateSession"] = None
+    ) -> List[Article]:
+        """抓取并解析列表
+
+        Args:
+            response: 保留接口兼容（未使用）
+            source_config: 新闻源配置（url 中的 {limit} 已替换）
+            client: HTTP 客户端
+            limit: 每个列表（频道）抓取的条数限制
+            state: 抓取状态会话（可选）：未变化的列表直接跳过，配置 watermark 时只解析新增条目
+
+        Returns:
+            文章列表
+
+        Raises:
+            Exception: 全部列表 URL 抓取失败时抛出最后一个错误
+        """
+        if client is None:
+            import httpx
+            client = httpx.AsyncClient()
+
+        articles = []
+        urls = self._list_urls(source_config)
+        errors = []
+        for url in urls:
+            try:
+                with timed("list_fetch"):
+                    resp = await self._fetch_list(url, client, state)
+                if resp is None:
+                    logger.debug("[%s] 列表未变化，跳过解析: %s", self.source_id, url)
+                    continue
+                with timed("parse"):
+                    records = await self._records(resp, limit)
+                    articles.extend(self._extract(records, url, state))
+            except Exception as e:
+                logger.warning("[%s] Error fetching %s: %s", self.source_id, url, e)
+                errors.append(e)
+
+        # 全部列表都失败时抛出，由调用方记为抓取失败（计入熔断），而不是当作"无数据"
+        if urls and len(errors) == len(urls):
+            raise errors[-1]
+        return articles
+
+    def _extract(self, records: List[Any], url: str, state: Optional["SourceStateSession"]) -> List[Article]:
+        """提取文章；配置了 watermark 时从高水位（减重叠窗口）开始，并推进高水位"""
+        if state is None or not self.plan.incremental:
+            return self.plan.extract(records)
+
+        since = state.since(self.source_id, url, self.plan.overlap)
+        articles = self.plan.extract(records, since)
+        state.advance(self.source_id, url, max((a.publish_time for a in articles), default=None))
+        if since is not None:
+            logger.debug("[%s] 增量解析: %d 条中 %d 条晚于 %s", self.source_id, len(records), len(articles), since)
+        return articles
+
+    async def fetch_content(self, url: str, client: AsyncClient) -> str:
+        """获取文章正文内容"""
+        try:
+            response = await client.get(url, timeout=15)
+            response.raise_for_status()
+
+            # 正文提取在解析进程池中执行，不阻塞事件循环
+            content = await parse_executor.run(
+                extract_paragraphs, response.content, response.encoding,
+                self.plan.containers, self.plan.body_fallback
+            )
+            return content or "无法提取文章内容"
+        except Exception as e:
+            return f"获取内容失败: {e}"
+
+
+class ParserRegistry:
+    """解析器注册表：按新闻源缓存编译后的 SpecParser 或解析器模块"""
+
+    def __init__(self):
+        self._parsers: Dict[str, Any] = {}
+
+    def get(self, source: Any) -> Any:
+        """获取新闻源的解析器（带 parse / fetch_content）
+
+        Raises:
+            ImportError: 未配置 spec 且解析器模块不存在
+            ValueError: spec 编译失败
+        """
+        spec = getattr(source, "spec", None)
+        parser = self._parsers.get(source.id)
+        if parser is not None and getattr(parser, "spec", None) == spec:
+            return parser
+
+        if spec is not None:
+            parser = SpecParser(source.id, spec)
+        else:
+            module_name = f"src.crawlers.parsers.{source.id}"
+            try:
+                parser = importlib.import_module(module_name)
+            except ImportError as e:
+                raise ImportError(
+                    f"解析器不存在: {module_name}. 请在 news_sources.yaml 中配置 spec，"
+                    f"或创建 src/crawlers/parsers/{source.id}.py"
+                ) from e
+
+        self._parsers[source.id] = parser
+        return parser
+
+    def load(self, sources: Sequence[Any]) -> Dict[str, str]:
+        """启动时预先编译 / 导入所有启用新闻源的解析器
+
+        Returns:
+            {source_id: "spec" | "module" | 错误信息}
+        """
+        loaded = {}
+        for source in sources:
+            if not source.enabled:
+                continue
+            try:
+                parser = self.get(source)
+                loaded[source.id] = "spec" if isinstance(parser, SpecParser) else "module"
+            except (ImportError, ValueError) as e:
+                loaded[source.id] = str(e)
+                logger.warning("[Parsers] %s 加载失败: %s", source.id, e)
+        return loaded
+
+    def clear(self) -> None:
+        """清空缓存（配置变更后重新编译）"""
+        self._parsers.clear()
+
+
+# 全局单例
+parser_registry = ParserRegistry()
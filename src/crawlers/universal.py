@@ -1,82 +1,140 @@
 """通用爬虫 - 根据配置自动加载解析器
 
-每个新闻源对应一个解析器模块：
-    src/crawlers/parsers/{source_id}.py
+新闻源解析器二选一：
+- news_sources.yaml 中的 spec：编译为提取计划，由通用引擎执行（见 spec_engine）
+- 解析器模块 src/crawlers/parsers/{source_id}.py：用于无法声明式描述的特殊情况
 
 解析器标准接口：
     async def parse(response: httpx.Response, source_config: dict, client: httpx.AsyncClient) -> List[Article]
 """
 
-import importlib
-from typing import List, Dict, Any
+import asyncio
+import logging
+from contextlib import nullcontext
+from typing import List, Dict, Any, Optional
 import httpx
-from pathlib import Path
 
-from ..models import Article, SourceType
+from ..models import Article
+from ..config.models import NetworkConfig
 from ..config.reader import ConfigReader
+from ..storage.body_cache import get_body_cache
+from ..tools.stage_timer import timed
+from .budget import CrawlBudget
+from .http_archive import archive_mode
+from .rate_limit import host_limiter
+from .resilience import CircuitOpenError, circuit_breakers, create_client
+from .spec_engine import SpecParser, parser_registry
+
+logger = logging.getLogger(__name__)
 
 
 class UniversalCrawler:
     """通用爬虫 - 根据配置自动加载解析器"""
 
-    def __init__(self, source_config: Any, config_dir: str = "config", news_batch_limit: int = None):
+    def __init__(
+        self,
+        source_config: Any,
+        config_dir: str = "config",
+        news_batch_limit: int = None,
+        state: Any = None
+    ):
         """初始化通用爬虫
 
         Args:
             source_config: 新闻源配置对象
             config_dir: 配置文件目录
             news_batch_limit: 每次抓取的条数限制（可选，默认从配置读取）
+            state: 抓取状态会话 SourceStateSession（可选，仅 spec 新闻源支持）
         """
         self.source = source_config
         self.config_dir = config_dir
-
-        # 读取 limit 配置
-        if news_batch_limit is None:
-            try:
-                reader = ConfigReader(config_dir)
-                crawler_config = reader.load_crawler_config()
+        self.state = state
+        self.not_modified = False  # 本次抓取列表是否与上次相同（304 / 响应体哈希相同）
+        self.bodies_missing = 0  # 正文预算到期时尚未获取正文的文章数
+        self.bodies_cached = 0  # 命中正文缓存的文章数
+        self.body_cache = None  # 正文缓存（storage.body_cache 开启时）
+
+        # 读取 limit、网络配置
+        network = None
+        try:
+            reader = ConfigReader(config_dir)
+            crawler_config = reader.load_crawler_config()
+            network = crawler_config.network
+            host_limiter.configure(crawler_config.rate_limit)
+            storage = crawler_config.storage
+            # 录制 / 回放时不用正文缓存，保证每篇正文都经过 HTTP 层
+            if storage.body_cache and not archive_mode.active:
+                self.body_cache = get_body_cache(storage.body_cache_path, storage.body_cache_max_mb)
+            if news_batch_limit is None:
                 news_batch_limit = crawler_config.strategy.news_batch_limit
-            except Exception as e:
-                print(f"Warning: Failed to load news_batch_limit: {e}")
-                news_batch_limit = 20  # 默认值
+        except Exception as e:
+            logger.warning("Failed to load crawler config: %s", e)
+        if news_batch_limit is None:
+            news_batch_limit = 20  # 默认值
         self.news_batch_limit = news_batch_limit
 
-        # 使用连接池限制，防止连接泄漏
-        self.client = httpx.AsyncClient(
-            timeout=30,
-            limits=httpx.Limits(
-                max_connections=10,      # 最大连接数
-                max_keepalive_connections=5,  # 保持活动的连接数
-                keepalive_expiry=30.0,    # keepalive 过期时间
-            ),
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-        )
-
-    async def fetch(self) -> List[Article]:
+        # 熔断器：连续失败的新闻源在冷却期内直接跳过
+        network = network or NetworkConfig()
+        circuit_breakers.configure(network.breaker_threshold, network.breaker_cooldown)
+        self.breaker = circuit_breakers.get(self.source.id)
+
+        # 使用连接池限制，防止连接泄漏；临时错误按网络配置重试；按主机限速（各新闻源、各阶段共用）
+        self.client = create_client(network, limits=httpx.Limits(
+            max_connections=10,      # 最大连接数
+            max_keepalive_connections=5,  # 保持活动的连接数
+            keepalive_expiry=30.0,    # keepalive 过期时间
+        ))
+
+    async def fetch(self, budget: Optional[CrawlBudget] = None) -> List[Article]:
         """抓取并解析文章
 
+        Args:
+            budget: 抓取时间预算（可选）：列表抓取按列表截止时间取消，正文抓取到期后剩余正文留空
+
         Returns:
             文章列表
+
+        Raises:
+            CircuitOpenError: 新闻源处于熔断冷却期
+            asyncio.TimeoutError: 列表截止时间前未完成
         """
-        # 1. 动态加载解析器
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.source.id, self.breaker.retry_after())
+
+        # 1. 获取解析器（注册表缓存，启动时已编译）
         parser = self._load_parser()
 
-        # 2. 调用解析器获取文章
-        articles = await parser.parse(
-            response=None,  # 大多数解析器不需要此参数
-            source_config=self._source_to_dict(),
-            client=self.client,
-            limit=self.news_batch_limit
-        )
+        # 2. 调用解析器获取文章（spec 新闻源支持条件请求与增量解析）
+        kwargs = {}
+        if self.state is not None and isinstance(parser, SpecParser):
+            kwargs["state"] = self.state
+        # SpecParser 自行区分列表请求与解析的耗时；解析器模块整体计为列表抓取
+        stage = timed("list_fetch") if not isinstance(parser, SpecParser) else nullcontext()
+        try:
+            with stage:
+                articles = await asyncio.wait_for(
+                    parser.parse(
+                        response=None,  # 大多数解析器不需要此参数
+                        source_config=self._source_to_dict(),
+                        client=self.client,
+                        limit=self.news_batch_limit,
+                        **kwargs
+                    ),
+                    budget.remaining("list") if budget else None
+                )
+        except Exception as e:
+            self.breaker.failure(e)
+            raise
+        self.breaker.success()
+        if self.state is not None:
+            self.not_modified = self.state.not_modified(self.source.id)
 
         # 3. 设置文章来源
         for article in articles:
-            article.source = SourceType(self.source.id)
+            article.source = self.source.id
 
         # 4. 获取文章正文
-        await self._fetch_contents(articles)
+        await self._fetch_contents(parser, articles, budget.remaining("body") if budget else None)
 
         return articles
 
@@ -96,36 +154,54 @@ class UniversalCrawler:
         return result
 
     def _load_parser(self):
-        """动态加载解析器模块
+        """获取解析器（SpecParser 或解析器模块）
 
         Returns:
-            解析器模块
+            带 parse / fetch_content 的解析器
         """
-        # 直接使用 source.id 作为模块名
-        module_name = f"src.crawlers.parsers.{self.source.id}"
-        try:
-            module = importlib.import_module(module_name)
-            return module
-        except ImportError as e:
-            raise ImportError(f"解析器不存在: {module_name}. 请创建 src/crawlers/parsers/{self.source.id}.py") from e
-
-    async def _fetch_contents(self, articles: List[Article]):
-        """获取文章正文内容"""
-        # 导入解析器的 fetch_content 函数
+        return parser_registry.get(self.source)
+
+    async def _fetch_contents(self, parser: Any, articles: List[Article], timeout: Optional[float] = None):
+        """获取文章正文内容（先查正文缓存，未命中的再下载）
+
+        Args:
+            timeout: 正文抓取剩余时间（秒），到期后未获取的正文留空
+        """
+        fetch_func = getattr(parser, "fetch_content", None)
+        if not fetch_func:
+            return
+
+        # 正文缓存为 SQLite，读写放到线程中执行，不阻塞事件循环（其他新闻源并发抓取中）
+        if self.body_cache is not None and articles:
+            cached = await asyncio.to_thread(self.body_cache.get_many, [a.url for a in articles])
+            for article in articles:
+                if article.url in cached:
+                    article.content = cached[article.url]
+            self.bodies_cached = len(cached)
+            articles = [a for a in articles if a.url not in cached]
+
+        # 正文并发抓取：同一主机的请求速率由 host_limiter 限制
+        done = 0
+
+        async def fetch_one(article: Article):
+            nonlocal done
+            try:
+                with timed("body_fetch"):
+                    article.content = await fetch_func(article.url, self.client)
+            except Exception as e:
+                logger.warning("Error fetching content for %s: %s", article.url, e)
+                article.content = None
+            done += 1
+
         try:
-            parser = self._load_parser()
-            fetch_func = getattr(parser, "fetch_content", None)
-
-            if fetch_func:
-                for article in articles:
-                    try:
-                        content = await fetch_func(article.url, self.client)
-                        article.content = content
-                    except Exception as e:
-                        print(f"Error fetching content for {article.url}: {e}")
-                        article.content = None
-        except Exception as e:
-            print(f"Error loading fetch_content: {e}")
+            await asyncio.wait_for(asyncio.gather(*[fetch_one(a) for a in articles]), timeout)
+        except asyncio.TimeoutError:
+            self.bodies_missing = len(articles) - done
+            logger.warning("[%s] 正文抓取超时，%d 篇正文留空", self.source.id, self.bodies_missing)
+        finally:
+            # 已取到的正文（含超时前完成的）写入缓存
+            if self.body_cache is not None:
+                await asyncio.to_thread(self.body_cache.put_many, {a.url: a.content for a in articles if a.content})
 
     async def close(self):
         """关闭 HTTP 客户端"""
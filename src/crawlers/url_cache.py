@@ -6,6 +6,8 @@
 1. 存储当日所有已处理的 URL
 2. 提供 O(1) 查询复杂度的去重检查
 3. 每日自动清零
+
+多 worker 部署时可通过 use_shared_store 切换到进程间共享存储。
 """
 
 from datetime import date, datetime
@@ -35,14 +37,29 @@ class URLCache:
 
         self._cache_date: date = date.today()
         self._urls: Set[str] = set()
+        self._store = None  # 进程间共享存储（SharedStateDB），None 表示仅内存
         self._initialized = True
 
+    KIND = "url"
+
+    def use_shared_store(self, store) -> None:
+        """切换到进程间共享存储（多 worker 部署时调用）
+
+        Args:
+            store: SharedStateDB 实例，None 表示切回内存
+        """
+        if store is not None and self._urls:
+            store.dedup_add(self.KIND, dict.fromkeys(self._urls), self._cache_date.isoformat())
+        self._store = store
+
     def _check_and_reset(self):
         """检查日期，如果新的一天则清空缓存"""
         today = date.today()
         if self._cache_date != today:
             self._cache_date = today
             self._urls.clear()
+            if self._store is not None:
+                self._store.dedup_purge(self.KIND, keep_date=today.isoformat())
             print(f"[URLCache] 缓存已清零，新日期: {today}")
 
     def add(self, url: str):
@@ -52,6 +69,9 @@ class URLCache:
             url: 要添加的 URL
         """
         self._check_and_reset()
+        if self._store is not None:
+            self._store.dedup_add(self.KIND, {url: None}, self._cache_date.isoformat())
+            return
         self._urls.add(url)
 
     def add_batch(self, urls: list[str]):
@@ -61,6 +81,9 @@ class URLCache:
             urls: 要添加的 URL 列表
         """
         self._check_and_reset()
+        if self._store is not None:
+            self._store.dedup_add(self.KIND, dict.fromkeys(urls), self._cache_date.isoformat())
+            return
         self._urls.update(urls)
 
     def exists(self, url: str) -> bool:
@@ -73,17 +96,23 @@ class URLCache:
             True 如果 URL 已存在，False 否则
         """
         self._check_and_reset()
+        if self._store is not None:
+            return self._store.dedup_exists(self.KIND, url, self._cache_date.isoformat())
         return url in self._urls
 
     def clear(self):
         """手动清空缓存"""
         self._urls.clear()
+        if self._store is not None:
+            self._store.dedup_purge(self.KIND)
         self._cache_date = date.today()
 
     @property
     def count(self) -> int:
         """获取当前缓存中的 URL 数量"""
         self._check_and_reset()
+        if self._store is not None:
+            return self._store.dedup_count(self.KIND, self._cache_date.isoformat())
         return len(self._urls)
 
     @property
@@ -94,6 +123,8 @@ class URLCache:
     def get_all_urls(self) -> Set[str]:
         """获取所有缓存的 URL"""
         self._check_and_reset()
+        if self._store is not None:
+            return set(self._store.dedup_keys(self.KIND, self._cache_date.isoformat()))
         return self._urls.copy()
 
 
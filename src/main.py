@@ -1,7 +1,9 @@
 """FastAPI 应用入口"""
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -11,9 +13,21 @@ from pathlib import Path
 from .storage import TimelineDB
 from .api.crawl import router as crawl_router
 from .api.admin import router as admin_router
+from .api.scheduler import router as scheduler_router
+from .api.metrics import MetricsMiddleware, router as metrics_router
 from .api.biz import router as biz_router
-from .scheduler import SchedulerManager
+from .api.biz.legend_basedata import init_services as init_legend_services
+from .scheduler import SchedulerManager, LeaseLock, JobExecutionStore, crawl_jobs
 from .crawlers.dedup import today_news_cache
+from .crawlers.url_cache import url_cache
+from .crawlers.spec_engine import parser_registry
+from .config import ConfigReader
+from .storage.shared_state import enable_shared_state
+from .api.cache_backend import MeteredBackend, SQLiteCacheBackend
+from .tools import single_flight, segment, parse_executor
+from .tools.startup_profile import startup_profiler
+from .tools.logging_setup import setup_logging, stop_logging
+from .tools.profiling import ProfilingMiddleware
 
 # FastAPI Cache
 from fastapi_cache import FastAPICache
@@ -21,27 +35,75 @@ from fastapi_cache.backends.inmemory import InMemoryBackend
 from fastapi_cache.decorator import cache
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """应用生命周期管理"""
-    # 初始化今日数据库
+def _init_today_cache() -> None:
+    """初始化今日数据库并加载去重缓存（防止重启后重复抓取）"""
     db = TimelineDB(date.today())
     db.init_db()
-
-    # 从数据库加载缓存（防止重启后重复抓取）
     today_news_cache.init_from_db(db, limit=100)
 
-    # 初始化 FastAPI Cache（内存后端）
-    FastAPICache.init(InMemoryBackend(), prefix="sfapi-cache")
 
-    # 初始化并启动调度器
-    scheduler = SchedulerManager(config_dir="config")
+def _init_parsers() -> None:
+    """编译新闻源 spec / 导入解析器模块（抓取时直接使用缓存）"""
+    sources = ConfigReader("config").load_news_sources_config().sources
+    parser_registry.load(sources)
+
+
+async def _start_scheduler() -> SchedulerManager:
+    """初始化并启动调度器"""
+    scheduler = await run_in_threadpool(SchedulerManager, "config")
     await scheduler.start()
+    return scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期管理
+
+    关键路径只保留接收请求前必须完成的步骤（缓存后端、去重缓存、解析器编译、调度器），
+    互不依赖的步骤并发执行；jieba 词典与 Legend 服务在后台线程预热。
+    """
+    # 多 worker 部署：去重缓存、响应缓存、抓取互斥改为进程间共享
+    with startup_profiler.phase("load deploy config"):
+        crawler_config = ConfigReader("config").load_crawler_config()
+        setup_logging(crawler_config.logging)
+        deploy = crawler_config.deploy
+        if deploy.shared_state:
+            shared_state = enable_shared_state(deploy.state_db_path)
+            today_news_cache.use_shared_store(shared_state)
+            url_cache.use_shared_store(shared_state)
+            crawl_jobs.lease = LeaseLock(JobExecutionStore().db_path, "crawl", ttl=deploy.leader_ttl)
+            cache_backend = SQLiteCacheBackend(shared_state)
+            print(f"[App] 已启用进程间共享状态: {deploy.state_db_path}")
+        else:
+            cache_backend = InMemoryBackend()
+
+    # 初始化 FastAPI Cache
+    FastAPICache.init(MeteredBackend(cache_backend), prefix="sfapi-cache")
+
+    with startup_profiler.phase("init cache + parsers + scheduler"):
+        _, _, scheduler = await asyncio.gather(
+            run_in_threadpool(_init_today_cache),
+            run_in_threadpool(_init_parsers),
+            _start_scheduler(),
+        )
+
+    # 非关键路径：后台预热（不阻塞接收请求）
+    warm_up_tasks = [
+        asyncio.ensure_future(run_in_threadpool(segment.warm_up)),
+        asyncio.ensure_future(run_in_threadpool(init_legend_services)),
+    ]
+
+    startup_profiler.mark("ready to serve")
+    startup_profiler.print_report()
 
     yield
 
     # 清理资源
+    for task in warm_up_tasks:
+        task.cancel()
     await scheduler.close()
+    parse_executor.shutdown()
+    stop_logging()
 
 
 app = FastAPI(
@@ -59,6 +121,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 请求耗时指标（/metrics）
+app.add_middleware(MetricsMiddleware)
+# 按需剖析请求（/admin/profile 开启）
+app.add_middleware(ProfilingMiddleware)
 
 # 挂载静态文件
 static_dir = Path("static")
@@ -68,6 +134,8 @@ app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 # 注册 API 路由
 app.include_router(crawl_router)
 app.include_router(admin_router)
+app.include_router(scheduler_router)
+app.include_router(metrics_router)
 app.include_router(biz_router)
 
 
@@ -113,15 +181,37 @@ async def health():
     return {"status": "healthy"}
 
 
+def _invalid_fields_response(error: ValueError) -> dict:
+    """?fields= 参数非法时的统一响应"""
+    return {
+        "code": 400,
+        "message": str(error),
+        "data": None,
+        "allowed_fields": list(TimelineDB.ARTICLE_FIELDS)
+    }
+
+
 @app.get("/api/articles/today")
 @cache(expire=30)
-async def list_articles_today(limit: int = 100, legend: str = None):
-    """获取今日及以后的新闻"""
+@single_flight()
+async def list_articles_today(limit: int = 100, legend: str = None, fields: str = None):
+    """获取今日及以后的新闻
+
+    Args:
+        fields: 返回字段，逗号分隔（默认精简字段，"*" 返回全部列）
+    """
+    try:
+        projection = TimelineDB.parse_fields(fields)
+    except ValueError as e:
+        return _invalid_fields_response(e)
+
     # 使用北京时间（UTC+8）获取今日日期
     beijing_tz = timezone(timedelta(hours=8))
     today = datetime.now(beijing_tz).date().isoformat()
     db = TimelineDB()
-    articles = db.list_articles(limit=limit, legend=legend, start_date=today)
+    # 查询放到线程池执行：不阻塞事件循环，并发的相同请求由 single_flight 合并为一次查询
+    articles = await run_in_threadpool(db.list_articles, limit=limit, legend=legend,
+                                       start_date=today, fields=projection)
     return {
         "code": 200,
         "message": "success",
@@ -132,10 +222,21 @@ async def list_articles_today(limit: int = 100, legend: str = None):
 
 @app.get("/api/articles/latest")
 @cache(expire=60)
-async def list_articles_latest(limit: int = 100, legend: str = None):
-    """获取最新新闻（不限日期）"""
+@single_flight()
+async def list_articles_latest(limit: int = 100, legend: str = None, fields: str = None):
+    """获取最新新闻（不限日期）
+
+    Args:
+        fields: 返回字段，逗号分隔（默认精简字段，"*" 返回全部列）
+    """
+    try:
+        projection = TimelineDB.parse_fields(fields)
+    except ValueError as e:
+        return _invalid_fields_response(e)
+
     db = TimelineDB()
-    articles = db.list_articles_latest(limit=limit, legend=legend)
+    articles = await run_in_threadpool(db.list_articles_latest, limit=limit, legend=legend,
+                                       fields=projection)
     return {
         "code": 200,
         "message": "success",
@@ -146,8 +247,9 @@ async def list_articles_latest(limit: int = 100, legend: str = None):
 
 @app.get("/api/articles")
 @cache(expire=120)
+@single_flight()
 async def list_articles(limit: int = 100, years: int = 1, legend: str = None,
-                       start_date: str = None, end_date: str = None):
+                       start_date: str = None, end_date: str = None, fields: str = None):
     """获取文章列表（高级查询）
 
     Args:
@@ -156,13 +258,22 @@ async def list_articles(limit: int = 100, years: int = 1, legend: str = None,
         legend: 筛选传奇人物
         start_date: 开始日期 YYYY-MM-DD（可选）
         end_date: 结束日期 YYYY-MM-DD（可选）
+        fields: 返回字段，逗号分隔（默认精简字段，"*" 返回全部列）
     """
+    try:
+        projection = TimelineDB.parse_fields(fields)
+    except ValueError as e:
+        return _invalid_fields_response(e)
+
     if years == 1:
         db = TimelineDB()
-        articles = db.list_articles(limit=limit, legend=legend, start_date=start_date, end_date=end_date)
+        articles = await run_in_threadpool(db.list_articles, limit=limit, legend=legend,
+                                           start_date=start_date, end_date=end_date,
+                                           fields=projection)
     else:
-        articles = TimelineDB.list_articles_multi_year(years=years, limit=limit, legend=legend,
-                                                         start_date=start_date, end_date=end_date)
+        articles = await run_in_threadpool(TimelineDB.list_articles_multi_year, years=years,
+                                           limit=limit, legend=legend, start_date=start_date,
+                                           end_date=end_date, fields=projection)
     return {
         "code": 200,
         "message": "success",
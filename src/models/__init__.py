@@ -1,7 +1,7 @@
 """数据模型定义"""
 
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List
+from typing import Optional, List, Union
 from enum import Enum
 from uuid import uuid4
 
@@ -30,7 +30,7 @@ class Article(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid4()))
     title: str
     url: str
-    source: SourceType
+    source: Union[SourceType, str]  # 声明式新闻源（spec）可使用任意 id，无需扩充枚举
     publish_time: datetime = Field(..., description="新闻发布时间（源数据，不允许篡改）")
     content: Optional[str] = None
     file_path: Optional[str] = None
@@ -2,8 +2,20 @@
 
 from .scheduler import SchedulerManager
 from .store import JobExecutionStore
+from .jobs import CrawlJob, CrawlJobManager, crawl_jobs
+from .leader import LeaseLock
+from .source_state import SourceStateStore, get_source_state_store
+from .source_health import SourceHealthStore, get_source_health_store
 
 __all__ = [
     "SchedulerManager",
     "JobExecutionStore",
+    "CrawlJob",
+    "CrawlJobManager",
+    "crawl_jobs",
+    "LeaseLock",
+    "SourceStateStore",
+    "get_source_state_store",
+    "SourceHealthStore",
+    "get_source_health_store",
 ]
@@ -0,0 +1,102 @@
+"""新闻源自适应抓取间隔
+
+各新闻源更新频率差别很大（财联社电报、华尔街见闻快讯几分钟一条，澎湃热门列表很少变化），
+统一间隔要么让快源不够新，要么对慢源做无用请求。每个新闻源单独维护抓取间隔：
+
+- 新条目速率：每次抓取后用 新条目数 / 距上次抓取的秒数 更新指数滑动平均，
+  间隔调整为"平均攒够 target_new 条新条目"所需的时间
+- 没有新条目：间隔放大 1.5 倍
+- 抓取失败：间隔翻倍（连续失败持续退避），成功后恢复按速率计算
+- 单次调整幅度限制在 0.5 ~ 2 倍之间，避免抖动；结果限制在 [min_interval, max_interval]
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+
+class SourceCadence:
+    """单个新闻源的自适应抓取间隔"""
+
+    ALPHA = 0.3  # 新条目速率的滑动平均系数
+    IDLE_FACTOR = 1.5  # 无新条目时的放大倍数
+    MAX_STEP = 2.0  # 单次调整的最大倍数
+
+    def __init__(
+        self,
+        source_id: str,
+        interval: int,
+        min_interval: int,
+        max_interval: int,
+        target_new: float = 3,
+    ):
+        """初始化
+
+        Args:
+            source_id: 新闻源 ID
+            interval: 初始间隔（秒），会被限制在上下限之间
+            min_interval: 最小间隔（秒）
+            max_interval: 最大间隔（秒）
+            target_new: 期望每次抓取获得的新条目数
+        """
+        self.source_id = source_id
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.target_new = target_new
+        self.interval = self._clamp(interval)
+
+        self.rate: Optional[float] = None  # 新条目/秒（滑动平均）
+        self.error_rate = 0.0  # 失败率（滑动平均）
+        self.consecutive_errors = 0
+        self.runs = 0
+        self.last_new = 0
+        self._last_observed: Optional[float] = None
+
+    def _clamp(self, interval: float) -> int:
+        return int(min(self.max_interval, max(self.min_interval, interval)))
+
+    def observe(self, new_items: int = 0, error: bool = False, now: Optional[float] = None) -> int:
+        """记录一次抓取结果，返回调整后的间隔（秒）
+
+        Args:
+            new_items: 本次抓取的新条目数（去重后）
+            error: 本次抓取是否失败
+            now: 当前时间戳（测试用）
+        """
+        now = time.time() if now is None else now
+        elapsed = now - self._last_observed if self._last_observed is not None else self.interval
+        elapsed = max(elapsed, 1.0)
+        self._last_observed = now
+        self.runs += 1
+        self.error_rate = self.ALPHA * (1.0 if error else 0.0) + (1 - self.ALPHA) * self.error_rate
+
+        if error:
+            self.consecutive_errors += 1
+            self.interval = self._clamp(self.interval * 2)
+            return self.interval
+
+        self.consecutive_errors = 0
+        self.last_new = new_items
+        sample = new_items / elapsed
+        self.rate = sample if self.rate is None else self.ALPHA * sample + (1 - self.ALPHA) * self.rate
+
+        if new_items == 0 or not self.rate:
+            desired = self.interval * self.IDLE_FACTOR
+        else:
+            desired = self.target_new / self.rate
+
+        desired = min(self.interval * self.MAX_STEP, max(self.interval / self.MAX_STEP, desired))
+        self.interval = self._clamp(desired)
+        return self.interval
+
+    def to_dict(self) -> Dict[str, Any]:
+        """状态（用于调度器 status）"""
+        return {
+            "interval": self.interval,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "new_per_hour": round(self.rate * 3600, 2) if self.rate is not None else None,
+            "last_new": self.last_new,
+            "error_rate": round(self.error_rate, 3),
+            "consecutive_errors": self.consecutive_errors,
+            "runs": self.runs,
+        }
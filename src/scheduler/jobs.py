@@ -0,0 +1,236 @@
+"""后台抓取任务管理
+
+手动触发与定时调度共用同一个任务管理器：
+- 提交后立即返回任务 ID，抓取在后台执行
+- 同一时间只运行一个抓取任务，并发提交会合并到正在运行的任务；
+  运行中的任务不覆盖本次提交的新闻源时（如按新闻源调度），新任务排在其后执行
+- 通过任务 ID 查询各阶段进度
+- 多 worker 部署时可设置跨进程租约，其他 worker 正在抓取时本次任务标记为 skipped
+- 每次执行（成功或失败）连同各阶段耗时与计数记入调度器数据库（见 JobExecutionStore.get_profile）
+"""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from .leader import LeaseLock
+from .store import JobExecutionStore
+
+
+class CrawlJob:
+    """单个抓取任务"""
+
+    def __init__(self, job_id: str, source_id: Optional[str] = None, trigger: str = "api"):
+        self.id = job_id
+        self.source_id = source_id
+        self.trigger = trigger
+        self.status = "pending"  # pending | running | success | failed | skipped
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.coalesced = 0  # 合并到本任务的重复提交次数
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        """任务是否已结束"""
+        return self.status in ("success", "failed", "skipped")
+
+    def covers(self, source_id: Optional[str]) -> bool:
+        """本任务是否包含指定新闻源的抓取（None 表示所有启用的源）"""
+        return self.source_id is None or self.source_id == source_id
+
+    def update_stage(self, stage: str, status: str = "running", **info) -> None:
+        """更新阶段进度（作为 run_crawl 的 progress 回调）"""
+        entry = self.stages.setdefault(stage, {})
+        entry.update(info)
+        entry["status"] = status
+        entry["updated_at"] = datetime.now().isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为 API 响应结构"""
+        return {
+            "id": self.id,
+            "source_id": self.source_id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "stages": self.stages,
+            "coalesced": self.coalesced,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class CrawlJobManager:
+    """抓取任务管理器
+
+    进程内单例，所有抓取入口（API 触发、调度器）都通过 submit 提交。
+    """
+
+    MAX_HISTORY = 50  # 保留的历史任务数
+
+    def __init__(
+        self,
+        runner: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None,
+        lease: Optional[LeaseLock] = None,
+        store: Optional[JobExecutionStore] = None
+    ):
+        """初始化任务管理器
+
+        Args:
+            runner: 抓取函数，签名同 run_crawl(source_id, progress)；默认使用 run_crawl
+            lease: 跨进程抓取租约（多 worker 部署时设置，None 表示仅进程内互斥）
+            store: 执行记录存储；默认使用 run_crawl 时为调度器数据库，自定义 runner 且未传入时不记录
+        """
+        self._runner = runner
+        self.lease = lease
+        self.store = store
+        self._jobs: "OrderedDict[str, CrawlJob]" = OrderedDict()
+        self._current: Optional[CrawlJob] = None
+
+    @property
+    def current(self) -> Optional[CrawlJob]:
+        """当前正在运行的任务"""
+        if self._current and not self._current.done:
+            return self._current
+        return None
+
+    def submit(
+        self,
+        source_id: Optional[str] = None,
+        trigger: str = "api",
+        job_id: Optional[str] = None
+    ) -> Tuple[CrawlJob, bool]:
+        """提交抓取任务
+
+        已有任务在运行且覆盖本次的新闻源时不会启动新抓取，而是返回正在运行的任务；
+        不覆盖时新任务排队，等正在运行的任务结束后再执行。
+
+        Args:
+            source_id: 指定新闻源ID，None 表示所有启用的源
+            trigger: 触发来源（api | scheduler | cli）
+            job_id: 自定义任务ID（可选）
+
+        Returns:
+            (任务, 是否新建)
+        """
+        running = self.current
+        if running and running.covers(source_id):
+            running.coalesced += 1
+            print(f"[CrawlJob] 已有任务运行中，合并到 {running.id} (来源: {trigger})")
+            return running, False
+
+        job_id = job_id or f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        job = CrawlJob(job_id, source_id=source_id, trigger=trigger)
+        self._jobs[job.id] = job
+        self._current = job
+        self._trim_history()
+
+        job._task = asyncio.create_task(self._run(job, after=running))
+        print(f"[CrawlJob] 任务已提交: {job.id} (来源: {trigger})")
+        return job, True
+
+    async def wait(self, job: CrawlJob) -> Dict[str, Any]:
+        """等待任务结束
+
+        Returns:
+            抓取结果
+
+        Raises:
+            RuntimeError: 任务失败
+        """
+        if job._task:
+            await asyncio.shield(job._task)
+        if job.status == "failed":
+            raise RuntimeError(job.error)
+        return job.result
+
+    def get(self, job_id: str) -> Optional[CrawlJob]:
+        """按 ID 获取任务"""
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, limit: int = 10) -> List[CrawlJob]:
+        """获取最近的任务（新的在前）"""
+        return list(reversed(self._jobs.values()))[:limit]
+
+    async def _run(self, job: CrawlJob, after: Optional[CrawlJob] = None) -> None:
+        """在后台执行抓取任务
+
+        Args:
+            job: 要执行的任务
+            after: 排在其后执行的任务（保证同一时间只有一个抓取）
+        """
+        runner = self._runner
+        if runner is None:
+            from ..api.crawl import run_crawl
+            runner = run_crawl
+
+        if after is not None and after._task is not None:
+            # 前一个任务的失败已记录在该任务上，这里只等待其结束
+            await asyncio.gather(asyncio.shield(after._task), return_exceptions=True)
+
+        job.started_at = datetime.now()
+
+        lease = self.lease
+        # 租约读写为同步 SQLite 操作，放到线程中执行
+        if lease is not None and not await asyncio.to_thread(lease.acquire):
+            job.status = "skipped"
+            job.error = f"其他 worker 正在抓取: {await asyncio.to_thread(lease.current_owner)}"
+            job.completed_at = datetime.now()
+            print(f"[CrawlJob] 任务跳过: {job.id} - {job.error}")
+            return
+
+        job.status = "running"
+        keep_alive = asyncio.create_task(lease.keep_alive()) if lease is not None else None
+        try:
+            job.result = await runner(job.source_id, progress=job.update_stage)
+            job.status = "success"
+        except Exception as e:
+            import traceback
+            print(f"[CrawlJob] 任务失败: {job.id} - {e}")
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.completed_at = datetime.now()
+            if keep_alive is not None:
+                keep_alive.cancel()
+                await asyncio.to_thread(lease.release)
+            await self._record(job)
+
+    async def _record(self, job: CrawlJob) -> None:
+        """记录一次执行（含 profile），失败只打印不影响任务"""
+        store = self.store
+        if store is None and self._runner is None:
+            store = self.store = JobExecutionStore()
+        if store is None:
+            return
+        try:
+            await run_in_threadpool(
+                store.record_execution, job.id, job.result or {}, job.error,
+                job.started_at, job.completed_at,
+            )
+        except Exception as e:
+            print(f"[CrawlJob] 记录执行结果失败: {job.id} - {e}")
+
+    def _trim_history(self) -> None:
+        """清理超出上限的已结束任务"""
+        while len(self._jobs) > self.MAX_HISTORY:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if not oldest.done:
+                break
+            del self._jobs[oldest_id]
+
+
+# 全局单例
+crawl_jobs = CrawlJobManager()
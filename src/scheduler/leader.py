@@ -0,0 +1,121 @@
+"""跨进程租约锁
+
+基于 SQLite 的租约（lease）：持有者定期续约，进程退出或卡死后租约过期，
+其他进程即可接管。用于：
+- 调度器选主：多 worker 部署时只有一个 worker 运行定时抓取
+- 抓取互斥：不同 worker 触发的抓取不会同时执行
+
+acquire / release / current_owner 是同步的 SQLite 操作（其他 worker 持有写锁时最多等待 10 秒），
+在协程中须通过 asyncio.to_thread 调用，避免阻塞事件循环。
+"""
+
+import asyncio
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+
+class LeaseLock:
+    """SQLite 租约锁"""
+
+    def __init__(self, db_path: str, name: str, ttl: int = 60, owner: Optional[str] = None):
+        """初始化租约锁
+
+        Args:
+            db_path: 数据库路径（与调度器数据库共用）
+            name: 锁名称
+            ttl: 租约时长（秒），持有者需在过期前续约
+            owner: 持有者标识（默认 主机名:进程号:随机串）
+        """
+        self.db_path = db_path
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.held = False
+        self._initialized = False
+
+    def _get_conn(self):
+        """获取数据库连接"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def init_db(self) -> None:
+        """初始化租约表"""
+        if self._initialized:
+            return
+        conn = self._get_conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+        self._initialized = True
+
+    def acquire(self) -> bool:
+        """获取或续约（非阻塞）
+
+        租约空闲、已过期或本来就由自己持有时成功。
+
+        Returns:
+            是否持有租约
+        """
+        self.init_db()
+        now = time.time()
+
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    owner = excluded.owner,
+                    expires_at = excluded.expires_at
+                WHERE leases.owner = excluded.owner OR leases.expires_at < ?
+            """, (self.name, self.owner, now + self.ttl, now))
+            conn.commit()
+
+            row = conn.execute("SELECT owner FROM leases WHERE name = ?", (self.name,)).fetchone()
+        except sqlite3.OperationalError as e:
+            # 数据库繁忙等情况视为未获得
+            print(f"[Lease] 获取租约失败: {self.name} - {e}")
+            row = None
+        finally:
+            conn.close()
+
+        self.held = row is not None and row[0] == self.owner
+        return self.held
+
+    def release(self) -> None:
+        """释放租约（仅释放自己持有的）"""
+        self.init_db()
+        conn = self._get_conn()
+        conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (self.name, self.owner))
+        conn.commit()
+        conn.close()
+        self.held = False
+
+    def current_owner(self) -> Optional[str]:
+        """当前持有者（已过期返回 None）"""
+        self.init_db()
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT owner FROM leases WHERE name = ? AND expires_at >= ?",
+            (self.name, time.time())
+        ).fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    async def keep_alive(self) -> None:
+        """后台续约，直到任务被取消（租约时长的 1/3 续约一次）"""
+        while True:
+            await asyncio.sleep(max(self.ttl / 3, 1))
+            if not await asyncio.to_thread(self.acquire):
+                print(f"[Lease] 租约已丢失: {self.name}")
+                return
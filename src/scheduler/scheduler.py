@@ -7,6 +7,9 @@ from datetime import datetime
 
 from ..config import ConfigReader
 from .store import JobExecutionStore
+from .jobs import crawl_jobs
+from .leader import LeaseLock
+from .cadence import SourceCadence
 
 
 class SchedulerManager:
@@ -17,6 +20,11 @@ class SchedulerManager:
     约束：
     - 最小抓取间隔：15分钟（900秒）
     - 服务启动后延迟5秒再执行首次抓取
+    - 多 worker 部署时通过租约选主，只有 leader 运行定时抓取，其余 worker 待命
+
+    调度模式（crawler_config.yaml 的 polling.adaptive）：
+    - 统一间隔：一个 news_crawl 任务按 strategy.interval 抓取所有新闻源
+    - 自适应：每个新闻源一个 news_crawl:{source_id} 任务，间隔随新条目速率、失败率调整（见 cadence）
     """
 
     MIN_INTERVAL = 900  # 15分钟硬编码限制
@@ -32,69 +40,162 @@ class SchedulerManager:
             ValueError: 如果 interval 小于 MIN_INTERVAL
         """
         self.config_dir = config_dir
-        self.config = self._load_config()
+        crawler_config = ConfigReader(config_dir).load_crawler_config()
+        self.config = crawler_config.strategy
 
         # 验证最小间隔
         if self.config.interval < self.MIN_INTERVAL:
             raise ValueError(f"最小抓取间隔为 {self.MIN_INTERVAL} 秒")
 
         self.interval = self.config.interval
+        self.polling = crawler_config.polling
         self.scheduler = AsyncIOScheduler()
+
+        # 自适应模式：每个启用的新闻源单独维护抓取间隔
+        self.cadences: Dict[str, SourceCadence] = {}
+        if self.polling.adaptive:
+            self._init_cadences()
         self.is_running = False
         self.is_paused = False
 
         # 任务执行存储
         self.store = JobExecutionStore()
 
-    def _load_config(self) -> Any:
-        """加载配置"""
-        reader = ConfigReader(self.config_dir)
-        return reader.load_crawler_config().strategy
+        # 选主租约（与任务执行记录共用调度器数据库）
+        self.leader = LeaseLock(self.store.db_path, "scheduler", ttl=crawler_config.deploy.leader_ttl)
+        self._leader_task: Optional[asyncio.Task] = None
+        self._scheduler_started = False
+
+    def _init_cadences(self) -> None:
+        """按新闻源创建自适应间隔（上下限不低于 MIN_INTERVAL）"""
+        sources = ConfigReader(self.config_dir).load_news_sources_config().sources
+        for source in sources:
+            if not source.enabled:
+                continue
+            poll = source.poll
+            min_interval = (poll.min_interval if poll and poll.min_interval else None) or self.polling.min_interval
+            max_interval = (poll.max_interval if poll and poll.max_interval else None) or self.polling.max_interval
+            if min_interval < self.MIN_INTERVAL:
+                print(f"[Scheduler] {source.id} 最小间隔 {min_interval} 秒低于 {self.MIN_INTERVAL} 秒，按 {self.MIN_INTERVAL} 秒处理")
+                min_interval = self.MIN_INTERVAL
+            self.cadences[source.id] = SourceCadence(
+                source.id,
+                interval=self.interval,
+                min_interval=min_interval,
+                max_interval=max_interval,
+                target_new=self.polling.target_new,
+            )
+
+    def _jitter(self, interval: int) -> int:
+        """随机延后的最大秒数（只延后不提前，不会低于最小间隔）"""
+        return int(interval * self.polling.jitter)
+
+    @property
+    def is_leader(self) -> bool:
+        """当前 worker 是否为调度 leader"""
+        return self.leader.held
 
     async def start(self) -> None:
         """启动调度器
 
-        启动后延迟15秒执行首次抓取，然后开始定时任务
+        先竞选 leader：成功则启动定时任务，并延迟执行首次抓取；
+        失败则进入待命状态，定期重试，leader 退出后自动接管。
         """
         if self.is_running:
             print("[Scheduler] 调度器已在运行")
             return
 
+        self.is_running = True
+        self.is_paused = False
+
+        # 租约读写为同步 SQLite 操作，放到线程中执行
+        if await asyncio.to_thread(self.leader.acquire):
+            self._become_leader()
+        else:
+            owner = await asyncio.to_thread(self.leader.current_owner)
+            print(f"[Scheduler] 其他 worker 已是 leader ({owner})，本 worker 待命")
+
+        self._leader_task = asyncio.create_task(self._leader_loop())
+
+    def _become_leader(self) -> None:
+        """成为 leader：启动（或恢复）定时任务"""
+        print(f"[Scheduler] 成为调度 leader: {self.leader.owner}")
+
+        if self._scheduler_started:
+            if not self.is_paused:
+                self.scheduler.resume()
+            return
+
         print(f"[Scheduler] 启动调度器，间隔: {self.interval}秒")
         print(f"[Scheduler] 首次抓取将在 {self.INITIAL_DELAY} 秒后执行...")
 
         # 1. 启动定时任务（首次执行在 interval 后）
-        self.scheduler.add_job(
-            self._run_crawl_job,
-            'interval',
-            seconds=self.interval,
-            id='news_crawl',
-            max_instances=1  # 防止任务重叠
-        )
+        if self.cadences:
+            for source_id, cadence in self.cadences.items():
+                self.scheduler.add_job(
+                    self._run_crawl_job,
+                    'interval',
+                    seconds=cadence.interval,
+                    jitter=self._jitter(cadence.interval),
+                    id=f'news_crawl:{source_id}',
+                    args=[source_id],
+                    max_instances=1  # 防止任务重叠
+                )
+            print(f"[Scheduler] 自适应调度: {len(self.cadences)} 个新闻源")
+        else:
+            self.scheduler.add_job(
+                self._run_crawl_job,
+                'interval',
+                seconds=self.interval,
+                id='news_crawl',
+                max_instances=1  # 防止任务重叠
+            )
         self.scheduler.start()
-        self.is_running = True
-        self.is_paused = False
+        self._scheduler_started = True
 
         # 2. 延迟执行首次抓取（后台任务）
         asyncio.create_task(self._delayed_first_crawl())
 
         print("[Scheduler] 调度器已启动")
 
+    async def _leader_loop(self) -> None:
+        """续约 / 竞选循环（租约时长的 1/3 执行一次）"""
+        interval = max(self.leader.ttl / 3, 1)
+        while self.is_running:
+            await asyncio.sleep(interval)
+            was_leader = self.is_leader
+            is_leader = await asyncio.to_thread(self.leader.acquire)
+
+            if is_leader and not was_leader:
+                self._become_leader()
+            elif was_leader and not is_leader:
+                print("[Scheduler] 失去 leader 租约，暂停定时任务")
+                if self._scheduler_started and not self.is_paused:
+                    self.scheduler.pause()
+
     async def _delayed_first_crawl(self) -> None:
         """延迟执行首次抓取"""
         await asyncio.sleep(self.INITIAL_DELAY)
-        if self.is_running and not self.is_paused:
+        if self.is_running and not self.is_paused and self.is_leader:
             print("[Scheduler] 执行首次抓取...")
             await self._run_crawl_job()
 
     async def stop(self) -> None:
-        """停止调度器"""
+        """停止调度器（释放 leader 租约）"""
         if not self.is_running:
             print("[Scheduler] 调度器未运行")
             return
 
         print("[Scheduler] 停止调度器")
-        self.scheduler.shutdown(wait=False)
+        if self._leader_task:
+            self._leader_task.cancel()
+            self._leader_task = None
+        if self._scheduler_started:
+            self.scheduler.shutdown(wait=False)
+            self._scheduler_started = False
+            self.scheduler = AsyncIOScheduler()
+        if self.is_leader:
+            await asyncio.to_thread(self.leader.release)
         self.is_running = False
         self.is_paused = False
 
@@ -105,7 +206,8 @@ class SchedulerManager:
             return
 
         print("[Scheduler] 暂停调度器")
-        self.scheduler.pause()
+        if self._scheduler_started:
+            self.scheduler.pause()
         self.is_paused = True
 
     async def resume(self) -> None:
@@ -115,32 +217,106 @@ class SchedulerManager:
             return
 
         print("[Scheduler] 恢复调度器")
-        self.scheduler.resume()
+        if self._scheduler_started and self.is_leader:
+            self.scheduler.resume()
         self.is_paused = False
 
+    def _next_run_time(self, job_id: str) -> Optional[str]:
+        """任务的下次执行时间（非 leader 或未启动时为 None）"""
+        job = self.scheduler.get_job(job_id) if self._scheduler_started else None
+        next_run_time = job.next_run_time if job and self.is_leader else None
+        return next_run_time.isoformat() if next_run_time else None
+
     @property
     def status(self) -> Dict[str, Any]:
-        """获取调度器状态"""
-        job = self.scheduler.get_job('news_crawl') if self.is_running else None
-
-        return {
+        """获取调度器状态（自适应模式下含各新闻源当前抓取间隔）"""
+        status = {
             "is_running": self.is_running,
             "is_paused": self.is_paused,
             "interval": self.interval,
-            "next_run_time": job.next_run_time.isoformat() if job else None
+            "next_run_time": self._next_run_time('news_crawl'),
+            "is_leader": self.is_leader,
+            "worker_id": self.leader.owner,
+            "mode": "adaptive" if self.cadences else "fixed",
         }
+        if self.cadences:
+            status["sources"] = {
+                source_id: {
+                    **cadence.to_dict(),
+                    "next_run_time": self._next_run_time(f'news_crawl:{source_id}'),
+                }
+                for source_id, cadence in self.cadences.items()
+            }
+            next_times = [s["next_run_time"] for s in status["sources"].values() if s["next_run_time"]]
+            status["next_run_time"] = min(next_times) if next_times else None
+        return status
+
+    def _update_cadences(self, result: Dict[str, Any], source_id: Optional[str] = None) -> None:
+        """按抓取结果调整各新闻源的间隔，并重新排定其下次执行时间
+
+        Args:
+            result: run_crawl 的结果（空字典表示任务失败）
+            source_id: 按新闻源调度的任务所属的源（任务失败时按失败处理）
+        """
+        if not self.cadences:
+            return
+
+        observed = {}
+        for source_result in result.get("sources", []):
+            observed[source_result["id"]] = (source_result.get("new", 0), source_result["status"] != "success")
+        if source_id and source_id not in observed:
+            observed[source_id] = (0, True)
+
+        for sid, (new_items, error) in observed.items():
+            cadence = self.cadences.get(sid)
+            if cadence is None:
+                continue
+            previous = cadence.interval
+            interval = cadence.observe(new_items=new_items, error=error)
+            if interval != previous:
+                print(f"[Scheduler] {sid} 抓取间隔: {previous}s -> {interval}s (新条目 {new_items}{', 失败' if error else ''})")
+
+            job_id = f'news_crawl:{sid}'
+            if self._scheduler_started and self.scheduler.get_job(job_id):
+                self.scheduler.reschedule_job(
+                    job_id, trigger='interval', seconds=interval, jitter=self._jitter(interval)
+                )
+
+    async def _run_crawl_job(self, source_id: Optional[str] = None) -> Dict[str, Any]:
+        """执行抓取任务
+
+        Args:
+            source_id: 自适应模式下的新闻源 ID，None 表示所有启用的源
+        """
+        prefix = f"news_crawl_{source_id}" if source_id else "news_crawl"
+        job_id = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        # 租约可能在两次续约之间过期，执行前再确认一次
+        if not await asyncio.to_thread(self.leader.acquire):
+            print(f"[Scheduler] 非 leader，跳过任务: {job_id}")
+            return {}
 
-    async def _run_crawl_job(self) -> Dict[str, Any]:
-        """执行抓取任务"""
-        job_id = f"news_crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         print(f"[Scheduler] 执行任务: {job_id}")
+        started_at = datetime.now()
+        job = None
 
         try:
-            from ..api.crawl import run_crawl
-            result = await run_crawl()
-
-            # 记录执行结果
-            self.store.record_execution(job_id, result)
+            # 与手动触发共用任务管理器，已有任务在运行时合并或排队，避免重叠抓取
+            job, created = crawl_jobs.submit(source_id=source_id, trigger="scheduler", job_id=job_id)
+            result = await crawl_jobs.wait(job)
+            if job.status == "skipped":
+                print(f"[Scheduler] 任务跳过: {job.error}")
+                return {}
+
+            # 执行结果（含 profile）由任务管理器记录；合并到其他任务时记在该任务的 ID 下
+            if created:
+                self._update_cadences(result, source_id)
+            elif source_id:
+                # 合并到其他任务（手动触发或其他源的任务）时只按本源的结果调整，
+                # 其他源由各自的任务调整，避免重复计入；该任务未抓取本源时不调整
+                own = [s for s in result.get("sources", []) if s["id"] == source_id]
+                if own:
+                    self._update_cadences({"sources": own}, source_id)
 
             print(f"[Scheduler] 任务完成: 抓取 {result.get('total_saved', 0)} 条")
             return result
@@ -150,8 +326,10 @@ class SchedulerManager:
             print(f"[Scheduler] 任务失败: {e}")
             traceback.print_exc()
 
-            # 记录失败
-            self.store.record_execution(job_id, {}, error=str(e))
+            # 任务失败已由任务管理器记录，提交前的异常在这里记录
+            if job is None:
+                self.store.record_execution(job_id, {}, error=str(e), started_at=started_at)
+            self._update_cadences({}, source_id)
             raise
 
     async def close(self) -> None:
@@ -0,0 +1,186 @@
+"""新闻源健康历史（存入调度器数据库）
+
+每次新闻源测试（/admin/source_test）的结果逐源记一行：状态、条目数、总耗时、建连、首字节、
+解析耗时、下载字节数。查询一段时间窗口（如 7d）内各源的 p50 / p95 与按天的趋势，
+窗口最后四分之一的 p50 比之前高出 SLOWDOWN_RATIO 倍时标记为变慢。
+"""
+
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..tools.stage_timer import percentile
+
+# 最近一段的 p50 超过之前 p50 的倍数时标记为变慢
+SLOWDOWN_RATIO = 1.5
+# 前后两段各自至少需要的样本数
+MIN_SAMPLES = 3
+
+_WINDOW = re.compile(r"^(\d+)([dh])$")
+
+
+def parse_window(value: str) -> timedelta:
+    """解析时间窗口：7d（天）/ 12h（小时）"""
+    match = _WINDOW.match(value.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"无效的时间窗口: {value}（如 7d、12h）")
+    amount = int(match.group(1))
+    return timedelta(days=amount) if match.group(2) == "d" else timedelta(hours=amount)
+
+
+class SourceHealthStore:
+    """新闻源健康历史存储"""
+
+    def __init__(self, db_path: str):
+        """初始化存储
+
+        Args:
+            db_path: 数据库路径（与调度器数据库共用）
+        """
+        self.db_path = db_path
+
+    def _get_conn(self):
+        """获取数据库连接"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def init_db(self) -> None:
+        """初始化健康历史表"""
+        conn = self._get_conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS source_health (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_id TEXT NOT NULL,
+                tested_at TIMESTAMP NOT NULL,
+                status TEXT NOT NULL,
+                count INTEGER DEFAULT 0,
+                total_ms REAL,
+                connect_ms REAL,
+                ttfb_ms REAL,
+                parse_ms REAL,
+                bytes INTEGER DEFAULT 0
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_source_health_time
+            ON source_health (source_id, tested_at)
+        """)
+        conn.commit()
+        conn.close()
+
+    def record(self, results: Iterable[Dict[str, Any]], tested_at: Optional[datetime] = None) -> int:
+        """记录一次测试的各源结果（SourceTester.test_single 的返回值）
+
+        Returns:
+            写入的行数
+        """
+        self.init_db()
+        tested_at = (tested_at or datetime.now()).isoformat()
+        rows = []
+        for result in results:
+            timings = result.get("timings") or {}
+            rows.append((
+                result["id"], tested_at, result["status"], result.get("count", 0),
+                timings.get("total_ms"), timings.get("connect_ms"), timings.get("ttfb_ms"),
+                timings.get("parse_ms"), timings.get("bytes", 0),
+            ))
+        conn = self._get_conn()
+        conn.executemany("""
+            INSERT INTO source_health (
+                source_id, tested_at, status, count, total_ms, connect_ms, ttfb_ms, parse_ms, bytes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.commit()
+        conn.close()
+        return len(rows)
+
+    def history(self, window: timedelta, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """时间窗口内各源的延迟统计与趋势
+
+        Returns:
+            {window_start, window_end, slowing, sources: {source_id: {samples, errors, p50_ms, p95_ms,
+            ttfb_p50_ms, connect_p50_ms, avg_bytes, recent_p50_ms, previous_p50_ms, slowing, daily}}}，
+            顶层 slowing 为变慢的新闻源 ID，daily 为按天的 [{date, samples, p50_ms, p95_ms}]
+        """
+        self.init_db()
+        now = now or datetime.now()
+        start = now - window
+        # 窗口最后四分之一与之前比较
+        recent_start = now - window / 4
+
+        conn = self._get_conn()
+        cursor = conn.execute("""
+            SELECT source_id, tested_at, status, total_ms, connect_ms, ttfb_ms, bytes
+            FROM source_health
+            WHERE tested_at >= ? AND tested_at <= ?
+            ORDER BY tested_at
+        """, (start.isoformat(), now.isoformat()))
+        rows = cursor.fetchall()
+        conn.close()
+
+        grouped: Dict[str, List[tuple]] = {}
+        for row in rows:
+            grouped.setdefault(row[0], []).append(row)
+
+        sources = {
+            source_id: self._summarize(source_rows, recent_start)
+            for source_id, source_rows in grouped.items()
+        }
+        return {
+            "window_start": start.isoformat(),
+            "window_end": now.isoformat(),
+            "sources": sources,
+            "slowing": sorted(source_id for source_id, s in sources.items() if s["slowing"]),
+        }
+
+    @staticmethod
+    def _summarize(rows: List[tuple], recent_start: datetime) -> Dict[str, Any]:
+        """单个新闻源的统计（延迟只统计未出错的测试）"""
+        ok = [row for row in rows if row[2] != "error" and row[3] is not None]
+        totals = [row[3] for row in ok]
+        recent = [row[3] for row in ok if datetime.fromisoformat(row[1]) >= recent_start]
+        previous = [row[3] for row in ok if datetime.fromisoformat(row[1]) < recent_start]
+
+        def p50(values: List[float]) -> Optional[float]:
+            return round(percentile(values, 50), 2) if values else None
+
+        daily: Dict[str, List[float]] = {}
+        for row in ok:
+            daily.setdefault(row[1][:10], []).append(row[3])
+
+        recent_p50, previous_p50 = p50(recent), p50(previous)
+        slowing = (
+            len(recent) >= MIN_SAMPLES and len(previous) >= MIN_SAMPLES
+            and recent_p50 > previous_p50 * SLOWDOWN_RATIO
+        )
+        return {
+            "samples": len(rows),
+            "errors": len(rows) - len(ok),
+            "p50_ms": p50(totals),
+            "p95_ms": round(percentile(totals, 95), 2) if totals else None,
+            "ttfb_p50_ms": p50([row[5] for row in ok if row[5] is not None]),
+            "connect_p50_ms": p50([row[4] for row in ok if row[4] is not None]),
+            "avg_bytes": round(sum(row[6] or 0 for row in ok) / len(ok)) if ok else None,
+            "recent_p50_ms": recent_p50,
+            "previous_p50_ms": previous_p50,
+            "slowing": slowing,
+            "daily": [
+                {
+                    "date": day,
+                    "samples": len(values),
+                    "p50_ms": p50(values),
+                    "p95_ms": round(percentile(values, 95), 2),
+                }
+                for day, values in daily.items()
+            ],
+        }
+
+
+@lru_cache(maxsize=1)
+def get_source_health_store() -> SourceHealthStore:
+    """获取健康历史存储（使用调度器数据库）"""
+    from .store import JobExecutionStore
+    return SourceHealthStore(JobExecutionStore().db_path)
@@ -0,0 +1,273 @@
+"""新闻源抓取状态（存入调度器数据库，重启后保留）
+
+每个列表 URL（新闻源 + URL，多频道的源每个频道一条）记录两类状态：
+
+- 校验信息：ETag / Last-Modified 与响应体哈希。抓取时带上 If-None-Match / If-Modified-Since；
+  服务端返回 304 或响应体与上次相同时，该列表跳过解析、去重、筛选。
+- 高水位：已处理条目的最新发布时间。列表按时间倒序的源解析到早于
+  "高水位 - 重叠窗口" 的条目即停止，只处理新增部分（重叠窗口覆盖条目被编辑、乱序的情况）。
+
+状态先记在本次抓取的会话（SourceStateSession）中，抓取结果入库后才提交；
+抓取中途失败时不提交，下次仍会完整处理这些列表。
+"""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from httpx import Response
+
+Key = Tuple[str, str]  # (source_id, url)
+
+
+def body_hash(content: bytes) -> str:
+    """响应体哈希"""
+    return hashlib.sha1(content).hexdigest()
+
+
+class SourceStateStore:
+    """新闻源抓取状态存储"""
+
+    def __init__(self, db_path: str):
+        """初始化存储
+
+        Args:
+            db_path: 数据库路径（与调度器数据库共用）
+        """
+        self.db_path = db_path
+        self._validators: Optional[Dict[Key, Dict[str, Optional[str]]]] = None
+        self._watermarks: Optional[Dict[Key, float]] = None
+        self._lock = threading.Lock()
+
+    def _get_conn(self):
+        """获取数据库连接"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def init_db(self) -> None:
+        """初始化校验信息表、高水位表"""
+        conn = self._get_conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS source_validators (
+                source_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                updated_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (source_id, url)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS source_watermarks (
+                source_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                mark REAL NOT NULL,
+                updated_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (source_id, url)
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def _load(self) -> None:
+        """首次使用时把全部状态读入内存（每个列表 URL 一行，数据量很小）"""
+        if self._validators is not None:
+            return
+        with self._lock:
+            if self._validators is not None:
+                return
+            self.init_db()
+            conn = self._get_conn()
+            validators = conn.execute(
+                "SELECT source_id, url, etag, last_modified, body_hash FROM source_validators"
+            ).fetchall()
+            watermarks = conn.execute("SELECT source_id, url, mark FROM source_watermarks").fetchall()
+            conn.close()
+            self._watermarks = {(row[0], row[1]): row[2] for row in watermarks}
+            self._validators = {
+                (row[0], row[1]): {"etag": row[2], "last_modified": row[3], "body_hash": row[4]}
+                for row in validators
+            }
+
+    def get(self, source_id: str, url: str) -> Optional[Dict[str, Optional[str]]]:
+        """获取列表 URL 的校验信息"""
+        self._load()
+        return self._validators.get((source_id, url))
+
+    def get_watermark(self, source_id: str, url: str) -> Optional[datetime]:
+        """获取列表 URL 的高水位（已处理条目的最新发布时间）"""
+        self._load()
+        mark = self._watermarks.get((source_id, url))
+        return datetime.fromtimestamp(mark) if mark is not None else None
+
+    def save(
+        self,
+        validators: Dict[Key, Dict[str, Optional[str]]],
+        watermarks: Optional[Dict[Key, datetime]] = None
+    ) -> None:
+        """写入（覆盖）校验信息与高水位"""
+        watermarks = watermarks or {}
+        if not validators and not watermarks:
+            return
+        self._load()
+        now = datetime.now().isoformat()
+        marks = {key: value.timestamp() for key, value in watermarks.items()}
+
+        conn = self._get_conn()
+        conn.executemany("""
+            INSERT OR REPLACE INTO source_validators
+                (source_id, url, etag, last_modified, body_hash, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (source_id, url, v["etag"], v["last_modified"], v["body_hash"], now)
+            for (source_id, url), v in validators.items()
+        ])
+        conn.executemany("""
+            INSERT OR REPLACE INTO source_watermarks (source_id, url, mark, updated_at)
+            VALUES (?, ?, ?, ?)
+        """, [(source_id, url, mark, now) for (source_id, url), mark in marks.items()])
+        conn.commit()
+        conn.close()
+
+        with self._lock:
+            self._validators.update(validators)
+            self._watermarks.update(marks)
+
+    def clear(self, source_id: Optional[str] = None) -> int:
+        """清除抓取状态（下次抓取完整下载并解析）
+
+        Args:
+            source_id: 新闻源 ID，None 表示全部
+
+        Returns:
+            清除的列表 URL 条数
+        """
+        self.init_db()
+        conn = self._get_conn()
+        cleared = 0
+        for table in ("source_validators", "source_watermarks"):
+            if source_id:
+                cursor = conn.execute(f"DELETE FROM {table} WHERE source_id = ?", (source_id,))
+            else:
+                cursor = conn.execute(f"DELETE FROM {table}")
+            cleared = max(cleared, cursor.rowcount)
+        conn.commit()
+        conn.close()
+        with self._lock:
+            self._validators = None
+            self._watermarks = None
+        return cleared
+
+    def session(self, conditional: bool = True, incremental: bool = True) -> "SourceStateSession":
+        """开始一次抓取的状态会话
+
+        Args:
+            conditional: 是否使用条件请求 / 响应体哈希跳过未变化的列表
+            incremental: 是否按高水位只解析新增条目
+        """
+        return SourceStateSession(self, conditional, incremental)
+
+
+class SourceStateSession:
+    """一次抓取中的条件请求、变更判断与高水位（提交前不写入存储）"""
+
+    def __init__(self, store: SourceStateStore, conditional: bool = True, incremental: bool = True):
+        self.store = store
+        self.conditional = conditional
+        self.incremental = incremental
+        self._pending: Dict[Key, Dict[str, Optional[str]]] = {}
+        self._pending_marks: Dict[Key, datetime] = {}
+        # source_id -> [列表 URL 数, 未变化数]
+        self._stats: Dict[str, list] = {}
+
+    def headers(self, source_id: str, url: str) -> Dict[str, str]:
+        """条件请求头"""
+        validator = self.store.get(source_id, url) if self.conditional else None
+        if not validator:
+            return {}
+        headers = {}
+        if validator["etag"]:
+            headers["If-None-Match"] = validator["etag"]
+        if validator["last_modified"]:
+            headers["If-Modified-Since"] = validator["last_modified"]
+        return headers
+
+    def unchanged(self, source_id: str, url: str, response: Response) -> bool:
+        """判断列表是否与上次相同（304 或响应体哈希相同）
+
+        有变化时记录新的校验信息，待 commit() 写入。
+        """
+        stats = self._stats.setdefault(source_id, [0, 0])
+        stats[0] += 1
+
+        if not self.conditional:
+            return False
+        if response.status_code == 304:
+            stats[1] += 1
+            return True
+        if not response.is_success:
+            return False
+
+        digest = body_hash(response.content)
+        previous = self.store.get(source_id, url)
+        if previous and previous["body_hash"] == digest:
+            stats[1] += 1
+            return True
+
+        self._pending[(source_id, url)] = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "body_hash": digest,
+        }
+        return False
+
+    def not_modified(self, source_id: str) -> bool:
+        """本次抓取中该新闻源的全部列表均未变化"""
+        total, unchanged = self._stats.get(source_id, (0, 0))
+        return total > 0 and total == unchanged
+
+    def since(self, source_id: str, url: str, overlap: int) -> Optional[datetime]:
+        """增量解析的起点：高水位减去重叠窗口（秒），无高水位时返回 None（完整解析）"""
+        if not self.incremental:
+            return None
+        mark = self.store.get_watermark(source_id, url)
+        return mark - timedelta(seconds=overlap) if mark else None
+
+    def advance(self, source_id: str, url: str, newest: Optional[datetime]) -> None:
+        """记录本次解析到的最新发布时间（只前进不后退）"""
+        if not self.incremental or newest is None:
+            return
+        key = (source_id, url)
+        current = self._pending_marks.get(key) or self.store.get_watermark(source_id, url)
+        if current is None or newest > current:
+            self._pending_marks[key] = newest
+
+    def commit(self, source_ids: Optional[Iterable[str]] = None) -> int:
+        """写入校验信息与高水位（抓取结果入库后调用）
+
+        Args:
+            source_ids: 只提交这些新闻源（如抓取成功的源），None 表示全部
+
+        Returns:
+            写入的列表 URL 条数
+        """
+        pending, marks = self._pending, self._pending_marks
+        if source_ids is not None:
+            wanted = set(source_ids)
+            pending = {key: v for key, v in pending.items() if key[0] in wanted}
+            marks = {key: v for key, v in marks.items() if key[0] in wanted}
+        self.store.save(pending, marks)
+        self._pending, self._pending_marks = {}, {}
+        return len(set(pending) | set(marks))
+
+
+@lru_cache(maxsize=1)
+def get_source_state_store() -> SourceStateStore:
+    """获取抓取状态存储（使用调度器数据库）"""
+    from .store import JobExecutionStore
+    return SourceStateStore(JobExecutionStore().db_path)
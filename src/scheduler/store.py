@@ -10,7 +10,8 @@ from typing import List, Dict, Any, Optional
 class JobExecutionStore:
     """任务执行记录存储
 
-    将每次抓取任务的执行结果存储到 SQLite 数据库
+    将每次抓取任务的执行结果存储到 SQLite 数据库；抓取结果中的 profile（各新闻源、各阶段的耗时统计与计数，
+    见 stage_timer）拆到 job_stage_timings / job_counters 两张表，按执行记录 ID 关联
     """
 
     def __init__(self, db_path: str = None):
@@ -54,6 +55,32 @@ class JobExecutionStore:
             )
         """)
 
+        # 各阶段耗时统计（source 为空表示整次抓取的合计）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_stage_timings (
+                execution_id INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                total_ms REAL NOT NULL,
+                p50_ms REAL NOT NULL,
+                p95_ms REAL NOT NULL,
+                max_ms REAL NOT NULL,
+                PRIMARY KEY (execution_id, source, stage)
+            )
+        """)
+
+        # 计数（HTTP 请求数与字节数、各层去重丢弃数、关键词命中等）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_counters (
+                execution_id INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value INTEGER NOT NULL,
+                PRIMARY KEY (execution_id, source, name)
+            )
+        """)
+
         conn.commit()
         conn.close()
 
@@ -61,7 +88,9 @@ class JobExecutionStore:
         self,
         job_id: str,
         result: Dict[str, Any],
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None
     ) -> int:
         """记录任务执行结果
 
@@ -69,6 +98,8 @@ class JobExecutionStore:
             job_id: 任务ID
             result: 执行结果字典
             error: 错误信息（如果失败）
+            started_at: 开始时间，默认等于结束时间
+            completed_at: 结束时间，默认当前时间
 
         Returns:
             记录ID
@@ -78,8 +109,12 @@ class JobExecutionStore:
         conn = self._get_conn()
         cursor = conn.cursor()
 
-        now = datetime.now()
+        completed_at = completed_at or datetime.now()
+        started_at = started_at or completed_at
         status = "failed" if error else "success"
+        # profile 单独入表，不重复存入 result_json
+        profile = (result or {}).get("profile") or {}
+        summary = {key: value for key, value in result.items() if key != "profile"} if result else None
 
         cursor.execute("""
             INSERT INTO job_executions (
@@ -89,10 +124,10 @@ class JobExecutionStore:
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             job_id,
-            now.isoformat(),
-            now.isoformat(),
+            started_at.isoformat(),
+            completed_at.isoformat(),
             status,
-            json.dumps(result) if result else None,
+            json.dumps(summary) if summary else None,
             error,
             result.get("total_fetched", 0) if result else 0,
             result.get("after_dedup", 0) if result else 0,
@@ -100,6 +135,22 @@ class JobExecutionStore:
         ))
 
         record_id = cursor.lastrowid
+        cursor.executemany("""
+            INSERT INTO job_stage_timings (
+                execution_id, source, stage, count, total_ms, p50_ms, p95_ms, max_ms
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (record_id, row["source"], row["stage"], row["count"],
+             row["total_ms"], row["p50_ms"], row["p95_ms"], row["max_ms"])
+            for row in profile.get("stages", [])
+        ])
+        cursor.executemany("""
+            INSERT INTO job_counters (execution_id, source, name, value) VALUES (?, ?, ?, ?)
+        """, [
+            (record_id, row["source"], row["name"], row["value"])
+            for row in profile.get("counters", [])
+        ])
+
         conn.commit()
         conn.close()
 
@@ -147,6 +198,80 @@ class JobExecutionStore:
             for row in rows
         ]
 
+    def get_profile(self, execution_id: Any) -> Optional[Dict[str, Any]]:
+        """获取一次执行的耗时与计数
+
+        Args:
+            execution_id: 执行记录 ID，或任务 ID（同一任务 ID 取最近一次）
+
+        Returns:
+            {id, job_id, started_at, completed_at, duration_ms, status, error, total, sources}，
+            total 为整次抓取的合计，sources 按新闻源给出 {stages, counters}；不存在时返回 None
+        """
+        self.init_db()
+
+        conn = self._get_conn()
+        cursor = conn.cursor()
+
+        columns = "id, job_id, started_at, completed_at, status, error_message"
+        if str(execution_id).isdigit():
+            cursor.execute(f"SELECT {columns} FROM job_executions WHERE id = ?", (int(execution_id),))
+        else:
+            cursor.execute(f"""
+                SELECT {columns} FROM job_executions WHERE job_id = ?
+                ORDER BY id DESC LIMIT 1
+            """, (execution_id,))
+        row = cursor.fetchone()
+        if row is None:
+            conn.close()
+            return None
+
+        cursor.execute("""
+            SELECT source, stage, count, total_ms, p50_ms, p95_ms, max_ms
+            FROM job_stage_timings WHERE execution_id = ?
+            ORDER BY source, stage
+        """, (row[0],))
+        stage_rows = cursor.fetchall()
+        cursor.execute("""
+            SELECT source, name, value FROM job_counters WHERE execution_id = ?
+            ORDER BY source, name
+        """, (row[0],))
+        counter_rows = cursor.fetchall()
+        conn.close()
+
+        total = {"stages": {}, "counters": {}}
+        sources: Dict[str, Dict[str, Any]] = {}
+
+        def section(source: str) -> Dict[str, Any]:
+            if not source:
+                return total
+            return sources.setdefault(source, {"stages": {}, "counters": {}})
+
+        for source, stage, count, total_ms, p50_ms, p95_ms, max_ms in stage_rows:
+            section(source)["stages"][stage] = {
+                "count": count, "total_ms": total_ms, "p50_ms": p50_ms, "p95_ms": p95_ms, "max_ms": max_ms,
+            }
+        for source, name, value in counter_rows:
+            section(source)["counters"][name] = value
+
+        started_at, completed_at = row[2], row[3]
+        duration_ms = None
+        if started_at and completed_at:
+            elapsed = datetime.fromisoformat(completed_at) - datetime.fromisoformat(started_at)
+            duration_ms = round(elapsed.total_seconds() * 1000, 2)
+
+        return {
+            "id": row[0],
+            "job_id": row[1],
+            "started_at": started_at,
+            "completed_at": completed_at,
+            "duration_ms": duration_ms,
+            "status": row[4],
+            "error": row[5],
+            "total": total,
+            "sources": sources,
+        }
+
     def get_job_status(self) -> Dict[str, Any]:
         """获取任务统计状态
 
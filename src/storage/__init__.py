@@ -1,5 +1,7 @@
 """存储模块"""
 
 from .timeline_db import TimelineDB
+from .shared_state import SharedStateDB
+from .body_cache import BodyCache, get_body_cache
 
-__all__ = ["TimelineDB"]
+__all__ = ["TimelineDB", "SharedStateDB", "BodyCache", "get_body_cache"]
@@ -0,0 +1,209 @@
+"""文章正文缓存（磁盘，按规范化 URL）
+
+同一篇文章的 URL 会在多次抓取中重复出现（重启后、0 点去重缓存清零后、参考消息旧爬虫），
+每次都重新下载、提取正文。正文缓存把提取后的文本与抓取时间存入本地 SQLite：
+
+- 键为规范化 URL（协议、主机小写，去掉 #片段、utm_* 等跟踪参数，查询参数排序）
+- 总大小超过上限时按最近访问时间淘汰（LRU），淘汰到上限的 90%
+- 只缓存成功提取的正文（"获取内容失败"、"无法提取文章内容" 不缓存，下次重试）
+
+不随"清空今日数据"清除：正文与日期无关，清空后重新抓取同一文章仍可命中。
+"""
+
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 不影响内容的跟踪参数
+TRACKING_PARAMS = {"spm", "from", "share_token", "share_from", "fbclid", "gclid"}
+
+# 解析器返回的失败占位文本（不缓存）
+FAILED_PREFIXES = ("获取内容失败", "无法提取文章内容")
+
+
+def normalize_url(url: str) -> str:
+    """规范化 URL（用作缓存键）"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def cacheable(content: Optional[str]) -> bool:
+    """正文是否值得缓存（非空且不是失败占位文本）"""
+    return bool(content) and not content.startswith(FAILED_PREFIXES)
+
+
+class BodyCache:
+    """文章正文缓存"""
+
+    EVICT_RATIO = 0.9  # 超出上限时淘汰到上限的比例
+
+    def __init__(self, db_path: str = "data/db/body_cache.sqlite", max_bytes: int = 200 * 1024 * 1024):
+        """初始化
+
+        Args:
+            db_path: 数据库路径
+            max_bytes: 正文总大小上限（字节，按 UTF-8 计）
+        """
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None
+
+    def _get_conn(self):
+        """获取数据库连接"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(str(self.db_path), timeout=10)
+
+    def init_db(self) -> None:
+        """初始化表结构，读取当前总大小"""
+        if self._total is not None:
+            return
+        conn = self._get_conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS body_cache (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_body_cache_accessed ON body_cache(accessed_at)")
+        conn.commit()
+        self._total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM body_cache").fetchone()[0]
+        conn.close()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, str]:
+        """批量查询，返回 {原始 URL: 正文}（命中的同时更新访问时间）"""
+        self.init_db()
+        keys = {}
+        for url in urls:
+            keys.setdefault(normalize_url(url), []).append(url)
+        if not keys:
+            return {}
+
+        found = {}
+        conn = self._get_conn()
+        key_list = list(keys)
+        for i in range(0, len(key_list), 500):
+            chunk = key_list[i:i + 500]
+            rows = conn.execute(
+                f"SELECT url_key, content FROM body_cache WHERE url_key IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            found.update(rows)
+        if found:
+            now = time.time()
+            conn.executemany(
+                "UPDATE body_cache SET accessed_at = ? WHERE url_key = ?",
+                [(now, key) for key in found]
+            )
+            conn.commit()
+        conn.close()
+
+        result = {url: found[key] for key, originals in keys.items() if key in found for url in originals}
+        with self._lock:
+            self.hits += len(result)
+            self.misses += sum(len(originals) for key, originals in keys.items() if key not in found)
+        return result
+
+    def get(self, url: str) -> Optional[str]:
+        """查询单个 URL 的正文"""
+        return self.get_many([url]).get(url)
+
+    def put_many(self, bodies: Dict[str, str]) -> int:
+        """批量写入 {URL: 正文}（跳过失败占位文本），超出上限时按 LRU 淘汰
+
+        Returns:
+            写入条数
+        """
+        self.init_db()
+        now = time.time()
+        rows = {}
+        for url, content in bodies.items():
+            if cacheable(content):
+                rows[normalize_url(url)] = (url, content, len(content.encode("utf-8")))
+        if not rows:
+            return 0
+
+        conn = self._get_conn()
+        key_list = list(rows)
+        replaced = 0
+        for i in range(0, len(key_list), 500):
+            chunk = key_list[i:i + 500]
+            replaced += conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM body_cache WHERE url_key IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchone()[0]
+        conn.executemany("""
+            INSERT OR REPLACE INTO body_cache (url_key, url, content, size, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [(key, url, content, size, now, now) for key, (url, content, size) in rows.items()])
+        conn.commit()
+
+        with self._lock:
+            self._total += sum(size for _, _, size in rows.values()) - replaced
+            over = self._total > self.max_bytes
+        if over:
+            self._evict(conn)
+        conn.close()
+        return len(rows)
+
+    def _evict(self, conn) -> None:
+        """按访问时间从旧到新淘汰，直到总大小不超过上限的 EVICT_RATIO"""
+        target = int(self.max_bytes * self.EVICT_RATIO)
+        freed, evicted, total = 0, [], self._total
+        for key, size in conn.execute("SELECT url_key, size FROM body_cache ORDER BY accessed_at"):
+            if total - freed <= target:
+                break
+            evicted.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM body_cache WHERE url_key = ?", evicted)
+        conn.commit()
+        with self._lock:
+            self._total -= freed
+        print(f"[BodyCache] 淘汰 {len(evicted)} 条正文，释放 {freed // 1024} KB")
+
+    def clear(self) -> int:
+        """清空缓存，返回删除条数"""
+        self.init_db()
+        conn = self._get_conn()
+        cleared = conn.execute("DELETE FROM body_cache").rowcount
+        conn.commit()
+        conn.close()
+        with self._lock:
+            self._total = 0
+        return cleared
+
+    def stats(self) -> Dict[str, int]:
+        """缓存统计"""
+        self.init_db()
+        conn = self._get_conn()
+        count = conn.execute("SELECT COUNT(*) FROM body_cache").fetchone()[0]
+        conn.close()
+        return {
+            "entries": count,
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+@lru_cache(maxsize=4)
+def get_body_cache(db_path: str = "data/db/body_cache.sqlite", max_mb: int = 200) -> BodyCache:
+    """获取正文缓存（同一路径共用一个实例）"""
+    return BodyCache(db_path, max_mb * 1024 * 1024)
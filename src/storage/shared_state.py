@@ -0,0 +1,223 @@
+"""进程间共享状态存储
+
+多 worker 部署（uvicorn --workers N）时，每个进程都有自己的内存单例。
+本模块用一个本地 SQLite 文件（WAL 模式）在进程间共享：
+- 去重缓存（today_news_cache 的 {url: title}、url_cache 的 URL 集合），按日期隔离
+- 带过期时间的键值缓存（API 响应缓存、最后抓取时间等）
+
+无需 Redis 等外部服务。单进程部署不启用，行为与内存缓存一致。
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..tools.metrics import db_query_seconds
+
+
+class SharedStateDB:
+    """共享状态数据库"""
+
+    # 单条 IN 查询的参数上限（低于 SQLite 默认的变量数限制）
+    IN_BATCH = 500
+
+    def __init__(self, db_path: str = "data/db/shared_state.sqlite"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.init_db()
+
+    @contextmanager
+    def get_connection(self):
+        """获取数据库连接（上下文管理器，连接内的查询耗时计入 db_query 指标）"""
+        with db_query_seconds.time("shared_state"):
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+    def init_db(self) -> None:
+        """初始化数据库表结构"""
+        with self.get_connection() as conn:
+            # WAL 模式：读写互不阻塞，适合多进程并发访问
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dedup_entries (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    cache_date TEXT NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS kv_cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB,
+                    expires_at REAL
+                )
+            """)
+            conn.commit()
+
+    # -------------------------------------------------------------------------
+    # 去重缓存（按 kind 区分，按 cache_date 隔离）
+    # -------------------------------------------------------------------------
+
+    def dedup_add(self, kind: str, entries: Dict[str, Optional[str]], cache_date: str) -> None:
+        """批量添加缓存条目"""
+        if not entries:
+            return
+        with self.get_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO dedup_entries (kind, key, value, cache_date) VALUES (?, ?, ?, ?)",
+                [(kind, key, value, cache_date) for key, value in entries.items()]
+            )
+            conn.commit()
+
+    def dedup_exists(self, kind: str, key: str, cache_date: str) -> bool:
+        """检查条目是否存在"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT 1 FROM dedup_entries WHERE kind = ? AND key = ? AND cache_date = ?",
+                (kind, key, cache_date)
+            )
+            return cursor.fetchone() is not None
+
+    def dedup_exists_many(self, kind: str, keys: Iterable[str], cache_date: str) -> Set[str]:
+        """批量检查条目是否存在（一个连接，按批 IN 查询），返回已存在的 key"""
+        keys = list(dict.fromkeys(keys))
+        found: Set[str] = set()
+        if not keys:
+            return found
+        with self.get_connection() as conn:
+            for i in range(0, len(keys), self.IN_BATCH):
+                chunk = keys[i:i + self.IN_BATCH]
+                cursor = conn.execute(
+                    "SELECT key FROM dedup_entries WHERE kind = ? AND cache_date = ? "
+                    f"AND key IN ({', '.join('?' * len(chunk))})",
+                    (kind, cache_date, *chunk)
+                )
+                found.update(row[0] for row in cursor.fetchall())
+        return found
+
+    def dedup_keys(self, kind: str, cache_date: str) -> List[str]:
+        """获取所有 key"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT key FROM dedup_entries WHERE kind = ? AND cache_date = ?",
+                (kind, cache_date)
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def dedup_values(self, kind: str, cache_date: str) -> List[str]:
+        """获取所有 value"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT value FROM dedup_entries WHERE kind = ? AND cache_date = ?",
+                (kind, cache_date)
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def dedup_count(self, kind: str, cache_date: str) -> int:
+        """获取条目数量"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT COUNT(*) FROM dedup_entries WHERE kind = ? AND cache_date = ?",
+                (kind, cache_date)
+            )
+            return cursor.fetchone()[0]
+
+    def dedup_purge(self, kind: str, keep_date: Optional[str] = None) -> int:
+        """清理条目
+
+        Args:
+            kind: 缓存类型
+            keep_date: 保留该日期的条目（None 表示全部清空）
+
+        Returns:
+            删除的条目数
+        """
+        with self.get_connection() as conn:
+            if keep_date:
+                cursor = conn.execute(
+                    "DELETE FROM dedup_entries WHERE kind = ? AND cache_date != ?",
+                    (kind, keep_date)
+                )
+            else:
+                cursor = conn.execute("DELETE FROM dedup_entries WHERE kind = ?", (kind,))
+            conn.commit()
+            return cursor.rowcount
+
+    # -------------------------------------------------------------------------
+    # 键值缓存（带过期时间）
+    # -------------------------------------------------------------------------
+
+    def kv_get(self, key: str) -> Tuple[int, Optional[bytes]]:
+        """读取键值
+
+        Returns:
+            (剩余秒数, 值)；不存在或已过期返回 (0, None)，永不过期的剩余秒数为 -1
+        """
+        now = time.time()
+        with self.get_connection() as conn:
+            cursor = conn.execute("SELECT value, expires_at FROM kv_cache WHERE key = ?", (key,))
+            row = cursor.fetchone()
+        if row is None:
+            return 0, None
+        value, expires_at = row
+        if expires_at is None:
+            return -1, value
+        if expires_at < now:
+            return 0, None
+        return int(expires_at - now), value
+
+    def kv_set(self, key: str, value, expire: Optional[int] = None) -> None:
+        """写入键值
+
+        Args:
+            expire: 过期秒数（None 或 0 表示永不过期）
+        """
+        expires_at = time.time() + expire if expire else None
+        with self.get_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO kv_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            # 顺带清理已过期的条目
+            conn.execute("DELETE FROM kv_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+            conn.commit()
+
+    def kv_delete(self, key: Optional[str] = None, prefix: Optional[str] = None) -> int:
+        """删除键值（按 key 或按前缀）
+
+        Returns:
+            删除的条目数
+        """
+        with self.get_connection() as conn:
+            if prefix is not None:
+                escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                cursor = conn.execute(
+                    "DELETE FROM kv_cache WHERE key LIKE ? ESCAPE '\\'", (escaped + "%",)
+                )
+            else:
+                cursor = conn.execute("DELETE FROM kv_cache WHERE key = ?", (key,))
+            conn.commit()
+            return cursor.rowcount
+
+
+# 全局共享状态（多 worker 部署时由应用启动时启用）
+_shared_state: Optional[SharedStateDB] = None
+
+
+def enable_shared_state(db_path: str) -> SharedStateDB:
+    """启用进程间共享状态"""
+    global _shared_state
+    _shared_state = SharedStateDB(db_path)
+    return _shared_state
+
+
+def get_shared_state() -> Optional[SharedStateDB]:
+    """获取共享状态（未启用时返回 None）"""
+    return _shared_state
@@ -2,16 +2,26 @@
 
 from datetime import date, datetime, timezone, timedelta
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Sequence, Set
 import sqlite3
 from contextlib import contextmanager
 
 from ..models import Article
+from ..tools.metrics import db_query_seconds
 
 
 class TimelineDB:
     """Timeline 数据库管理（一年一个 DB）"""
 
+    # 可投影的文章列（白名单，列名会直接拼进 SQL）
+    ARTICLE_FIELDS = (
+        "id", "title", "url", "source", "publish_time",
+        "file_path", "tags", "entities", "legend", "created_at",
+    )
+
+    # 列表接口默认返回的精简字段（不含 file_path、tags、entities 等服务端内部字段）
+    LIST_FIELDS = ("id", "title", "url", "source", "publish_time", "legend")
+
     def __init__(self, db_date: Optional[date] = None):
         self.db_date = db_date or date.today()
         # 按年分库：timeline_2025.sqlite
@@ -20,13 +30,14 @@ class TimelineDB:
 
     @contextmanager
     def get_connection(self):
-        """获取数据库连接（上下文管理器）"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """获取数据库连接（上下文管理器，连接内的查询耗时计入 db_query 指标）"""
+        with db_query_seconds.time("timeline"):
+            conn = sqlite3.connect(str(self.db_path))
+            conn.row_factory = sqlite3.Row
+            try:
+                yield conn
+            finally:
+                conn.close()
 
     def init_db(self) -> None:
         """初始化数据库表结构"""
@@ -200,7 +211,8 @@ class TimelineDB:
             return dict(row) if row else None
 
     def list_articles(self, limit: int = 100, offset: int = 0, legend: str = None,
-                      start_date: str = None, end_date: str = None) -> List[dict]:
+                      start_date: str = None, end_date: str = None,
+                      fields: Optional[Sequence[str]] = None) -> List[dict]:
         """列出文章
 
         Args:
@@ -209,10 +221,12 @@ class TimelineDB:
             legend: 筛选传奇人物（可选）
             start_date: 开始日期 YYYY-MM-DD（可选）
             end_date: 结束日期 YYYY-MM-DD（可选）
+            fields: 投影字段（可选），None 表示返回全部列
         """
         with self.get_connection() as conn:
             # 检测使用哪个列名
             time_column = self._get_time_column(conn)
+            select_sql = self._select_sql(time_column, fields)
 
             # 构建 WHERE 条件
             where_conditions = []
@@ -235,50 +249,54 @@ class TimelineDB:
                 where_sql = " AND ".join(where_conditions)
                 params.extend([limit, offset])
                 sql = f"""
-                    SELECT * FROM articles
+                    SELECT {select_sql} FROM articles
                     WHERE {where_sql}
                     ORDER BY {time_column} DESC
                     LIMIT ? OFFSET ?
                 """
             else:
                 sql = f"""
-                    SELECT * FROM articles
+                    SELECT {select_sql} FROM articles
                     ORDER BY {time_column} DESC
                     LIMIT ? OFFSET ?
                 """
                 params = [limit, offset]
 
             cursor = conn.execute(sql, params)
-            return [self._normalize_article(dict(row)) for row in cursor.fetchall()]
+            return self._rows_to_dicts(cursor, fields)
 
-    def list_articles_latest(self, limit: int = 100, legend: str = None) -> List[dict]:
+    def list_articles_latest(self, limit: int = 100, legend: str = None,
+                             fields: Optional[Sequence[str]] = None) -> List[dict]:
         """获取最新新闻（不限日期）
 
         Args:
             limit: 返回条数
             legend: 筛选传奇人物（可选）
+            fields: 投影字段（可选），None 表示返回全部列
         """
         with self.get_connection() as conn:
             time_column = self._get_time_column(conn)
+            select_sql = self._select_sql(time_column, fields)
 
             if legend:
                 cursor = conn.execute(f"""
-                    SELECT * FROM articles
+                    SELECT {select_sql} FROM articles
                     WHERE legend = ?
                     ORDER BY {time_column} DESC
                     LIMIT ?
                 """, (legend, limit))
             else:
                 cursor = conn.execute(f"""
-                    SELECT * FROM articles
+                    SELECT {select_sql} FROM articles
                     ORDER BY {time_column} DESC
                     LIMIT ?
                 """, (limit,))
-            return [self._normalize_article(dict(row)) for row in cursor.fetchall()]
+            return self._rows_to_dicts(cursor, fields)
 
     @staticmethod
     def list_articles_multi_year(years: int = 2, limit: int = 100, legend: str = None,
-                                start_date: str = None, end_date: str = None) -> List[dict]:
+                                start_date: str = None, end_date: str = None,
+                                fields: Optional[Sequence[str]] = None) -> List[dict]:
         """列出多年文章（跨库查询）
 
         Args:
@@ -287,6 +305,7 @@ class TimelineDB:
             legend: 筛选传奇人物（可选）
             start_date: 开始日期 YYYY-MM-DD（可选，默认今日）
             end_date: 结束日期 YYYY-MM-DD（可选）
+            fields: 投影字段（可选），None 表示返回全部列
 
         Returns:
             文章列表，按时间倒序
@@ -323,11 +342,17 @@ class TimelineDB:
 
         params.append(limit * 2)
 
+        # 跨库合并需要按时间排序，投影时临时带上时间列
+        time_column = TimelineDB._detect_time_column_for_db(db_dir / f'timeline_{query_years[0]}.sqlite')
+        query_fields = fields
+        if fields is not None and "publish_time" not in fields:
+            query_fields = tuple(fields) + ("publish_time",)
+
         where_sql = " AND ".join(where_conditions)
         sql = f"""
-            SELECT * FROM articles
+            SELECT {TimelineDB._select_sql(time_column, query_fields)} FROM articles
             WHERE {where_sql}
-            ORDER BY {TimelineDB._detect_time_column_for_db(db_dir / f'timeline_{query_years[0]}.sqlite')} DESC
+            ORDER BY {time_column} DESC
             LIMIT ?
         """
 
@@ -337,7 +362,10 @@ class TimelineDB:
             db = TimelineDB(temp_date)
             with db.get_connection() as conn:
                 cursor = conn.execute(sql, params)
-                articles = [dict(row) for row in cursor.fetchall()]
+                if query_fields is None:
+                    articles = [dict(row) for row in cursor.fetchall()]
+                else:
+                    articles = TimelineDB._rows_to_dicts(cursor, query_fields)
                 all_articles.extend(articles)
 
         # 按时间排序并限制数量
@@ -346,7 +374,12 @@ class TimelineDB:
         else:
             time_key = 'timestamp'
         all_articles.sort(key=lambda x: x[time_key], reverse=True)
-        return all_articles[:limit]
+        all_articles = all_articles[:limit]
+
+        if query_fields is not fields:
+            for article in all_articles:
+                article.pop("publish_time", None)
+        return all_articles
 
     def article_exists(self, url: str) -> bool:
         """检查文章是否已存在"""
@@ -357,6 +390,22 @@ class TimelineDB:
             )
             return cursor.fetchone() is not None
 
+    def existing_urls(self, urls: Sequence[str]) -> Set[str]:
+        """批量检查文章是否已存在（一个连接，按批 IN 查询），返回已存在的 URL"""
+        urls = list(dict.fromkeys(urls))
+        found: Set[str] = set()
+        if not urls:
+            return found
+        with self.get_connection() as conn:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                cursor = conn.execute(
+                    f"SELECT url FROM articles WHERE url IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                found.update(row[0] for row in cursor.fetchall())
+        return found
+
     def clear_all(self) -> int:
         """清空所有文章数据
 
@@ -382,13 +431,68 @@ class TimelineDB:
         try:
             conn = sqlite3.connect(str(db_path))
             cursor = conn.execute("PRAGMA table_info(articles)")
-            columns = {row["name"] for row in cursor.fetchall()}
+            columns = {row[1] for row in cursor.fetchall()}  # row[1] 为列名
             conn.close()
             return "publish_time" if "publish_time" in columns else "timestamp"
         except Exception:
             return "timestamp"
 
-    def _normalize_article(self, article: dict) -> dict:
+    @classmethod
+    def parse_fields(cls, fields: Optional[str]) -> Optional[tuple]:
+        """解析 ?fields= 参数
+
+        Args:
+            fields: 逗号分隔的字段名；为空返回精简列表字段，"*" 返回全部列
+
+        Returns:
+            投影字段元组，None 表示全部列
+
+        Raises:
+            ValueError: 包含未知字段
+        """
+        if not fields:
+            return cls.LIST_FIELDS
+        if fields.strip() == "*":
+            return None
+
+        names = []
+        for name in fields.split(","):
+            name = name.strip()
+            if not name or name in names:
+                continue
+            if name not in cls.ARTICLE_FIELDS:
+                raise ValueError(f"未知字段: {name}")
+            names.append(name)
+
+        if not names:
+            return cls.LIST_FIELDS
+        return tuple(names)
+
+    @staticmethod
+    def _select_sql(time_column: str, fields: Optional[Sequence[str]]) -> str:
+        """构建 SELECT 列清单（旧库的 timestamp 列映射为 publish_time）"""
+        if fields is None:
+            return "*"
+        columns = []
+        for name in fields:
+            if name == "publish_time" and time_column != "publish_time":
+                columns.append(f"{time_column} AS publish_time")
+            else:
+                columns.append(name)
+        return ", ".join(columns)
+
+    @staticmethod
+    def _rows_to_dicts(cursor, fields: Optional[Sequence[str]]) -> List[dict]:
+        """将查询结果转换为字典列表
+
+        投影查询直接按字段名打包，跳过 _normalize_article 的新旧列名补齐
+        """
+        if fields is None:
+            return [TimelineDB._normalize_article(dict(row)) for row in cursor.fetchall()]
+        return [dict(zip(fields, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _normalize_article(article: dict) -> dict:
         """标准化文章数据（兼容新旧列名）"""
         # 同时兼容 publish_time 和 timestamp
         if "publish_time" not in article and "timestamp" in article:
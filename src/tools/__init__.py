@@ -1,5 +1,7 @@
 """工具模块"""
 
 from .title_cleaner import TitleCleaner
+from .singleflight import SingleFlight, single_flight
+from .parse_executor import ParseExecutor, parse_executor
 
-__all__ = ["TitleCleaner"]
+__all__ = ["TitleCleaner", "SingleFlight", "single_flight", "ParseExecutor", "parse_executor"]
@@ -0,0 +1,332 @@
+"""HTML 提取函数（在解析进程池中执行）
+
+所有函数都是模块级纯函数：输入原始字节 + 编码，输出普通的 str / dict / list，
+可被 pickle 传给子进程，也可直接同步调用。
+本模块只依赖 bs4 / lxml 与标准库，子进程导入开销小（不要在这里导入 src 下的其他模块）。
+
+HTML 引擎可插拔：
+- lxml：C 实现的解析器，CSS 选择器预编译为 XPath 并缓存（需要 lxml + cssselect）
+- bs4：BeautifulSoup + html.parser，纯 Python，作为兜底
+
+默认（auto）优先使用 lxml，依赖缺失时回退到 bs4；通过 set_engine() 切换。
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    from cssselect import GenericTranslator
+except ImportError:  # pragma: no cover - 依赖缺失时使用 bs4
+    etree = None
+
+Markup = Union[bytes, str]
+
+# 正文容器：(标签, class)，class 为 None 表示只按标签匹配
+Container = Tuple[str, Optional[str]]
+
+ENGINES = ("auto", "lxml", "bs4")
+
+
+def make_soup(markup: Markup, encoding: Optional[str] = None) -> BeautifulSoup:
+    """构造 BeautifulSoup（字节输入时按响应编码解码）"""
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, "html.parser", from_encoding=encoding)
+    return BeautifulSoup(markup, "html.parser")
+
+
+class SoupEngine:
+    """BeautifulSoup 引擎（兜底）"""
+
+    name = "bs4"
+
+    @staticmethod
+    def _join_paragraphs(paragraphs) -> str:
+        return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
+
+    def paragraphs(
+        self,
+        markup: Markup,
+        encoding: Optional[str],
+        containers: Sequence[Container],
+        body_fallback: int,
+    ) -> Optional[str]:
+        soup = make_soup(markup, encoding)
+
+        content_div = None
+        for tag, class_ in containers:
+            content_div = soup.find(tag, class_=class_) if class_ else soup.find(tag)
+            if content_div:
+                break
+
+        if content_div:
+            paragraphs = content_div.find_all("p")
+            if paragraphs:
+                return self._join_paragraphs(paragraphs)
+
+        if body_fallback:
+            body = soup.find("body")
+            if body:
+                paragraphs = body.find_all("p")
+                if paragraphs:
+                    return self._join_paragraphs(paragraphs[:body_fallback])
+
+        return None
+
+    def items(
+        self,
+        markup: Markup,
+        encoding: Optional[str],
+        selector: str,
+        fields: Dict[str, str],
+        limit: Optional[int],
+    ) -> List[Dict[str, Optional[str]]]:
+        soup = make_soup(markup, encoding)
+        items = soup.select(selector)
+        if limit is not None:
+            items = items[:limit]
+
+        results = []
+        for item in items:
+            row = {}
+            for field_name, field_selector in fields.items():
+                # 处理属性选择器，如 "a@href"
+                if "@" in field_selector:
+                    elem_selector, attr = field_selector.split("@", 1)
+                    elem = item.select_one(elem_selector)
+                    value = elem.get(attr) if elem else None
+                else:
+                    elem = item.select_one(field_selector)
+                    value = elem.get_text(strip=True) if elem else None
+                row[field_name] = value
+            results.append(row)
+
+        return results
+
+
+@lru_cache(maxsize=256)
+def _compile_css(selector: str, prefix: str = "descendant-or-self::"):
+    """CSS 选择器预编译为 XPath（按选择器缓存）"""
+    return etree.XPath(GenericTranslator().css_to_xpath(selector, prefix=prefix))
+
+
+@lru_cache(maxsize=256)
+def _compile_container(tag: str, class_: Optional[str]):
+    """正文容器 (标签, class) 预编译为 XPath，class 按空白分隔的单词匹配（同 bs4 的 class_）"""
+    if class_:
+        return etree.XPath(
+            f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_} ')]"
+        )
+    return etree.XPath(f"//{tag}")
+
+
+@lru_cache(maxsize=1)
+def _compile_text():
+    """元素内可见文本节点（bs4 get_text 同样跳过 script / style / template 内容）"""
+    return etree.XPath(
+        "descendant-or-self::text()"
+        "[not(ancestor::script) and not(ancestor::style) and not(ancestor::template)]"
+    )
+
+
+@lru_cache(maxsize=16)
+def _html_parser(encoding: Optional[str]):
+    """按编码缓存 lxml 解析器"""
+    return lxml_html.HTMLParser(encoding=encoding)
+
+
+class LxmlEngine:
+    """lxml 引擎（预编译 XPath）"""
+
+    name = "lxml"
+
+    @staticmethod
+    def _parse(markup: Markup, encoding: Optional[str]):
+        """解析文档，空文档（含只有注释的文档）返回 None"""
+        if not markup or not markup.strip():
+            return None
+        if isinstance(markup, str) and markup.lstrip().startswith("<?xml"):
+            # lxml 不接受带编码声明的 str，按 UTF-8 字节解析（bs4 直接忽略声明）
+            markup, encoding = markup.encode("utf-8"), "utf-8"
+        try:
+            if isinstance(markup, bytes):
+                return lxml_html.document_fromstring(markup, parser=_html_parser(encoding))
+            return lxml_html.document_fromstring(markup)
+        except etree.ParserError:
+            return None
+
+    @staticmethod
+    def _text(element) -> str:
+        """等价于 bs4 的 get_text(strip=True)：各文本节点去空白后拼接（不含注释与脚本/样式）"""
+        return "".join(s.strip() for s in _compile_text()(element))
+
+    def _join_paragraphs(self, paragraphs) -> str:
+        texts = (self._text(p) for p in paragraphs)
+        return "\n\n".join(t for t in texts if t)
+
+    def paragraphs(
+        self,
+        markup: Markup,
+        encoding: Optional[str],
+        containers: Sequence[Container],
+        body_fallback: int,
+    ) -> Optional[str]:
+        root = self._parse(markup, encoding)
+        if root is None:
+            return None
+        find_p = _compile_css("p", "descendant::")
+
+        content_div = None
+        for tag, class_ in containers:
+            found = _compile_container(tag, class_)(root)
+            if found:
+                content_div = found[0]
+                break
+
+        if content_div is not None:
+            paragraphs = find_p(content_div)
+            if paragraphs:
+                return self._join_paragraphs(paragraphs)
+
+        if body_fallback:
+            body = root.find("body")
+            if body is not None:
+                paragraphs = find_p(body)
+                if paragraphs:
+                    return self._join_paragraphs(paragraphs[:body_fallback])
+
+        return None
+
+    def items(
+        self,
+        markup: Markup,
+        encoding: Optional[str],
+        selector: str,
+        fields: Dict[str, str],
+        limit: Optional[int],
+    ) -> List[Dict[str, Optional[str]]]:
+        root = self._parse(markup, encoding)
+        if root is None:
+            return []
+        items = _compile_css(selector)(root)
+        if limit is not None:
+            items = items[:limit]
+
+        # 字段选择器在条目内部查找（不含条目自身，同 bs4 的 select_one）
+        compiled = {}
+        for field_name, field_selector in fields.items():
+            elem_selector, _, attr = field_selector.partition("@")
+            compiled[field_name] = (_compile_css(elem_selector, "descendant::"), attr or None)
+
+        results = []
+        for item in items:
+            row = {}
+            for field_name, (find, attr) in compiled.items():
+                found = find(item)
+                if not found:
+                    value = None
+                elif attr:
+                    value = found[0].get(attr)
+                else:
+                    value = self._text(found[0])
+                row[field_name] = value
+            results.append(row)
+
+        return results
+
+
+_engine: Union[SoupEngine, LxmlEngine] = LxmlEngine() if etree is not None else SoupEngine()
+
+
+def set_engine(name: str = "auto") -> str:
+    """切换 HTML 引擎（进程池子进程通过 initializer 调用）
+
+    Args:
+        name: auto | lxml | bs4
+
+    Returns:
+        实际使用的引擎名（lxml 依赖缺失时回退为 bs4）
+    """
+    global _engine
+    if name not in ENGINES:
+        raise ValueError(f"未知的 HTML 引擎: {name}，可选: {', '.join(ENGINES)}")
+    if name == "bs4" or etree is None:
+        _engine = SoupEngine()
+    else:
+        _engine = LxmlEngine()
+    return _engine.name
+
+
+def get_engine_name() -> str:
+    """当前 HTML 引擎名"""
+    return _engine.name
+
+
+def extract_paragraphs(
+    markup: Markup,
+    encoding: Optional[str] = None,
+    containers: Sequence[Container] = (),
+    body_fallback: int = 0,
+) -> Optional[str]:
+    """提取正文段落
+
+    按顺序查找第一个存在的正文容器，拼接其中的 <p> 文本。
+
+    Args:
+        markup: 页面原始内容
+        encoding: 响应编码
+        containers: 正文容器候选列表，如 [("div", "article-content"), ("article", None)]
+        body_fallback: 找不到容器时，取 <body> 下前 N 个 <p>（0 表示不回退）
+
+    Returns:
+        正文文本；提取不到返回 None
+    """
+    return _engine.paragraphs(markup, encoding, containers, body_fallback)
+
+
+def extract_items(
+    markup: Markup,
+    encoding: Optional[str] = None,
+    selector: str = "",
+    fields: Optional[Dict[str, str]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Optional[str]]]:
+    """按 CSS 选择器提取列表项
+
+    Args:
+        markup: 页面原始内容
+        encoding: 响应编码
+        selector: 列表项选择器
+        fields: 字段映射，如 {"title": ".title", "url": "a@href"}（@ 后为属性名）
+        limit: 最多提取的条数
+
+    Returns:
+        [{字段: 值}, ...]
+    """
+    return _engine.items(markup, encoding, selector, fields or {}, limit)
+
+
+def extract_json_var(markup: Markup, encoding: Optional[str] = None, pattern: str = "") -> Optional[Any]:
+    """用正则从页面脚本中提取 JSON 变量
+
+    Args:
+        markup: 页面原始内容
+        encoding: 响应编码
+        pattern: 正则，第 1 个分组为 JSON 文本
+
+    Returns:
+        解析后的对象；匹配失败返回 None
+
+    Raises:
+        json.JSONDecodeError: 匹配到的内容不是合法 JSON
+    """
+    text = markup.decode(encoding or "utf-8", errors="replace") if isinstance(markup, bytes) else markup
+    match = re.search(pattern, text)
+    if not match:
+        return None
+    return json.loads(match.group(1))
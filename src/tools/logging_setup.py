@@ -0,0 +1,94 @@
+"""日志配置
+
+各模块使用 logging.getLogger(__name__)（src.* 命名空间）。setup_logging 按 LoggingConfig 设置级别：
+日志记录经 QueueHandler 放入队列，由后台线程（QueueListener）写到控制台与 log_dir 下的文件，
+调用方不因控制台 / 磁盘 I/O 阻塞。逐条文章的输出为 DEBUG 级别且参数延迟格式化，
+INFO 级别下不做逐条的字符串格式化。
+
+- text：时间 级别 logger 消息
+- json：每行一个 JSON 对象，调用时 extra= 传入的字段一并输出
+
+未调用 setup_logging 时（测试、基准测试）按 logging 默认行为，只输出 WARNING 及以上。
+"""
+
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+from ..config.models import LoggingConfig
+
+LOGGER_NAME = "src"
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志一行 JSON"""
+
+    # LogRecord 自带的属性，其余属性来自 extra=
+    RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update({key: value for key, value in vars(record).items() if key not in self.RESERVED})
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def setup_logging(config: Optional[LoggingConfig] = None) -> logging.Logger:
+    """按配置设置 src.* 日志（重复调用时替换之前的设置）
+
+    Args:
+        config: 日志配置，默认使用 LoggingConfig 默认值
+
+    Returns:
+        src 命名空间的 logger
+    """
+    global _listener
+    config = config or LoggingConfig()
+    stop_logging()
+
+    formatter = JsonFormatter() if config.format == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if config.save_logs:
+        log_dir = Path(config.log_dir)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        handlers.append(RotatingFileHandler(
+            log_dir / "app.log", maxBytes=config.max_mb * 1024 * 1024,
+            backupCount=config.backup_count, encoding="utf-8",
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers)
+    _listener.start()
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers = [QueueHandler(log_queue)]
+    logger.setLevel(config.level.upper())
+    logger.propagate = False
+    return logger
+
+
+def stop_logging() -> None:
+    """停止后台写日志线程（写完队列中剩余的日志）"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    logging.getLogger(LOGGER_NAME).handlers = []
@@ -0,0 +1,220 @@
+"""进程内指标（Prometheus 文本格式）
+
+不依赖 prometheus_client：指标按标签值保存在普通的 dict / list 中，记录一次观测只是几次列表元素累加，
+只有首次出现新的标签组合时才加锁。多线程下偶尔丢失一次累加是可接受的（指标用于观察趋势）。
+计量值在采集时才计算的指标（如缓存大小）通过 collect 回调给出。
+
+每个 worker 进程各自一份指标，由 Prometheus 分别采集。
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 默认分桶（秒）：覆盖接口请求与新闻源抓取
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# 数据库查询分桶（秒）
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """指标基类：按标签值保存序列"""
+
+    TYPE = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self) -> List[float]:
+        return [0]
+
+    def _get(self, label_values: Tuple[str, ...]) -> List[float]:
+        series = self._series.get(label_values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(label_values, self._new_series())
+        return series
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series = {}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.TYPE}"]
+        for label_values, series in list(self._series.items()):
+            lines.extend(self._render_series(label_values, series))
+        return lines
+
+    def _render_series(self, label_values: Tuple[str, ...], series: List[float]) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(series[0])}"]
+
+
+class Counter(_Metric):
+    """计数器（只增不减）"""
+
+    TYPE = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._get(label_values)[0] += amount
+
+    def value(self, *label_values: str) -> float:
+        series = self._series.get(label_values)
+        return series[0] if series else 0
+
+
+class Gauge(_Metric):
+    """计量值：set() 设置，或由 collect 回调在采集时给出"""
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 collect: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, labels)
+        self.collect = collect
+
+    def set(self, value: float, *label_values: str) -> None:
+        self._get(label_values)[0] = value
+
+    def value(self, *label_values: str) -> Optional[float]:
+        series = self._series.get(label_values)
+        return series[0] if series else None
+
+    def render(self) -> List[str]:
+        if self.collect is not None:
+            try:
+                self.set(self.collect())
+            except Exception as e:
+                logger.warning("采集 %s 失败: %s", self.name, e)
+        return super().render()
+
+
+class Histogram(_Metric):
+    """直方图：序列为 [各分桶计数..., +Inf 计数, 合计, 次数]，分桶计数在输出时累加"""
+
+    TYPE = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self) -> List[float]:
+        return [0] * (len(self.buckets) + 3)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._get(label_values)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, *label_values: str):
+        """记录一段代码的耗时（秒，异常时同样记录）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return series[-1] if series else 0
+
+    def _render_series(self, label_values: Tuple[str, ...], series: List[float]) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, bucket in zip(self.buckets + (float("inf"),), series):
+            cumulative += bucket
+            le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+            labels = _format_labels(self.labels, label_values, f'le="{le}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labels, label_values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(float(series[-2]))}")
+        lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表（同名指标只注册一次）"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = (),
+              collect: Optional[Callable[[], float]] = None) -> Gauge:
+        return self._register(Gauge(name, help, labels, collect))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus 文本格式（text/plain; version=0.0.4）"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 全局注册表
+registry = MetricsRegistry()
+
+# 接口请求耗时（route 为路由模板，未匹配的请求记为 unmatched）
+http_request_seconds = registry.histogram(
+    "sf_http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+# 单个新闻源一次抓取的耗时（列表 + 正文）
+crawl_source_seconds = registry.histogram(
+    "sf_crawl_source_duration_seconds", "Crawl duration per news source", ("source", "status")
+)
+# 数据库连接内的查询耗时
+db_query_seconds = registry.histogram(
+    "sf_db_query_duration_seconds", "SQLite query latency", ("db",), buckets=DB_BUCKETS
+)
+# 接口响应缓存命中情况
+api_cache_requests = registry.counter(
+    "sf_api_cache_requests_total", "API response cache lookups", ("result",)
+)
+# keywords 配置加载耗时
+keywords_load_seconds = registry.gauge(
+    "sf_keywords_load_seconds", "Time spent loading the keywords config"
+)
+# 最近一次成功抓取的时间（Unix 时间戳）
+last_crawl_success = registry.gauge(
+    "sf_last_crawl_success_timestamp_seconds", "Unix time of the last successful crawl"
+)
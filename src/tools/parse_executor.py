@@ -0,0 +1,125 @@
+"""解析执行器
+
+HTML 解析（BeautifulSoup / 正则）是纯 CPU 工作，直接在 asyncio 事件循环中执行会
+阻塞同一循环上的 FastAPI 请求。解析器只负责 I/O，把原始字节交给执行器：
+
+    content = await parse_executor.run(extract_paragraphs, resp.content, resp.encoding, CONTAINERS)
+
+执行模式（crawler_config.yaml 的 parse.executor）：
+- process：进程池（默认），解析不占用主进程 GIL
+- thread：线程池，不阻塞事件循环，但与 API 共享 GIL
+- inline：在事件循环中直接执行（调试用，等同旧行为）
+
+进程池不可用（如子进程崩溃）时自动降级为线程池。
+
+HTML 引擎（parse.html_engine：auto | lxml | bs4）在创建执行池时设置，
+进程池模式下通过 initializer 在每个子进程中设置。
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from . import html_extract
+
+EXECUTOR_MODES = ("process", "thread", "inline")
+
+
+class ParseExecutor:
+    """解析执行器（进程池 / 线程池 / 内联）"""
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        html_engine: Optional[str] = None
+    ):
+        """初始化执行器
+
+        Args:
+            mode: process | thread | inline，None 表示首次使用时从配置读取
+            max_workers: 最大工作进程/线程数，None 表示从配置读取
+            html_engine: auto | lxml | bs4，None 表示从配置读取
+        """
+        if mode is not None and mode not in EXECUTOR_MODES:
+            raise ValueError(f"未知的解析执行模式: {mode}，可选: {', '.join(EXECUTOR_MODES)}")
+        if html_engine is not None and html_engine not in html_extract.ENGINES:
+            raise ValueError(f"未知的 HTML 引擎: {html_engine}，可选: {', '.join(html_extract.ENGINES)}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.html_engine = html_engine
+        self._pool: Optional[Executor] = None
+        self._configured = False
+
+    def _load_config(self) -> None:
+        """从 crawler_config.yaml 读取未指定的参数"""
+        if None not in (self.mode, self.max_workers, self.html_engine):
+            return
+        try:
+            from ..config import ConfigReader
+            parse_config = ConfigReader("config").load_crawler_config().parse
+            self.mode = self.mode or parse_config.executor
+            self.max_workers = self.max_workers or parse_config.max_workers
+            self.html_engine = self.html_engine or parse_config.html_engine
+        except Exception as e:
+            print(f"[ParseExecutor] 读取配置失败，使用进程池默认值: {e}")
+            self.mode = self.mode or "process"
+            self.max_workers = self.max_workers or 2
+            self.html_engine = self.html_engine or "auto"
+
+    def _get_pool(self) -> Optional[Executor]:
+        """获取（懒创建）执行池，inline 模式返回 None"""
+        if not self._configured:
+            self._load_config()
+            # 线程池 / 内联模式在本进程执行，直接设置引擎
+            engine = html_extract.set_engine(self.html_engine)
+            if self.mode == "process":
+                # spawn：避免在含线程的事件循环进程中 fork，Windows / Linux 行为一致
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=html_extract.set_engine,
+                    initargs=(self.html_engine,),
+                )
+            elif self.mode == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="parse")
+            self._configured = True
+            print(f"[ParseExecutor] 解析执行器: {self.mode}, HTML 引擎: {engine}")
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """在执行池中运行解析函数
+
+        Args:
+            func: 模块级纯函数（进程池模式下需可 pickle）
+            *args: 位置参数（原始字节、编码、选择器等）
+
+        Returns:
+            func 的返回值
+        """
+        pool = self._get_pool()
+        if pool is None:
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            print("[ParseExecutor] 进程池已损坏，降级为线程池")
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="parse")
+            self.mode = "thread"
+            pool.shutdown(wait=False)
+            return await loop.run_in_executor(self._pool, func, *args)
+
+    def shutdown(self) -> None:
+        """关闭执行池（应用退出时调用）"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._configured = False
+
+
+# 全局单例
+parse_executor = ParseExecutor()
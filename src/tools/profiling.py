@@ -0,0 +1,287 @@
+"""抓取与接口请求的性能剖析
+
+三种模式，输出标准格式的文件：
+- cpu：cProfile，输出 .pstats（python -m pstats、snakeviz 等可直接打开）
+- wall：后台线程按固定间隔对各线程的调用栈采样（含等待 I/O 的时间，事件循环空闲时停在 select），
+  输出 speedscope JSON（https://www.speedscope.app 打开，每个线程一个 profile）
+- alloc：tracemalloc 分配快照，输出 .tracemalloc（tracemalloc.Snapshot.load 读取）
+
+cpu / alloc 只覆盖当前进程（解析进程池中的工作进程不在内）。
+
+用法：
+- python -m src.crawl_cli --profile cpu：剖析一次完整抓取
+- POST /admin/profile?route=/api/articles&count=5&mode=cpu：剖析该路由接下来的 5 个请求，
+  文件写到 data/profiles/，GET /admin/profile 查看状态与已生成的文件
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cpu", "wall", "alloc")
+EXTENSIONS = {"cpu": ".pstats", "wall": ".speedscope.json", "alloc": ".tracemalloc"}
+PROFILE_DIR = "data/profiles"
+# tracemalloc 保存的调用栈深度
+ALLOC_FRAMES = 25
+
+
+class WallSampler:
+    """按固定间隔对各线程的调用栈采样（墙钟时间）"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.frames: List[Dict[str, Any]] = []
+        self._frame_index: Dict[Tuple[str, str, int], int] = {}
+        # {线程 ID: [(调用栈（帧序号，外层在前）, 权重秒)]}
+        self.samples: Dict[int, List[Tuple[List[int], float]]] = {}
+        self.thread_names: Dict[int, str] = {}
+        self.started = 0.0
+        self.stopped = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _frame(self, frame) -> int:
+        code = frame.f_code
+        key = (getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+        return index
+
+    def _sample(self, weight: float) -> None:
+        sampler = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == sampler:
+                continue
+            if ident not in self.thread_names:
+                self.thread_names.update({t.ident: t.name for t in threading.enumerate()})
+            stack = []
+            while frame is not None:
+                stack.append(self._frame(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples.setdefault(ident, []).append((stack, weight))
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="wall-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.stopped = time.perf_counter()
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        """speedscope 文件格式（sampled，每个线程一个 profile，单位秒）"""
+        profiles = []
+        for ident, samples in self.samples.items():
+            profiles.append({
+                "type": "sampled",
+                "name": self.thread_names.get(ident, str(ident)),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weight for _, weight in samples), 6),
+                "samples": [stack for stack, _ in samples],
+                "weights": [round(weight, 6) for _, weight in samples],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": self.frames},
+            "profiles": profiles,
+            "name": name,
+            "exporter": "singularity-front",
+        }
+
+    def top(self, limit: int = 20) -> List[Tuple[str, str, float]]:
+        """各线程栈顶函数（自身耗时）排行：[(线程, 函数, 秒)]"""
+        totals: Dict[Tuple[str, str], float] = {}
+        for ident, samples in self.samples.items():
+            thread = self.thread_names.get(ident, str(ident))
+            for stack, weight in samples:
+                if stack:
+                    frame = self.frames[stack[-1]]
+                    key = (thread, f"{frame['name']} ({Path(frame['file']).name}:{frame['line']})")
+                    totals[key] = totals.get(key, 0.0) + weight
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(thread, function, seconds) for (thread, function), seconds in ranked]
+
+
+def default_path(mode: str, name: str, directory: str = PROFILE_DIR) -> Path:
+    """剖析文件路径：{directory}/{name}_{mode}_{时间}{扩展名}"""
+    slug = re.sub(r"[^\w.-]+", "_", name).strip("_") or "root"
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return Path(directory) / f"{slug}_{mode}_{stamp}{EXTENSIONS[mode]}"
+
+
+@contextmanager
+def profiled(mode: str, path: Path, name: str = "profile"):
+    """在代码块（可含 await）期间剖析，结束后写入 path
+
+    Yields:
+        剖析器：cpu 为 cProfile.Profile，wall 为 WallSampler，alloc 为 None（结束后读取 path）
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"未知的剖析模式: {mode}，可选 {', '.join(PROFILE_MODES)}")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if mode == "cpu":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            profiler.dump_stats(str(path))
+    elif mode == "wall":
+        sampler = WallSampler()
+        sampler.start()
+        try:
+            yield sampler
+        finally:
+            sampler.stop()
+            path.write_text(json.dumps(sampler.to_speedscope(name)), encoding="utf-8")
+    else:
+        # 已在追踪（如外层也在剖析）时不重复启动 / 停止
+        owner = not tracemalloc.is_tracing()
+        if owner:
+            tracemalloc.start(ALLOC_FRAMES)
+        try:
+            yield None
+        finally:
+            tracemalloc.take_snapshot().dump(str(path))
+            if owner:
+                tracemalloc.stop()
+
+
+def summarize(mode: str, path: Path, limit: int = 20) -> str:
+    """剖析文件的文字摘要（前 limit 项）"""
+    if mode == "cpu":
+        output = io.StringIO()
+        pstats.Stats(str(path), stream=output).sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+    if mode == "wall":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        sampler = WallSampler()
+        sampler.frames = data["shared"]["frames"]
+        for index, profile in enumerate(data["profiles"]):
+            sampler.thread_names[index] = profile["name"]
+            sampler.samples[index] = list(zip(profile["samples"], profile["weights"]))
+        return "\n".join(
+            f"{seconds * 1000:>10.1f} ms  [{thread}] {function}"
+            for thread, function, seconds in sampler.top(limit)
+        )
+    snapshot = tracemalloc.Snapshot.load(str(path))
+    return "\n".join(str(stat) for stat in snapshot.statistics("lineno")[:limit])
+
+
+class RequestProfiler:
+    """剖析指定路由接下来的 N 个请求（同一时间只剖析一个请求）"""
+
+    def __init__(self, directory: str = PROFILE_DIR):
+        self.directory = directory
+        self.route: Optional[str] = None
+        self.mode = "cpu"
+        self.remaining = 0
+        self.captured: List[str] = []
+        self._pattern: Optional[re.Pattern] = None
+        self._busy = False
+        self._lock = threading.Lock()
+
+    def arm(self, route: str, count: int = 1, mode: str = "cpu") -> Dict[str, Any]:
+        """开始剖析 route（路由模板，如 /api/articles/{id}）接下来的 count 个请求，count 为 0 表示停止"""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"未知的剖析模式: {mode}，可选 {', '.join(PROFILE_MODES)}")
+        # 路径参数 {name} / {name:path} 匹配任意一段 / 任意路径
+        pattern = re.sub(r"\\\{(\w+)(:path)?\\\}", lambda m: ".+" if m.group(2) else "[^/]+", re.escape(route))
+        with self._lock:
+            self.route = route
+            self.mode = mode
+            self.remaining = max(count, 0)
+            self.captured = []
+            self._pattern = re.compile(f"^{pattern}$")
+        return self.status()
+
+    def disarm(self) -> None:
+        with self._lock:
+            self.remaining = 0
+
+    def claim(self, path: str) -> Optional[Tuple[Path, str]]:
+        """请求是否需要剖析：需要时占用剖析器并返回 (输出文件路径, 剖析方式)
+
+        剖析方式与路径在同一把锁内读取，期间重新 arm 不会让两者不一致。
+        """
+        with self._lock:
+            if self.remaining <= 0 or self._busy or not self._pattern.match(path):
+                return None
+            self.remaining -= 1
+            self._busy = True
+            return default_path(self.mode, self.route, self.directory), self.mode
+
+    def release(self, output: Path) -> None:
+        with self._lock:
+            self._busy = False
+            self.captured.append(str(output))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "route": self.route,
+            "mode": self.mode,
+            "remaining": self.remaining,
+            "captured": list(self.captured),
+        }
+
+
+class ProfilingMiddleware:
+    """按 RequestProfiler 的设置剖析请求的 ASGI 中间件（未开启时只多一次整数比较）"""
+
+    def __init__(self, app, profiler: Optional[RequestProfiler] = None):
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.profiler.remaining <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        claimed = self.profiler.claim(scope["path"])
+        if claimed is None:
+            await self.app(scope, receive, send)
+            return
+
+        output, mode = claimed
+        try:
+            with profiled(mode, output, f"{scope['method']} {scope['path']}"):
+                await self.app(scope, receive, send)
+            logger.info("[Profile] %s %s -> %s", scope["method"], scope["path"], output)
+        finally:
+            self.profiler.release(output)
+
+
+# 全局单例
+request_profiler = RequestProfiler()
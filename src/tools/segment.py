@@ -0,0 +1,56 @@
+"""jieba 分词加载
+
+jieba 在首次分词时才构建前缀词典（约 1 秒），默认缓存在系统临时目录，
+容器重启或临时目录清理后需要重新构建。这里：
+- 延迟导入 jieba，避免拖慢应用导入
+- 词典缓存固定放在 data/cache/jieba.cache，重启后直接加载
+- 提供 warm_up()，在应用启动后于后台线程预热，首次抓取不再等待词典加载
+"""
+
+import threading
+import time
+from pathlib import Path
+
+JIEBA_CACHE_DIR = Path("data/cache")
+
+_configured = False
+_ready = False
+_lock = threading.Lock()
+
+
+def get_jieba():
+    """获取已配置词典缓存路径的 jieba 模块"""
+    global _configured
+    import jieba
+
+    if not _configured:
+        with _lock:
+            if not _configured:
+                JIEBA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                jieba.dt.tmp_dir = str(JIEBA_CACHE_DIR)
+                jieba.setLogLevel(jieba.logging.WARNING)
+                _configured = True
+    return jieba
+
+
+def warm_up() -> float:
+    """预热 jieba 词典（幂等，可在后台线程调用）
+
+    Returns:
+        加载耗时（秒），已预热过返回 0
+    """
+    global _ready
+    if _ready:
+        return 0.0
+
+    start = time.perf_counter()
+    get_jieba().initialize()
+    _ready = True
+    elapsed = time.perf_counter() - start
+    print(f"[Segment] jieba 词典已加载，耗时 {elapsed:.2f}s")
+    return elapsed
+
+
+def is_ready() -> bool:
+    """词典是否已加载"""
+    return _ready
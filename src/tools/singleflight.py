@@ -0,0 +1,107 @@
+"""单飞（single-flight）请求合并
+
+同一时刻对同一个 key 的多个并发调用只执行一次：
+第一个调用者负责计算，其余调用者等待同一个结果（或同一个异常）。
+计算结束后 key 立即释放，下一次调用重新计算（结果缓存交给上层，如 fastapi-cache）。
+
+用法：
+    flight = SingleFlight()
+    result = await flight.do(("articles", limit), query_func, limit)
+
+    @single_flight()
+    async def list_articles_today(limit: int = 100): ...
+"""
+
+import asyncio
+import inspect
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class SingleFlight:
+    """按 key 合并并发调用"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """执行 func，并发的相同 key 调用共享同一次执行
+
+        计算在独立任务中进行，某个调用者被取消不会影响其他等待者。
+
+        Args:
+            key: 合并键（需可哈希）
+            func: 协程函数
+            *args, **kwargs: 传给 func 的参数
+
+        Returns:
+            func 的返回值
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Future) -> None:
+        """计算结束，释放 key"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 标记异常已读取，避免没有等待者时出现 "exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def inflight(self) -> int:
+        """正在进行中的 key 数量"""
+        return len(self._inflight)
+
+
+def _make_key(func: Callable, signature: inspect.Signature, args: tuple, kwargs: dict) -> Hashable:
+    """根据规范化后的调用参数生成合并键
+
+    - 补齐默认值，位置参数与关键字参数等价
+    - 忽略 Request / Response 对象（每个请求各不相同）
+    - 不可哈希的参数值使用 repr
+    """
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+
+    items = []
+    for name, value in sorted(bound.arguments.items()):
+        if isinstance(value, (Request, Response)):
+            continue
+        try:
+            hash(value)
+        except TypeError:
+            value = repr(value)
+        items.append((name, value))
+
+    return (func.__module__, func.__qualname__, tuple(items))
+
+
+def single_flight(flight: Optional[SingleFlight] = None):
+    """单飞装饰器（用于协程函数 / FastAPI 路由）
+
+    放在 @cache 之下、路由函数之上：缓存未命中时，并发的相同请求只执行一次查询。
+
+    Args:
+        flight: 共享的 SingleFlight 实例（可选，默认每个函数独立）
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        group = flight or SingleFlight()
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = _make_key(func, signature, args, kwargs)
+            return await group.do(key, func, *args, **kwargs)
+
+        wrapper.flight = group
+        return wrapper
+
+    return decorator
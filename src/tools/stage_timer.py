@@ -0,0 +1,124 @@
+"""抓取阶段计时
+
+run_crawl 开始时创建 StageTimer 并设为当前计时器（contextvars，抓取中创建的任务自动继承），
+各阶段用 timed(name) 记录每次操作的耗时：
+
+- list_fetch：列表请求（HTTP）
+- parse：列表解析与条目提取
+- body_fetch：单篇正文请求与提取
+- dedup / filter：去重、keywords 筛选（每次抓取一次）
+- db_write：单篇文章入库（含正文文件）
+- connect / tls / ttfb：新建连接（含 DNS 解析）、TLS 握手、请求发出到收到响应头（见 resilience）
+
+抓取单个新闻源时设置 current_source，样本同时按新闻源归类；count(name, value) 记录计数
+（HTTP 请求数与字节数、各层去重丢弃数、关键词命中等）。没有当前计时器时 timed() / count() 不做任何事。
+汇总给出每个阶段的次数、合计与 p50 / p95；profile() 给出按新闻源展开的行，随任务执行记录入库。
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """分位数（线性插值，q 取 0 ~ 100）"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _stats(samples: Sequence[float]) -> Dict[str, float]:
+    """一组耗时样本（秒）的统计（毫秒）"""
+    return {
+        "count": len(samples),
+        "total_ms": round(sum(samples) * 1000, 2),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+class StageTimer:
+    """按阶段收集耗时样本（秒）与计数，可按新闻源区分"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        # 按新闻源归类的样本与计数：{(source_id, name): ...}
+        self.source_samples: Dict[Tuple[str, str], List[float]] = {}
+        self.counters: Dict[Tuple[str, str], int] = {}
+
+    def add(self, name: str, seconds: float, source: Optional[str] = None) -> None:
+        self.samples.setdefault(name, []).append(seconds)
+        if source:
+            self.source_samples.setdefault((source, name), []).append(seconds)
+
+    def count(self, name: str, value: int = 1, source: Optional[str] = None) -> None:
+        """累加计数（source 为空表示整次抓取）"""
+        key = (source or "", name)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    @contextmanager
+    def stage(self, name: str, source: Optional[str] = None):
+        """记录一次操作的耗时（异常时同样记录）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, source)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """各阶段统计（毫秒）：{stage: {count, total_ms, p50_ms, p95_ms, max_ms}}"""
+        return {name: _stats(samples) for name, samples in self.samples.items()}
+
+    def profile(self) -> Dict[str, List[Dict[str, Any]]]:
+        """按新闻源展开的阶段统计与计数（行格式，source 为 "" 的行是整次抓取的合计）"""
+        stages = [{"source": "", "stage": name, **stats} for name, stats in self.summary().items()]
+        stages += [
+            {"source": source, "stage": name, **_stats(samples)}
+            for (source, name), samples in self.source_samples.items()
+        ]
+
+        totals: Dict[str, int] = {}
+        for (source, name), value in self.counters.items():
+            totals[name] = totals.get(name, 0) + value
+        counters = [{"source": "", "name": name, "value": value} for name, value in totals.items()]
+        counters += [
+            {"source": source, "name": name, "value": value}
+            for (source, name), value in self.counters.items() if source
+        ]
+        return {"stages": stages, "counters": counters}
+
+
+current_timer: ContextVar[Optional[StageTimer]] = ContextVar("current_timer", default=None)
+# 当前抓取的新闻源（抓取单个新闻源的任务中设置）
+current_source: ContextVar[Optional[str]] = ContextVar("current_source", default=None)
+
+
+@contextmanager
+def timed(name: str):
+    """在当前计时器上记录一次操作（没有当前计时器时不计时）"""
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name, current_source.get()):
+        yield
+
+
+def observe(name: str, seconds: float) -> None:
+    """在当前计时器上为当前新闻源记录一个耗时样本（没有当前计时器时不记录）"""
+    timer = current_timer.get()
+    if timer is not None:
+        timer.add(name, seconds, current_source.get())
+
+
+def count(name: str, value: int = 1) -> None:
+    """在当前计时器上为当前新闻源累加计数（没有当前计时器时不计数）"""
+    timer = current_timer.get()
+    if timer is not None:
+        timer.count(name, value, current_source.get())
@@ -0,0 +1,152 @@
+"""启动耗时分析
+
+两部分：
+- 导入耗时：用 `python -X importtime` 在子进程中导入应用，按模块统计自身/累计耗时
+- 初始化耗时：lifespan 中各阶段通过 startup_profiler.phase() 计时
+
+设置环境变量 SFAPI_STARTUP_PROFILE=1 后，应用启动完成时打印各阶段耗时。
+
+命令行：
+    python -m src.tools.startup_profile            # 导入耗时 Top 20 + 启动各阶段耗时
+    python -m src.tools.startup_profile --top 40
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+ENV_FLAG = "SFAPI_STARTUP_PROFILE"
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\| (\s*)(\S+)")
+
+
+class StartupProfiler:
+    """启动阶段计时器"""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.environ.get(ENV_FLAG, "") not in ("", "0", "false")
+        self.enabled = enabled
+        self.phases: List[Tuple[str, float]] = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        """记录一个阶段的耗时（未启用时不做任何事）"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def reset(self, enabled: bool = True) -> None:
+        """清空记录并重新开始计时"""
+        self.enabled = enabled
+        self.phases.clear()
+        self._origin = time.perf_counter()
+
+    def mark(self, name: str) -> None:
+        """记录从计时器创建到当前的累计耗时（如：可以接收请求）"""
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - self._origin))
+
+    def report(self) -> Dict[str, float]:
+        """各阶段耗时（毫秒）"""
+        return {name: round(seconds * 1000, 1) for name, seconds in self.phases}
+
+    def print_report(self) -> None:
+        """打印各阶段耗时"""
+        if not self.enabled:
+            return
+        print("[Startup] 启动阶段耗时:")
+        for name, ms in self.report().items():
+            print(f"[Startup]   {name:<32} {ms:>8.1f} ms")
+
+
+def profile_imports(module: str = "src.main", top: int = 20) -> List[Dict[str, object]]:
+    """在子进程中导入模块，统计导入耗时
+
+    Args:
+        module: 要导入的模块
+        top: 返回累计耗时最高的前 N 个模块
+
+    Returns:
+        [{"module", "self_ms", "cumulative_ms", "depth"}, ...]，按累计耗时降序
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+
+    entries = [m.groups() for m in map(_IMPORTTIME_LINE.match, result.stderr.splitlines()) if m]
+
+    # 只保留目标模块这棵导入树（去掉解释器启动时 site 等模块的导入）：
+    # 子模块先于父模块输出，目标模块是最后一个顶层条目，其子树紧挨在前一个顶层条目之后
+    top_level = [i for i, entry in enumerate(entries) if not entry[2]]
+    if len(top_level) >= 2:
+        entries = entries[top_level[-2] + 1:]
+
+    rows: Dict[str, Dict[str, object]] = {}
+    for self_us, cumulative_us, indent, name in entries:
+        # 同一模块只在首次导入时计时，保留数值最大的一条
+        if name in rows and rows[name]["cumulative_ms"] >= int(cumulative_us) / 1000:
+            continue
+        rows[name] = {
+            "module": name,
+            "self_ms": round(int(self_us) / 1000, 1),
+            "cumulative_ms": round(int(cumulative_us) / 1000, 1),
+            "depth": len(indent) // 2,
+        }
+
+    return sorted(rows.values(), key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+
+
+async def profile_lifespan() -> Dict[str, float]:
+    """导入应用并完整执行一次 lifespan 启动/关闭，返回各阶段耗时"""
+    # 以 python -m 运行时本文件是 __main__，需取应用实际使用的那个单例
+    from .startup_profile import startup_profiler as profiler
+    profiler.reset(enabled=True)
+
+    start = time.perf_counter()
+    from ..main import app
+    import_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    async with app.router.lifespan_context(app):
+        pass
+
+    return {"import src.main": import_ms, **profiler.report()}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="应用启动耗时分析")
+    parser.add_argument("--module", default="src.main", help="要分析的模块")
+    parser.add_argument("--top", type=int, default=20, help="显示导入耗时最高的前 N 个模块")
+    args = parser.parse_args(argv)
+
+    print(f"导入耗时 Top {args.top}（{args.module}）:")
+    print(f"  {'cumulative':>10} {'self':>8}  module")
+    for row in profile_imports(args.module, args.top):
+        indent = "  " * int(row["depth"])
+        print(f"  {row['cumulative_ms']:>8.1f}ms {row['self_ms']:>6.1f}ms  {indent}{row['module']}")
+
+    print("\n启动阶段耗时:")
+    for name, ms in asyncio.run(profile_lifespan()).items():
+        print(f"  {name:<32} {ms:>8.1f} ms")
+
+
+# 全局单例（SFAPI_STARTUP_PROFILE=1 时启用）
+startup_profiler = StartupProfiler()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""正文缓存测试"""
+
+from datetime import datetime
+
+import pytest
+
+from src.config.models import NewsSource
+from src.crawlers import universal
+from src.crawlers.universal import UniversalCrawler
+from src.models import Article
+from src.storage.body_cache import BodyCache, normalize_url
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BodyCache(str(tmp_path / "body_cache.sqlite"))
+
+
+class TestNormalizeUrl:
+    """测试 URL 规范化"""
+
+    def test_equivalent_urls(self):
+        """测试大小写、片段、跟踪参数、参数顺序不影响缓存键"""
+        base = normalize_url("https://www.example.com/a?id=1&page=2")
+        assert normalize_url("HTTPS://WWW.Example.com/a?page=2&id=1#comments") == base
+        assert normalize_url("https://www.example.com/a?id=1&utm_source=x&page=2&spm=abc") == base
+        assert normalize_url("https://www.example.com/a?id=2&page=2") != base
+        assert normalize_url("https://example.com") == "https://example.com/"
+
+
+class TestBodyCache:
+    """测试正文缓存存取与淘汰"""
+
+    def test_put_get(self, cache):
+        """测试写入后按等价 URL 命中，新实例（重启后）仍可读取"""
+        assert cache.put_many({"https://e.com/a?utm_medium=x": "正文 A"}) == 1
+        assert cache.get("https://e.com/a") == "正文 A"
+        assert cache.get("https://e.com/b") is None
+
+        reopened = BodyCache(str(cache.db_path))
+        assert reopened.get_many(["https://e.com/a#top"]) == {"https://e.com/a#top": "正文 A"}
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_skip_failures(self, cache):
+        """测试失败占位文本不缓存"""
+        written = cache.put_many({
+            "https://e.com/1": "获取内容失败: timeout",
+            "https://e.com/2": "无法提取文章内容",
+            "https://e.com/3": "",
+        })
+        assert written == 0
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        """测试超出上限时淘汰最久未访问的条目"""
+        cache = BodyCache(str(tmp_path / "lru.sqlite"), max_bytes=300)
+        cache.put_many({"https://e.com/1": "a" * 100})
+        cache.put_many({"https://e.com/2": "b" * 100})
+        cache.get("https://e.com/1")  # 1 比 2 更近访问
+        cache.put_many({"https://e.com/3": "c" * 150})
+
+        assert cache.get("https://e.com/2") is None
+        assert cache.get("https://e.com/1") is not None
+        assert cache.get("https://e.com/3") is not None
+        assert cache.stats()["bytes"] <= 300
+
+    def test_replace_keeps_size(self, cache):
+        """测试覆盖写入时总大小不重复计算"""
+        cache.put_many({"https://e.com/1": "a" * 10})
+        cache.put_many({"https://e.com/1": "a" * 20})
+        assert cache.stats()["bytes"] == 20
+        assert cache.clear() == 1 and cache.stats()["bytes"] == 0
+
+
+class CountingParser:
+    """记录正文请求次数的解析器"""
+
+    def __init__(self):
+        self.body_requests = 0
+
+    async def parse(self, response, source_config, client=None, limit=20):
+        return [
+            Article(title=f"新闻{i}", url=f"https://e.com/{i}", source="demo", publish_time=datetime(2025, 1, 1))
+            for i in range(3)
+        ]
+
+    async def fetch_content(self, url, client):
+        self.body_requests += 1
+        return "获取内容失败: 404" if url.endswith("/2") else f"正文 {url}"
+
+
+class TestCrawlerBodyCache:
+    """测试通用爬虫先查正文缓存"""
+
+    @pytest.mark.asyncio
+    async def test_warm_run_skips_body_http(self, cache, monkeypatch):
+        """测试第二次抓取只重新请求上次失败的正文"""
+        parser = CountingParser()
+        monkeypatch.setattr(universal.parser_registry, "get", lambda s: parser)
+        source = NewsSource(id="body-cache-demo", name="正文缓存", type="tech", url="https://e.com/list")
+
+        async def run():
+            crawler = UniversalCrawler(source, news_batch_limit=10)
+            crawler.body_cache = cache
+            articles = await crawler.fetch()
+            await crawler.close()
+            return crawler, articles
+
+        first, _ = await run()
+        assert parser.body_requests == 3 and first.bodies_cached == 0
+
+        second, articles = await run()
+        assert parser.body_requests == 4
+        assert second.bodies_cached == 2
+        assert articles[0].content == "正文 https://e.com/0"
@@ -0,0 +1,121 @@
+"""抓取时间预算测试"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.config.models import NewsSource
+from src.crawlers import universal
+from src.crawlers.budget import CrawlBudget
+from src.crawlers.resilience import circuit_breakers
+from src.crawlers.universal import UniversalCrawler
+from src.models import Article
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowParser:
+    """列表、正文耗时可控的解析器"""
+
+    def __init__(self, list_delay=0.0, body_delays=(0.0,)):
+        self.list_delay = list_delay
+        self.body_delays = list(body_delays)
+
+    async def parse(self, response, source_config, client=None, limit=20):
+        await asyncio.sleep(self.list_delay)
+        return [
+            Article(title=f"新闻{i}", url=f"https://e/{i}", source="demo", publish_time=datetime(2025, 1, 1))
+            for i in range(len(self.body_delays))
+        ]
+
+    async def fetch_content(self, url, client):
+        await asyncio.sleep(self.body_delays[int(url.rsplit("/", 1)[1])])
+        return f"正文 {url}"
+
+
+@pytest.fixture
+def crawler(monkeypatch):
+    """使用 SlowParser 的通用爬虫"""
+    circuit_breakers.reset()
+    source = NewsSource(id="budget-demo", name="预算测试", type="tech", url="https://e/list")
+
+    def make(parser):
+        monkeypatch.setattr(universal.parser_registry, "get", lambda s: parser)
+        c = UniversalCrawler(source, news_batch_limit=10)
+        c.body_cache = None
+        return c
+
+    yield make
+    circuit_breakers.reset()
+
+
+class TestCrawlBudget:
+    """测试截止时间计算"""
+
+    def test_deadlines(self):
+        """测试正文截止 = 开始 + 列表 + 正文，且不超过总预算"""
+        clock = FakeClock()
+        budget = CrawlBudget(total=300, list_budget=60, body_budget=120, clock=clock)
+        assert budget.deadline("list") == 160
+        assert budget.deadline("body") == 280
+
+        clock.now = 150
+        assert budget.remaining("list") == 10
+        clock.now = 200
+        assert budget.remaining("list") == 0
+        assert budget.to_dict()["elapsed"] == 100
+
+        capped = CrawlBudget(total=100, list_budget=60, body_budget=120, clock=clock)
+        assert capped.deadline("body") == capped.started + 100
+
+    def test_unlimited(self):
+        """测试 0 表示不限"""
+        budget = CrawlBudget(0, 0, 0)
+        assert budget.remaining("list") is None
+        assert budget.remaining("body") is None
+
+        only_total = CrawlBudget(total=50, clock=FakeClock())
+        assert only_total.deadline("list") == only_total.deadline("body") == 150
+
+        with pytest.raises(ValueError):
+            only_total.deadline("save")
+
+
+class TestCrawlerBudget:
+    """测试通用爬虫按预算取消"""
+
+    @pytest.mark.asyncio
+    async def test_list_timeout(self, crawler):
+        """测试列表未在截止时间内完成时抛出 TimeoutError，并计入熔断"""
+        c = crawler(SlowParser(list_delay=5))
+        with pytest.raises(asyncio.TimeoutError):
+            await c.fetch(CrawlBudget(list_budget=0.05, body_budget=1))
+        await c.close()
+        assert circuit_breakers.get("budget-demo").failures == 1
+
+    @pytest.mark.asyncio
+    async def test_body_timeout_keeps_partial(self, crawler):
+        """测试正文到期后保留已取到的正文，其余留空（正文并发抓取，慢的不拖累其他）"""
+        c = crawler(SlowParser(body_delays=[0, 5, 0]))
+        articles = await c.fetch(CrawlBudget(list_budget=0.05, body_budget=0.05))
+        await c.close()
+
+        assert [a.content is not None for a in articles] == [True, False, True]
+        assert c.bodies_missing == 1
+
+    @pytest.mark.asyncio
+    async def test_within_budget(self, crawler):
+        """测试预算内完成时不受影响"""
+        c = crawler(SlowParser(body_delays=[0, 0]))
+        articles = await c.fetch(CrawlBudget(total=10, list_budget=5, body_budget=5))
+        await c.close()
+
+        assert all(a.content for a in articles)
+        assert c.bodies_missing == 0
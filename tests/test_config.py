@@ -1,9 +1,13 @@
 """测试配置模块"""
 
+import os
+
 import pytest
 from pathlib import Path
+from pydantic import ValidationError
 
 from src.config import ConfigReader
+from src.config.service import ConfigService, config_service
 from src.config.models import (
     Legend,
     Company,
@@ -111,3 +115,67 @@ class TestConfigModels:
         )
         assert source.id == "cankaoxiaoxi"
         assert source.enabled is True  # 默认值
+
+
+SOURCES_YAML = """
+sources:
+  - id: demo
+    name: 示例
+    type: financial
+    url: https://example.com/list
+"""
+
+
+class TestConfigService:
+    """测试配置缓存"""
+
+    def test_parse_once(self, tmp_path):
+        """测试同一文件只解析一次，不同读取器共用同一份快照"""
+        (tmp_path / "news_sources.yaml").write_text(SOURCES_YAML, encoding="utf-8")
+        first = ConfigReader(str(tmp_path)).load_news_sources_config()
+        second = ConfigReader(str(tmp_path)).load_news_sources_config()
+
+        assert first is second
+        stats = config_service.stats()["files"]["news_sources.yaml:NewsSourcesConfig"]
+        assert stats["hits"] >= 1
+
+    def test_immutable(self, tmp_path):
+        """测试配置快照不可修改，关键词配置返回副本"""
+        (tmp_path / "news_sources.yaml").write_text(SOURCES_YAML, encoding="utf-8")
+        (tmp_path / "news_keywords.yaml").write_text("legend:\n  musk: [[马斯克]]\n", encoding="utf-8")
+        reader = ConfigReader(str(tmp_path))
+        config = reader.load_news_sources_config()
+
+        with pytest.raises(ValidationError):
+            config.sources[0].enabled = False
+        assert config.sources[0].model_copy(update={"enabled": False}).enabled is False
+
+        reader.load_news_keywords_config()["legend"]["musk"].append(["Elon"])
+        assert reader.load_news_keywords_config() == {"legend": {"musk": [["马斯克"]]}}
+
+    def test_reload_on_change(self, tmp_path):
+        """测试文件内容变化时重新加载，只改修改时间时沿用快照"""
+        service = ConfigService()
+        path = tmp_path / "crawler.yaml"
+        path.write_text("a: 1\n", encoding="utf-8")
+        first = service.load(path)
+
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert service.load(path) is first
+
+        path.write_text("a: 2\n", encoding="utf-8")
+        assert service.load(path) == {"a": 2}
+        assert service.stats()["parses"] == 2 and service.stats()["hits"] == 1
+
+    def test_invalid_and_missing(self, tmp_path):
+        """测试校验失败时抛出异常（不缓存），文件不存在时抛出 FileNotFoundError"""
+        (tmp_path / "news_sources.yaml").write_text("sources:\n  - id: broken\n", encoding="utf-8")
+        reader = ConfigReader(str(tmp_path))
+        with pytest.raises(ValidationError):
+            reader.load_news_sources_config()
+
+        (tmp_path / "news_sources.yaml").write_text(SOURCES_YAML, encoding="utf-8")
+        assert reader.load_news_sources_config().sources[0].id == "demo"
+        with pytest.raises(FileNotFoundError):
+            reader.load_crawler_config()
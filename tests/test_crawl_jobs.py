@@ -0,0 +1,148 @@
+"""后台抓取任务测试"""
+
+import asyncio
+
+import pytest
+
+from src.scheduler.jobs import CrawlJobManager
+from src.scheduler.store import JobExecutionStore
+from src.tools.stage_timer import StageTimer
+
+
+def make_runner(gate: asyncio.Event, calls: list):
+    """构造可控的假抓取函数"""
+    async def runner(source_id=None, progress=None):
+        calls.append(source_id)
+        progress("fetch", total=2, done=1)
+        await gate.wait()
+        progress("fetch", "done", total=2, done=2)
+        return {"total_fetched": 2, "after_dedup": 1, "total_saved": 1, "sources": []}
+    return runner
+
+
+class TestCrawlJobManager:
+    """测试 CrawlJobManager"""
+
+    @pytest.mark.asyncio
+    async def test_submit_runs_in_background(self):
+        """测试提交后立即返回，后台执行"""
+        gate, calls = asyncio.Event(), []
+        manager = CrawlJobManager(runner=make_runner(gate, calls))
+
+        job, created = manager.submit()
+        assert created is True
+        assert job.status == "pending"
+
+        await asyncio.sleep(0)
+        assert job.status == "running"
+        assert job.stages["fetch"]["done"] == 1
+
+        gate.set()
+        result = await manager.wait(job)
+        assert result["total_saved"] == 1
+        assert job.status == "success"
+        assert job.stages["fetch"]["status"] == "done"
+        assert manager.current is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submit_coalesces(self):
+        """测试并发提交合并到运行中的任务"""
+        gate, calls = asyncio.Event(), []
+        manager = CrawlJobManager(runner=make_runner(gate, calls))
+
+        job1, created1 = manager.submit(trigger="api")
+        job2, created2 = manager.submit(trigger="scheduler")
+        assert created1 is True
+        assert created2 is False
+        assert job1 is job2
+        assert job1.coalesced == 1
+
+        gate.set()
+        await manager.wait(job1)
+        assert len(calls) == 1
+
+        # 结束后再提交会启动新任务
+        job3, created3 = manager.submit()
+        assert created3 is True
+        assert job3.id != job1.id
+        await manager.wait(job3)
+
+    @pytest.mark.asyncio
+    async def test_failed_job(self):
+        """测试任务失败记录错误"""
+        async def runner(source_id=None, progress=None):
+            raise ValueError("boom")
+
+        manager = CrawlJobManager(runner=runner)
+        job, _ = manager.submit()
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await manager.wait(job)
+        assert job.status == "failed"
+        assert job.to_dict()["error"] == "boom"
+        assert manager.get(job.id) is job
+
+    @pytest.mark.asyncio
+    async def test_history_limit(self):
+        """测试历史任务数量上限"""
+        gate, calls = asyncio.Event(), []
+        gate.set()
+        manager = CrawlJobManager(runner=make_runner(gate, calls))
+        manager.MAX_HISTORY = 3
+
+        for _ in range(5):
+            job, _ = manager.submit()
+            await manager.wait(job)
+
+        assert len(manager.list_jobs(limit=10)) == 3
+        assert manager.list_jobs(limit=1)[0] is job
+
+    @pytest.mark.asyncio
+    async def test_other_source_queues(self):
+        """测试运行中的任务不覆盖本次新闻源时排队执行，而不是合并"""
+        gate, calls = asyncio.Event(), []
+        manager = CrawlJobManager(runner=make_runner(gate, calls))
+
+        job1, _ = manager.submit(source_id="cls-telegraph")
+        job2, created2 = manager.submit(source_id="thepaper")
+        job3, created3 = manager.submit(source_id="thepaper")
+        assert created2 is True and job2 is not job1
+        assert created3 is False and job3 is job2
+
+        await asyncio.sleep(0)
+        assert job1.status == "running"
+        assert job2.status == "pending"
+
+        gate.set()
+        await manager.wait(job2)
+        assert calls == ["cls-telegraph", "thepaper"]
+
+    @pytest.mark.asyncio
+    async def test_record_execution(self, tmp_path):
+        """测试手动触发的任务同样记录执行结果与 profile（成功、失败）"""
+        store = JobExecutionStore(db_path=str(tmp_path / "scheduler.sqlite"))
+
+        async def runner(source_id=None, progress=None):
+            timer = StageTimer()
+            timer.add("list_fetch", 0.2, "ithome")
+            return {"total_saved": 1, "sources": [], "profile": timer.profile()}
+
+        manager = CrawlJobManager(runner=runner, store=store)
+        job, _ = manager.submit(trigger="api")
+        await manager.wait(job)
+
+        profile = store.get_profile(job.id)
+        assert profile["status"] == "success"
+        assert profile["started_at"] == job.started_at.isoformat()
+        assert profile["completed_at"] == job.completed_at.isoformat()
+        assert profile["sources"]["ithome"]["stages"]["list_fetch"]["count"] == 1
+
+        async def failing(source_id=None, progress=None):
+            raise ValueError("boom")
+
+        manager = CrawlJobManager(runner=failing, store=store)
+        job, _ = manager.submit()
+        with pytest.raises(RuntimeError):
+            await manager.wait(job)
+        profile = store.get_profile(job.id)
+        assert profile["status"] == "failed" and profile["error"] == "boom"
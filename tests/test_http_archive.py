@@ -0,0 +1,171 @@
+"""HTTP 录制 / 回放测试"""
+
+import base64
+from datetime import datetime
+
+import httpx
+import pytest
+
+from src import crawl_cli
+from src.config.models import NetworkConfig
+from src.crawlers import spec_engine
+from src.crawlers.http_archive import HttpArchive, RecordingTransport, ReplayTransport, archive_mode
+from src.crawlers.resilience import circuit_breakers, create_client
+from src.tools.parse_executor import ParseExecutor
+
+
+def live_site(request: httpx.Request) -> httpx.Response:
+    """模拟线上站点"""
+    if request.url.path == "/down":
+        raise httpx.ConnectError("refused", request=request)
+    if request.url.path == "/gzip":
+        import gzip
+        return httpx.Response(200, content=gzip.compress("压缩正文".encode()), headers={"content-encoding": "gzip"})
+    return httpx.Response(200, json={"path": request.url.path}, headers={"etag": '"v1"'})
+
+
+@pytest.fixture(autouse=True)
+def reset_mode():
+    yield
+    archive_mode.stop()
+    circuit_breakers.reset()
+
+
+class TestRecordReplay:
+    """测试录制与回放"""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip(self, tmp_path):
+        """测试录制的响应（含解压后的正文、连接错误）回放一致"""
+        archive = HttpArchive(str(tmp_path / "archive"))
+        async with httpx.AsyncClient(transport=RecordingTransport(httpx.MockTransport(live_site), archive)) as client:
+            assert (await client.get("https://a.com/list")).json() == {"path": "/list"}
+            assert (await client.get("https://a.com/gzip")).text == "压缩正文"
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://a.com/down")
+        archive.save()
+
+        loaded = HttpArchive.load(str(tmp_path / "archive"))
+        assert loaded.count == 3
+        async with httpx.AsyncClient(transport=ReplayTransport(loaded)) as client:
+            response = await client.get("https://a.com/list")
+            assert response.json() == {"path": "/list"} and response.headers["etag"] == '"v1"'
+            assert (await client.get("https://a.com/gzip")).text == "压缩正文"
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://a.com/down")
+            assert (await client.get("https://a.com/missing")).status_code == 404
+        assert loaded.misses == ["https://a.com/missing"]
+
+    def test_repeated_requests_in_order(self, tmp_path):
+        """测试同一 URL 多次录制时按顺序返回，超出后重复最后一次"""
+        archive = HttpArchive(str(tmp_path))
+        archive.add("GET", "https://a.com/", {"status": 503})
+        archive.add("GET", "https://a.com/", {"status": 200})
+        assert [archive.lookup("GET", "https://a.com/", i)["status"] for i in range(3)] == [503, 200, 200]
+
+    def test_deterministic_latency(self, tmp_path):
+        """测试回放延迟由种子决定"""
+        archive = HttpArchive(str(tmp_path))
+        first = ReplayTransport(archive, latency=0.01, jitter=0.05, seed=7)
+        second = ReplayTransport(archive, latency=0.01, jitter=0.05, seed=7)
+        other = ReplayTransport(archive, latency=0.01, jitter=0.05, seed=8)
+
+        delays = [first.delay("GET", f"https://a.com/{i}", 0) for i in range(5)]
+        assert delays == [second.delay("GET", f"https://a.com/{i}", 0) for i in range(5)]
+        assert delays != [other.delay("GET", f"https://a.com/{i}", 0) for i in range(5)]
+        assert all(0.01 <= d <= 0.06 for d in delays)
+
+    @pytest.mark.asyncio
+    async def test_deterministic_retry(self, tmp_path, monkeypatch):
+        """测试回放录制的 503 → 200 时重试等待由种子决定，两次回放耗时相同"""
+        archive = HttpArchive(str(tmp_path / "archive"))
+        archive.add("GET", "https://a.com/list", {"status": 503, "headers": [], "body": ""})
+        archive.add("GET", "https://a.com/list", {
+            "status": 200, "headers": [], "body": base64.b64encode(b"ok").decode(),
+        })
+        archive.save()
+
+        clock = []
+
+        async def fake_sleep(seconds):
+            clock.append(seconds)
+
+        monkeypatch.setattr("src.crawlers.resilience.asyncio.sleep", fake_sleep)
+        network = NetworkConfig(retry=2, retry_delay=5)
+        elapsed = []
+        for _ in range(2):
+            clock.clear()
+            archive_mode.replay(str(tmp_path / "archive"), seed=3)
+            async with create_client(network, limiter=None) as client:
+                assert (await client.get("https://a.com/list")).text == "ok"
+            archive_mode.stop()
+            elapsed.append(sum(clock))
+
+        assert len(clock) == 1 and 2.5 <= clock[0] <= 5
+        assert elapsed[0] == elapsed[1]
+
+    @pytest.mark.asyncio
+    async def test_create_client_wraps(self, tmp_path):
+        """测试录制模式下 create_client 创建的客户端自动录制"""
+        archive = archive_mode.record(str(tmp_path / "archive"))
+        client = create_client(transport=httpx.MockTransport(live_site), limiter=None)
+        await client.get("https://a.com/x")
+        await client.aclose()
+        archive_mode.stop()
+
+        assert archive.count == 1
+        assert (tmp_path / "archive" / "manifest.json").exists()
+
+
+class TestCliReplay:
+    """测试通过 crawl_cli 离线回放完整抓取"""
+
+    @pytest.mark.asyncio
+    async def test_replay_run_crawl(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(spec_engine, "parse_executor", ParseExecutor(mode="inline"))
+        recorded_at = datetime(2025, 3, 1, 12, 0, 0)
+        ctime = int(recorded_at.timestamp())
+
+        archive = HttpArchive(str(tmp_path / "archive"))
+        archive.recorded_at = recorded_at
+        listing = {"data": {"roll_data": [
+            {"id": 1, "title": "回放电报一", "ctime": ctime},
+            {"id": 2, "title": "另一条完全不同的回放消息", "ctime": ctime + 60},
+        ]}}
+        archive.add("GET", "https://www.cls.cn/nodeapi/updateTelegraphList", {
+            "status": 200,
+            "headers": [["content-type", "application/json"]],
+            "body": base64.b64encode(httpx.Response(200, json=listing).content).decode(),
+        })
+        for i in (1, 2):
+            archive.add("GET", f"https://www.cls.cn/detail/{i}", {
+                "status": 200,
+                "headers": [["content-type", "text/html; charset=utf-8"]],
+                "body": base64.b64encode(f'<div class="content"><p>正文{i}</p></div>'.encode()).decode(),
+            })
+        archive.save()
+
+        results = []
+        original = crawl_cli.run_crawl
+
+        async def capture(**kwargs):
+            result = await original(**kwargs)
+            results.append((kwargs, result, dict(archive_mode.archive.served)))
+            return result
+
+        monkeypatch.setattr(crawl_cli, "run_crawl", capture)
+        workdir = tmp_path / "work"
+        assert await crawl_cli.main(["--replay", str(tmp_path / "archive"), "--workdir", str(workdir)]) == 0
+
+        kwargs, result, served = results[0]
+        assert kwargs["target_date"] == recorded_at.date()
+        cls = next(s for s in result["sources"] if s["id"] == "cls-telegraph")
+        assert cls["status"] == "success" and cls["fetched"] == 2
+        assert result["total_fetched"] == 2
+        # 列表与正文都来自归档（未使用条件请求、正文缓存）
+        assert served[("GET", "https://www.cls.cn/detail/1")] == 1
+        assert served[("GET", "https://www.cls.cn/detail/2")] == 1
+        # 回放不写入项目的 data/、logs/ 目录
+        assert (workdir / "data" / "db").exists()
+        assert (workdir / "logs" / "app.log").exists()
+        assert archive_mode.mode is None
@@ -0,0 +1,62 @@
+"""日志配置测试"""
+
+import json
+import logging
+
+import pytest
+
+from src.config.models import LoggingConfig
+from src.tools.logging_setup import setup_logging, stop_logging
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """日志写到临时目录，结束后恢复默认设置"""
+    yield tmp_path
+    stop_logging()
+    logging.getLogger("src").setLevel(logging.NOTSET)
+    logging.getLogger("src").propagate = True
+
+
+def _read(log_dir):
+    stop_logging()  # 写完队列中剩余的日志
+    return (log_dir / "app.log").read_text(encoding="utf-8")
+
+
+class TestSetupLogging:
+    """测试级别与输出格式"""
+
+    def test_level_gate(self, log_dir):
+        """测试 INFO 级别下不输出、不格式化 DEBUG 日志"""
+        setup_logging(LoggingConfig(level="INFO", log_dir=str(log_dir)))
+        logger = logging.getLogger("src.api.crawl")
+
+        class Expensive:
+            def __str__(self):
+                raise AssertionError("INFO 级别下不应格式化 DEBUG 参数")
+
+        logger.debug("逐条: %s", Expensive())
+        logger.info("[Crawl] 入库: %d 条", 3)
+
+        text = _read(log_dir)
+        assert "[Crawl] 入库: 3 条" in text
+        assert "逐条" not in text
+
+    def test_json_format(self, log_dir):
+        """测试 json 格式每行一个对象，带 extra 字段"""
+        setup_logging(LoggingConfig(level="DEBUG", format="json", log_dir=str(log_dir)))
+        logging.getLogger("src.crawlers.dedup").debug("去重 %d 条", 5, extra={"source": "ithome"})
+
+        record = json.loads(_read(log_dir).splitlines()[-1])
+        assert record["level"] == "DEBUG"
+        assert record["logger"] == "src.crawlers.dedup"
+        assert record["message"] == "去重 5 条"
+        assert record["source"] == "ithome"
+
+    def test_reconfigure(self, log_dir):
+        """测试重复调用替换之前的设置"""
+        setup_logging(LoggingConfig(level="DEBUG", save_logs=False))
+        logger = setup_logging(LoggingConfig(level="WARNING", log_dir=str(log_dir)))
+
+        assert len(logger.handlers) == 1
+        assert not logger.isEnabledFor(logging.INFO)
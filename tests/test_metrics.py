@@ -0,0 +1,123 @@
+"""进程内指标测试"""
+
+import shutil
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from src.api.cache_backend import MeteredBackend
+from src.api.crawl import run_crawl
+from src.crawlers.resilience import circuit_breakers
+from src.crawlers.universal import UniversalCrawler
+from src.api.metrics import MetricsMiddleware, router as metrics_router
+from src.tools.metrics import MetricsRegistry, api_cache_requests, http_request_seconds, last_crawl_success
+
+
+class TestRegistry:
+    """测试指标与文本格式"""
+
+    def test_histogram_buckets(self):
+        """测试分桶（上界含等于）、合计与次数，输出为累计计数"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("demo_seconds", "Demo", ("db",), buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, "timeline")
+
+        text = registry.render()
+        assert "# TYPE demo_seconds histogram" in text
+        assert 'demo_seconds_bucket{db="timeline",le="0.1"} 2' in text
+        assert 'demo_seconds_bucket{db="timeline",le="1.0"} 3' in text
+        assert 'demo_seconds_bucket{db="timeline",le="+Inf"} 4' in text
+        assert 'demo_seconds_sum{db="timeline"} 3.65' in text
+        assert 'demo_seconds_count{db="timeline"} 4' in text
+
+    def test_counter_and_gauge(self):
+        """测试计数器累加、计量值设置与采集回调，标签值转义"""
+        registry = MetricsRegistry()
+        counter = registry.counter("demo_total", "Demo", ("result",))
+        counter.inc("hit")
+        counter.inc("hit", amount=2)
+        registry.gauge("demo_size", "Demo", collect=lambda: 42)
+        gauge = registry.gauge("demo_label", "Demo", ("name",))
+        gauge.set(1.5, 'a"b')
+
+        text = registry.render()
+        assert counter.value("hit") == 3
+        assert 'demo_total{result="hit"} 3' in text
+        assert "demo_size 42" in text
+        assert 'demo_label{name="a\\"b"} 1.5' in text
+
+    def test_register_once(self):
+        """测试同名指标只注册一次"""
+        registry = MetricsRegistry()
+        assert registry.counter("demo_total", "Demo") is registry.counter("demo_total", "Demo")
+
+
+class TestEndpoint:
+    """测试请求耗时中间件与 /metrics"""
+
+    def test_route_template(self):
+        """测试按路由模板记录请求，未匹配的请求记为 unmatched"""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router)
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {"id": item_id}
+
+        before = http_request_seconds.count("GET", "/items/{item_id}", "200")
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        assert http_request_seconds.count("GET", "/items/{item_id}", "200") == before + 2
+        assert http_request_seconds.count("GET", "unmatched", "404") >= 1
+
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'route="/items/{item_id}"' in response.text
+        assert "sf_url_cache_size" in response.text
+        assert "sf_dedup_cache_size" in response.text
+
+    @pytest.mark.asyncio
+    async def test_cache_hits(self):
+        """测试响应缓存命中 / 未命中计数"""
+        backend = MeteredBackend(InMemoryBackend())
+        hits, misses = api_cache_requests.value("hit"), api_cache_requests.value("miss")
+
+        await backend.get_with_ttl("k")
+        await backend.set("k", b"v", expire=60)
+        _, value = await backend.get_with_ttl("k")
+        assert value == b"v"
+
+        assert api_cache_requests.value("hit") == hits + 1
+        assert api_cache_requests.value("miss") == misses + 1
+
+
+class TestCrawlGauges:
+    """测试抓取相关指标"""
+
+    @pytest.mark.asyncio
+    async def test_all_sources_failed(self, tmp_path, monkeypatch):
+        """测试所有新闻源都失败时不更新最近一次成功抓取的时间"""
+        shutil.copytree(Path("config"), tmp_path / "config")
+        monkeypatch.chdir(tmp_path)
+
+        async def fail(self):
+            raise httpx.ConnectError("refused")
+
+        monkeypatch.setattr(UniversalCrawler, "fetch", fail)
+        last_crawl_success.set(123.0)
+        try:
+            result = await run_crawl()
+        finally:
+            circuit_breakers.reset()
+
+        assert result["sources"] and all(r["status"] == "error" for r in result["sources"])
+        assert last_crawl_success.value() == 123.0
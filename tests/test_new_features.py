@@ -151,8 +151,12 @@ class TestParserInterface:
 
     @pytest.mark.asyncio
     async def test_cankaoxiaoxi_parser_import(self):
-        """测试参考消息解析器可导入"""
-        from src.crawlers.parsers import cankaoxiaoxi
+        """测试参考消息解析器可加载（spec 编译）"""
+        from src.config import ConfigReader
+        from src.crawlers.spec_engine import parser_registry
+
+        sources = ConfigReader("config").load_news_sources_config().sources
+        cankaoxiaoxi = parser_registry.get(next(s for s in sources if s.id == "cankaoxiaoxi"))
 
         assert hasattr(cankaoxiaoxi, "parse")
         assert hasattr(cankaoxiaoxi, "fetch_content")
@@ -0,0 +1,155 @@
+"""解析执行器与 HTML 提取函数测试"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.tools import html_extract
+from src.tools.html_extract import extract_items, extract_json_var, extract_paragraphs
+from src.tools.parse_executor import ParseExecutor
+
+ARTICLE_HTML = """
+<html><body>
+  <div class="nav"><p>导航</p></div>
+  <div class="article-content"><p>第一段</p><p> </p><p>第二段</p></div>
+</body></html>
+"""
+
+LIST_HTML = """
+<ul>
+  <li class="newsflash-item"><a class="item-title" href="/p/1">标题一</a><span class="time">3小时前</span></li>
+  <li class="newsflash-item"><a class="item-title" href="/p/2">标题二</a></li>
+</ul>
+"""
+
+
+@pytest.fixture(params=["bs4", "lxml"])
+def engine(request):
+    """两个 HTML 引擎分别运行同一组用例"""
+    html_extract.set_engine(request.param)
+    yield request.param
+    html_extract.set_engine("auto")
+
+
+@pytest.mark.usefixtures("engine")
+class TestHtmlExtract:
+    """测试提取函数（bs4 / lxml 结果一致）"""
+
+    def test_paragraphs_from_first_matching_container(self):
+        """测试按顺序匹配正文容器"""
+        content = extract_paragraphs(
+            ARTICLE_HTML, None, [("div", "missing"), ("div", "article-content")]
+        )
+        assert content == "第一段\n\n第二段"
+
+    def test_paragraphs_bytes_with_encoding(self):
+        """测试按响应编码解码原始字节"""
+        raw = ARTICLE_HTML.encode("gbk")
+        content = extract_paragraphs(raw, "gbk", [("div", "article-content")])
+        assert content == "第一段\n\n第二段"
+
+    def test_paragraphs_body_fallback(self):
+        """测试找不到容器时回退到 <body>"""
+        assert extract_paragraphs(ARTICLE_HTML, None, [("article", None)]) is None
+        content = extract_paragraphs(ARTICLE_HTML, None, [("article", None)], 2)
+        assert content == "导航\n\n第一段"
+
+    def test_items(self):
+        """测试列表项提取（含属性与缺失字段）"""
+        fields = {"title": "a.item-title", "href": "a.item-title@href", "time": ".time"}
+        items = extract_items(LIST_HTML.encode(), "utf-8", ".newsflash-item", fields)
+
+        assert items[0] == {"title": "标题一", "href": "/p/1", "time": "3小时前"}
+        assert items[1]["time"] is None
+        assert len(extract_items(LIST_HTML, None, ".newsflash-item", fields, 1)) == 1
+
+    def test_class_matches_whole_word(self):
+        """测试 class 按单词匹配（同 bs4 的 class_）"""
+        html = '<div class="article-content-wrap"><p>否</p></div><div class="x article-content"><p>是</p></div>'
+        assert extract_paragraphs(html, None, [("div", "article-content")]) == "是"
+
+    def test_text_skips_script_and_comment(self):
+        """测试段落文本不含脚本与注释"""
+        html = '<div class="content"><p>甲<script>var a;</script> 乙<!--注释--></p></div>'
+        assert extract_paragraphs(html, None, [("div", "content")]) == "甲乙"
+
+    def test_empty_document(self):
+        """测试空文档"""
+        assert extract_paragraphs(b"", "utf-8", [("div", "content")], 5) is None
+        assert extract_items(b"", "utf-8", ".item", {"title": "a"}) == []
+
+    def test_comment_only_document(self):
+        """测试只有注释的文档与空文档一致"""
+        assert extract_paragraphs(b"<!-- x -->", "utf-8", [("div", "content")], 5) is None
+        assert extract_items("<!-- x -->", None, ".item", {"title": "a"}) == []
+
+    def test_str_with_xml_declaration(self):
+        """测试带编码声明的 str 文档"""
+        html = '<?xml version="1.0" encoding="gbk"?><html><body><div class="content"><p>正文</p></div></body></html>'
+        assert extract_paragraphs(html, None, [("div", "content")]) == "正文"
+
+    def test_json_var(self):
+        """测试从脚本中提取 JSON 变量"""
+        html = '<script>var allData = {"hotNews1": [{"title": "凤凰"}]};</script>'
+        pattern = r"var\s+allData\s*=\s*(\{[\s\S]*?\});"
+
+        assert extract_json_var(html.encode(), "utf-8", pattern) == {"hotNews1": [{"title": "凤凰"}]}
+        assert extract_json_var("<html></html>", None, pattern) is None
+
+
+class TestParseExecutor:
+    """测试 ParseExecutor"""
+
+    def test_invalid_mode(self):
+        """测试未知模式"""
+        with pytest.raises(ValueError):
+            ParseExecutor(mode="gpu")
+        with pytest.raises(ValueError):
+            ParseExecutor(html_engine="regex")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+    async def test_run(self, mode):
+        """测试各模式返回相同结果"""
+        executor = ParseExecutor(mode=mode, max_workers=1, html_engine="lxml")
+        try:
+            content = await executor.run(
+                extract_paragraphs, ARTICLE_HTML.encode(), "utf-8", [("div", "article-content")]
+            )
+        finally:
+            executor.shutdown()
+        assert content == "第一段\n\n第二段"
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """测试进程池解析大页面时事件循环仍能及时调度"""
+        big_html = ("<div class='article-content'>" + "<p>段落内容</p>" * 40000 + "</div>").encode()
+        executor = ParseExecutor(mode="process", max_workers=1)
+        # 先预热子进程，排除进程启动时间
+        await executor.run(extract_paragraphs, b"<p></p>", None, [])
+
+        max_gap = 0.0
+
+        async def ticker(stop: asyncio.Event):
+            nonlocal max_gap
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        stop = asyncio.Event()
+        tick = asyncio.create_task(ticker(stop))
+        try:
+            content = await executor.run(
+                extract_paragraphs, big_html, "utf-8", [("div", "article-content")]
+            )
+        finally:
+            stop.set()
+            await tick
+            executor.shutdown()
+
+        assert content.count("段落内容") == 40000
+        assert max_gap < 0.2
@@ -0,0 +1,122 @@
+"""性能剖析测试"""
+
+import asyncio
+import json
+import pstats
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.crawl_cli import parse_args
+from src.tools.profiling import ProfilingMiddleware, RequestProfiler, profiled, summarize
+
+
+def busy(n: int = 200000) -> int:
+    return sum(i * i for i in range(n))
+
+
+async def crawl_like(n: int = 200000):
+    """模拟抓取：CPU 计算与等待交替"""
+    for _ in range(3):
+        busy(n)
+        await asyncio.sleep(0.01)
+    return [bytearray(1024) for _ in range(100)]
+
+
+class TestProfiled:
+    """测试三种模式的输出格式"""
+
+    def test_cpu(self, tmp_path):
+        """测试 cProfile 输出可被 pstats 读取"""
+        path = tmp_path / "crawl.pstats"
+        with profiled("cpu", path):
+            asyncio.run(crawl_like())
+
+        stats = pstats.Stats(str(path))
+        assert any(func[2] == "busy" for func in stats.stats)
+        assert "busy" in summarize("cpu", path)
+
+    def test_wall(self, tmp_path):
+        """测试采样输出 speedscope JSON，包含等待时间"""
+        path = tmp_path / "crawl.speedscope.json"
+        with profiled("wall", path, "crawl"):
+            asyncio.run(crawl_like())
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["$schema"].startswith("https://www.speedscope.app")
+        names = {frame["name"] for frame in data["shared"]["frames"]}
+        assert "crawl_like" in names
+        main = next(p for p in data["profiles"] if p["name"] == "MainThread")
+        assert len(main["samples"]) == len(main["weights"]) > 0
+        # 墙钟：sleep 的 30ms 也计入
+        assert main["endValue"] >= 0.03
+        assert summarize("wall", path)
+
+    def test_alloc(self, tmp_path):
+        """测试 tracemalloc 快照可被读取"""
+        path = tmp_path / "crawl.tracemalloc"
+        with profiled("alloc", path):
+            # tracemalloc 下逐个分配很慢，计算量取小
+            asyncio.run(crawl_like(1000))
+
+        snapshot = tracemalloc.Snapshot.load(str(path))
+        assert snapshot.statistics("lineno")
+        assert not tracemalloc.is_tracing()
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            with profiled("gpu", tmp_path / "x"):
+                pass
+
+    def test_cli_args(self):
+        args = parse_args(["--profile", "wall", "--profile-out", "out.json"])
+        assert args.profile == "wall"
+        assert args.profile_out == "out.json"
+
+
+class TestRequestProfiler:
+    """测试按路由剖析接下来的 N 个请求"""
+
+    def test_next_n_requests(self, tmp_path):
+        """测试只剖析匹配路由的前 N 个请求"""
+        profiler = RequestProfiler(str(tmp_path))
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+        @app.get("/api/articles/{article_id}")
+        async def article(article_id: str):
+            return {"id": article_id}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        profiler.arm("/api/articles/{article_id}", count=2, mode="cpu")
+        client = TestClient(app)
+        client.get("/health")
+        for i in range(3):
+            assert client.get(f"/api/articles/{i}").json() == {"id": str(i)}
+
+        status = profiler.status()
+        assert status["remaining"] == 0
+        assert len(status["captured"]) == 2
+        assert all(path.endswith(".pstats") for path in status["captured"])
+        assert len(list(tmp_path.glob("*.pstats"))) == 2
+
+    def test_arm_validation(self, tmp_path):
+        profiler = RequestProfiler(str(tmp_path))
+        with pytest.raises(ValueError):
+            profiler.arm("/api/articles", mode="gpu")
+        profiler.arm("/api/articles", count=0)
+        assert profiler.claim("/api/articles") is None
+
+    def test_claim_returns_mode(self, tmp_path):
+        """测试剖析方式与输出路径一起取出，之后重新 arm 不影响已占用的请求"""
+        profiler = RequestProfiler(str(tmp_path))
+        profiler.arm("/api/articles", count=1, mode="wall")
+        output, mode = profiler.claim("/api/articles")
+        profiler.arm("/api/articles", count=1, mode="cpu")
+        assert mode == "wall"
+        assert "_wall_" in output.name
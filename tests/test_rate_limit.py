@@ -0,0 +1,84 @@
+"""按主机限速测试"""
+
+import httpx
+import pytest
+
+from src.config.models import RateLimitConfig
+from src.crawlers import rate_limit
+from src.crawlers.rate_limit import HostRateLimiter, TokenBucket
+from src.crawlers.resilience import RetryTransport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """测试令牌桶"""
+
+    def test_burst_then_rate(self):
+        """测试先消耗突发额度，之后按速率排队"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+        assert bucket.reserve() == 0.5
+        assert bucket.reserve() == 1.0
+
+        clock.now = 10
+        assert bucket.reserve() == 0  # 补满，但不超过容量
+        assert bucket.tokens == 2
+
+
+class TestHostRateLimiter:
+    """测试按主机限速"""
+
+    def test_host_overrides(self):
+        """测试按主机与上级域名覆盖"""
+        limiter = HostRateLimiter(RateLimitConfig(rate=5, burst=10, hosts={"cls.cn": {"rate": 1, "burst": 2}}))
+
+        assert limiter.bucket("www.cls.cn").rate == 1
+        assert limiter.bucket("cls.cn").burst == 2
+        assert limiter.bucket("notcls.cn").rate == 5
+        assert limiter.bucket("www.cls.cn") is limiter.bucket("www.cls.cn")
+
+    def test_configure_resets(self):
+        """测试配置变化时重建令牌桶，相同配置保留"""
+        limiter = HostRateLimiter()
+        bucket = limiter.bucket("a.com")
+        limiter.configure(RateLimitConfig())
+        assert limiter.bucket("a.com") is bucket
+
+        limiter.configure(RateLimitConfig(rate=1))
+        assert limiter.bucket("a.com") is not bucket
+        assert limiter.bucket("a.com").rate == 1
+
+    @pytest.mark.asyncio
+    async def test_transport_waits_per_host(self, monkeypatch):
+        """测试请求经传输层按主机取令牌：同一主机排队，其他主机不受影响"""
+        waits = []
+
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+
+        monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+        limiter = HostRateLimiter(RateLimitConfig(rate=1, burst=1))
+        transport = RetryTransport(httpx.MockTransport(lambda r: httpx.Response(200)), retries=0, limiter=limiter)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://a.com/1")
+            await client.get("https://b.com/1")
+            await client.get("https://a.com/2")
+
+        assert len(waits) == 1 and waits[0] == pytest.approx(1, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """测试关闭限速时不等待"""
+        limiter = HostRateLimiter(RateLimitConfig(enabled=False, rate=0.001, burst=1))
+        assert await limiter.acquire("a.com") == 0
+        assert await limiter.acquire("a.com") == 0
@@ -0,0 +1,174 @@
+"""重试与熔断测试"""
+
+import httpx
+import pytest
+
+from src.config.models import NetworkConfig, SourceSpec
+from src.crawlers import spec_engine
+from src.crawlers.resilience import CircuitBreaker, CircuitBreakers, RetryTransport, create_client
+from src.crawlers.spec_engine import SpecParser
+from src.tools.parse_executor import ParseExecutor
+
+URL = "https://example.com/list.json"
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """重试等待不实际休眠，记录等待时长"""
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr("src.crawlers.resilience.asyncio.sleep", fake_sleep)
+    return waits
+
+
+def flaky(statuses):
+    """依次返回给定状态码（异常实例则抛出）的传输层"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        if isinstance(status, Exception):
+            raise status
+        return httpx.Response(status, json={"list": []})
+
+    return httpx.MockTransport(handler), calls
+
+
+class TestRetryTransport:
+    """测试临时错误重试"""
+
+    @pytest.mark.asyncio
+    async def test_retry_until_success(self, no_sleep):
+        """测试 5xx、连接失败后重试成功，等待按指数增长"""
+        transport, calls = flaky([503, httpx.ConnectError("refused"), 200])
+        client = httpx.AsyncClient(transport=RetryTransport(transport, retries=3, delay=1, max_delay=60))
+
+        response = await client.get(URL)
+        await client.aclose()
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert 0.5 <= no_sleep[0] <= 1 and 1 <= no_sleep[1] <= 2
+
+    @pytest.mark.asyncio
+    async def test_give_up(self, no_sleep):
+        """测试重试次数用尽后返回最后的响应 / 抛出最后的异常"""
+        transport, calls = flaky([502])
+        client = httpx.AsyncClient(transport=RetryTransport(transport, retries=2, delay=1))
+        assert (await client.get(URL)).status_code == 502
+        assert len(calls) == 3
+
+        transport, calls = flaky([httpx.ReadTimeout("slow")])
+        client = httpx.AsyncClient(transport=RetryTransport(transport, retries=1, delay=1))
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get(URL)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_not_retried(self, no_sleep):
+        """测试 4xx 与非幂等请求不重试"""
+        transport, calls = flaky([404])
+        client = httpx.AsyncClient(transport=RetryTransport(transport, retries=3, delay=1))
+        assert (await client.get(URL)).status_code == 404
+
+        transport, post_calls = flaky([503])
+        client = httpx.AsyncClient(transport=RetryTransport(transport, retries=3, delay=1))
+        assert (await client.post(URL)).status_code == 503
+        assert len(calls) == 1 and len(post_calls) == 1
+        assert no_sleep == []
+
+    def test_retry_after(self):
+        """测试 Retry-After 优先，且不超过上限"""
+        transport = RetryTransport(httpx.MockTransport(lambda r: httpx.Response(200)), delay=1, max_delay=30)
+        assert transport.backoff(0, httpx.Response(429, headers={"Retry-After": "7"})) == 7
+        assert transport.backoff(0, httpx.Response(429, headers={"Retry-After": "120"})) == 30
+        assert transport.backoff(10) <= 30
+
+    @pytest.mark.asyncio
+    async def test_create_client(self):
+        """测试按网络配置创建客户端"""
+        transport, calls = flaky([500, 200])
+        network = NetworkConfig(timeout=7, retry=1, retry_delay=0, user_agent="test-agent")
+        client = create_client(network, transport=transport)
+
+        assert (await client.get(URL)).status_code == 200
+        assert calls[0].headers["user-agent"] == "test-agent"
+        assert client.timeout.read == 7
+        await client.aclose()
+
+
+class TestCircuitBreaker:
+    """测试熔断器状态转换"""
+
+    def test_open_after_threshold(self):
+        """测试连续失败达到阈值后熔断，冷却期内跳过"""
+        breaker = CircuitBreaker("demo", threshold=2, cooldown=100)
+        breaker.failure("e1", now=0)
+        assert breaker.state == "closed" and breaker.allow(now=1)
+
+        breaker.failure("e2", now=10)
+        assert breaker.state == "open"
+        assert not breaker.allow(now=50)
+        assert breaker.retry_after(now=50) == 60
+        assert breaker.to_dict()["skipped"] == 1
+
+    def test_half_open(self):
+        """测试冷却结束后试探：失败重新熔断，成功恢复"""
+        breaker = CircuitBreaker("demo", threshold=1, cooldown=100)
+        breaker.failure(now=0)
+
+        assert breaker.allow(now=100) and breaker.state == "half_open"
+        breaker.failure(now=100)
+        assert breaker.state == "open" and not breaker.allow(now=150)
+
+        assert breaker.allow(now=200)
+        breaker.success()
+        assert breaker.state == "closed" and breaker.failures == 0
+
+    def test_success_resets_count(self):
+        """测试成功后连续失败计数清零"""
+        breaker = CircuitBreaker("demo", threshold=2)
+        breaker.failure()
+        breaker.success()
+        breaker.failure()
+        assert breaker.state == "closed"
+
+    def test_registry(self):
+        """测试按新闻源获取、更新配置与重置"""
+        breakers = CircuitBreakers(threshold=3, cooldown=600)
+        breaker = breakers.get("a")
+        assert breakers.get("a") is breaker
+
+        breakers.configure(1, 60)
+        breaker.failure("down")
+        assert breakers.snapshot()["a"]["state"] == "open"
+        assert breakers.snapshot()["a"]["last_error"] == "down"
+
+        breakers.reset("a")
+        assert breakers.get("a") is not breaker
+
+
+class TestSpecParserErrors:
+    """测试列表全部失败时抛出（计入熔断）"""
+
+    @pytest.mark.asyncio
+    async def test_all_lists_failed(self, monkeypatch):
+        monkeypatch.setattr(spec_engine, "parse_executor", ParseExecutor(mode="inline"))
+        spec = SourceSpec(
+            list={"format": "json", "path": "list"},
+            fields={"title": "title", "url": "url", "publish_time": "ctime"},
+        )
+        transport = httpx.MockTransport(
+            lambda r: httpx.Response(500) if "down" in str(r.url) else httpx.Response(200, json={"list": []})
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            parser = SpecParser("demo", spec)
+            config = {"url": "https://example.com/{channel}", "channels": ["down", "up"]}
+            assert await parser.parse(None, config, client) == []
+
+            with pytest.raises(httpx.HTTPStatusError):
+                await parser.parse(None, {**config, "channels": ["down"]}, client)
@@ -7,6 +7,7 @@ from pathlib import Path
 from datetime import date
 
 from src.scheduler import SchedulerManager, JobExecutionStore
+from src.scheduler.cadence import SourceCadence
 from src.config import ConfigReader
 
 
@@ -87,6 +88,138 @@ class TestSchedulerManager:
         assert status["next_run_time"] is None
 
 
+@pytest.fixture
+def adaptive_config_dir(temp_config_dir):
+    """开启自适应调度的临时配置目录"""
+    config_file = Path(temp_config_dir) / "crawler_config.yaml"
+    config_file.write_text(config_file.read_text() + """
+polling:
+  adaptive: true
+  min_interval: 900
+  max_interval: 3600
+""")
+    (Path(temp_config_dir) / "news_sources.yaml").write_text("""
+sources:
+  - id: "fast"
+    name: "快源"
+    type: "financial"
+    url: "https://example.com/fast"
+    poll: {min_interval: 60}
+  - id: "slow"
+    name: "慢源"
+    type: "official"
+    url: "https://example.com/slow"
+    poll: {max_interval: 7200}
+  - id: "off"
+    name: "停用"
+    type: "tech"
+    enabled: false
+    url: "https://example.com/off"
+""")
+    return temp_config_dir
+
+
+class TestAdaptivePolling:
+    """测试按新闻源自适应调度"""
+
+    def test_cadence_bounds(self, adaptive_config_dir):
+        """测试每个启用的源一个间隔，且不低于 MIN_INTERVAL"""
+        scheduler = SchedulerManager(config_dir=adaptive_config_dir)
+
+        assert set(scheduler.cadences) == {"fast", "slow"}
+        assert scheduler.cadences["fast"].min_interval == SchedulerManager.MIN_INTERVAL
+        assert scheduler.cadences["slow"].max_interval == 7200
+
+        status = scheduler.status
+        assert status["mode"] == "adaptive"
+        assert status["sources"]["fast"]["interval"] == 900
+        assert status["sources"]["fast"]["next_run_time"] is None
+
+    def test_update_from_result(self, adaptive_config_dir):
+        """测试按抓取结果调整：无新条目放慢，失败退避"""
+        scheduler = SchedulerManager(config_dir=adaptive_config_dir)
+        result = {"sources": [
+            {"id": "fast", "status": "success", "new": 0},
+            {"id": "slow", "status": "error", "new": 0},
+        ]}
+
+        scheduler._update_cadences(result)
+
+        assert scheduler.cadences["fast"].interval == 1350
+        assert scheduler.cadences["slow"].interval == 1800
+        assert scheduler.cadences["slow"].consecutive_errors == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesced_job_updates_own_source(self, adaptive_config_dir, monkeypatch):
+        """测试合并到其他任务时只按本源的结果调整"""
+        from types import SimpleNamespace
+        from src.scheduler import scheduler as scheduler_module
+
+        result = {"sources": [
+            {"id": "fast", "status": "success", "new": 0},
+            {"id": "slow", "status": "success", "new": 0},
+        ]}
+
+        class FakeJobs:
+            def submit(self, **kwargs):
+                return SimpleNamespace(status="completed", error=None), False
+
+            async def wait(self, job):
+                return result
+
+        scheduler = SchedulerManager(config_dir=adaptive_config_dir)
+        monkeypatch.setattr(scheduler_module, "crawl_jobs", FakeJobs())
+        monkeypatch.setattr(scheduler.leader, "acquire", lambda: True)
+
+        await scheduler._run_crawl_job("fast")
+        assert scheduler.cadences["fast"].interval == 1350
+        assert scheduler.cadences["slow"].interval == 900
+
+        # 合并到的任务未抓取本源时不调整
+        result["sources"] = [{"id": "slow", "status": "success", "new": 0}]
+        await scheduler._run_crawl_job("fast")
+        assert scheduler.cadences["fast"].interval == 1350
+
+    def test_fixed_mode(self, temp_config_dir):
+        """测试未开启自适应时保持统一间隔"""
+        scheduler = SchedulerManager(config_dir=temp_config_dir)
+        assert scheduler.cadences == {}
+        assert scheduler.status["mode"] == "fixed"
+
+
+class TestSourceCadence:
+    """测试自适应间隔计算"""
+
+    def test_fast_source_speeds_up(self):
+        """测试新条目多时缩短间隔（单次最多减半，不低于下限）"""
+        cadence = SourceCadence("fast", interval=1800, min_interval=900, max_interval=7200, target_new=3)
+        now = 1000.0
+        cadence.observe(new_items=12, now=now)
+        assert cadence.interval == 900
+
+        cadence.observe(new_items=12, now=now + 900)
+        assert cadence.interval == 900
+
+    def test_rate_based_interval(self):
+        """测试间隔 = 目标条数 / 新条目速率"""
+        cadence = SourceCadence("s", interval=1800, min_interval=900, max_interval=7200, target_new=3)
+        cadence.observe(new_items=2, now=0.0)  # 首次按初始间隔计：2 条 / 1800 秒
+        assert cadence.interval == 2700
+        assert cadence.to_dict()["new_per_hour"] == 4.0
+
+    def test_idle_and_errors_back_off(self):
+        """测试无新条目放慢、连续失败退避，且不超过上限"""
+        cadence = SourceCadence("s", interval=1800, min_interval=900, max_interval=3600)
+        cadence.observe(new_items=0, now=0.0)
+        assert cadence.interval == 2700
+
+        cadence.observe(error=True, now=2700.0)
+        cadence.observe(error=True, now=6300.0)
+        assert cadence.interval == 3600
+        assert cadence.consecutive_errors == 2
+        assert cadence.to_dict()["error_rate"] > 0
+
+
 class TestJobExecutionStore:
     """测试 JobExecutionStore"""
 
@@ -186,3 +319,37 @@ class TestJobExecutionStore:
         assert status["success_count"] == 2
         assert status["failure_count"] == 1
         assert status["last_execution"]["total_saved"] == 20
+
+    def test_record_execution_profile(self, temp_db):
+        """测试耗时与计数拆表入库，按执行记录 ID 或任务 ID 查询"""
+        from datetime import datetime
+        from src.tools.stage_timer import StageTimer
+
+        timer = StageTimer()
+        timer.add("list_fetch", 0.2, "ithome")
+        timer.add("list_fetch", 0.4, "36kr")
+        timer.add("dedup", 0.05)
+        timer.count("http_bytes", 1000, "ithome")
+        timer.count("http_bytes", 500, "36kr")
+        timer.count("dedup_url_dropped", 3, "ithome")
+
+        store = JobExecutionStore(db_path=temp_db)
+        record_id = store.record_execution(
+            "news_crawl_20250101_080000",
+            {"total_saved": 1, "profile": timer.profile()},
+            started_at=datetime(2025, 1, 1, 8, 0, 0),
+            completed_at=datetime(2025, 1, 1, 8, 0, 2),
+        )
+
+        profile = store.get_profile(record_id)
+        assert profile == store.get_profile("news_crawl_20250101_080000")
+        assert profile["duration_ms"] == 2000.0
+        assert profile["total"]["stages"]["list_fetch"]["count"] == 2
+        assert profile["total"]["stages"]["dedup"]["count"] == 1
+        assert profile["total"]["counters"]["http_bytes"] == 1500
+        assert profile["sources"]["ithome"]["stages"]["list_fetch"]["total_ms"] == 200.0
+        assert profile["sources"]["ithome"]["counters"] == {"http_bytes": 1000, "dedup_url_dropped": 3}
+        assert "dedup" not in profile["sources"]["36kr"]["stages"]
+        # profile 不重复存入 result_json
+        assert "profile" not in store.get_recent_jobs(limit=1)[0]["result"]
+        assert store.get_profile(record_id + 1) is None
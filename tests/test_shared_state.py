@@ -0,0 +1,210 @@
+"""多 worker 共享状态测试（租约锁 / 共享去重缓存 / 共享响应缓存）"""
+
+import asyncio
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.api.cache_backend import SQLiteCacheBackend
+from src.crawlers.url_cache import URLCache
+from src.scheduler.jobs import CrawlJobManager
+from src.scheduler.leader import LeaseLock
+from src.storage.shared_state import SharedStateDB
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestLeaseLock:
+    """测试 LeaseLock"""
+
+    def test_only_one_holder(self, temp_dir):
+        """测试同一时刻只有一个持有者"""
+        db_path = str(temp_dir / "scheduler.sqlite")
+        a = LeaseLock(db_path, "scheduler", ttl=60, owner="worker-a")
+        b = LeaseLock(db_path, "scheduler", ttl=60, owner="worker-b")
+
+        assert a.acquire() is True
+        assert b.acquire() is False
+        assert b.current_owner() == "worker-a"
+
+        # 持有者续约成功
+        assert a.acquire() is True
+
+    def test_release_allows_takeover(self, temp_dir):
+        """测试释放后其他 worker 可接管"""
+        db_path = str(temp_dir / "scheduler.sqlite")
+        a = LeaseLock(db_path, "scheduler", owner="worker-a")
+        b = LeaseLock(db_path, "scheduler", owner="worker-b")
+
+        a.acquire()
+        a.release()
+        assert a.held is False
+        assert b.acquire() is True
+
+    def test_expired_lease_taken_over(self, temp_dir):
+        """测试租约过期后被接管"""
+        db_path = str(temp_dir / "scheduler.sqlite")
+        a = LeaseLock(db_path, "scheduler", ttl=-1, owner="worker-a")
+        b = LeaseLock(db_path, "scheduler", ttl=60, owner="worker-b")
+
+        assert a.acquire() is True
+        assert b.acquire() is True
+        assert a.acquire() is False
+
+    def test_names_are_independent(self, temp_dir):
+        """测试不同名称的租约互不影响"""
+        db_path = str(temp_dir / "scheduler.sqlite")
+        assert LeaseLock(db_path, "scheduler", owner="worker-a").acquire() is True
+        assert LeaseLock(db_path, "crawl", owner="worker-b").acquire() is True
+
+
+class TestSharedStateDB:
+    """测试 SharedStateDB"""
+
+    def test_dedup_entries_isolated_by_date(self, temp_dir):
+        """测试去重条目按日期隔离"""
+        store = SharedStateDB(str(temp_dir / "state.sqlite"))
+        store.dedup_add("news", {"https://a.com/1": "标题一"}, "2026-01-01")
+        store.dedup_add("news", {"https://a.com/2": "标题二"}, "2026-01-02")
+
+        assert store.dedup_exists("news", "https://a.com/1", "2026-01-01") is True
+        assert store.dedup_exists("news", "https://a.com/1", "2026-01-02") is False
+        assert store.dedup_values("news", "2026-01-02") == ["标题二"]
+
+        assert store.dedup_purge("news", keep_date="2026-01-02") == 1
+        assert store.dedup_count("news", "2026-01-01") == 0
+
+    def test_dedup_exists_many(self, temp_dir, monkeypatch):
+        """测试批量检查：一个连接内分批查询，只返回当天已存在的 key"""
+        store = SharedStateDB(str(temp_dir / "state.sqlite"))
+        monkeypatch.setattr(SharedStateDB, "IN_BATCH", 2)
+        store.dedup_add("news", {f"https://a.com/{i}": None for i in range(5)}, "2026-01-01")
+        store.dedup_add("news", {"https://a.com/9": None}, "2026-01-02")
+
+        keys = [f"https://a.com/{i}" for i in (0, 2, 4, 7, 9, 0)]
+        assert store.dedup_exists_many("news", keys, "2026-01-01") == {
+            "https://a.com/0", "https://a.com/2", "https://a.com/4"
+        }
+        assert store.dedup_exists_many("url", keys, "2026-01-01") == set()
+        assert store.dedup_exists_many("news", [], "2026-01-01") == set()
+
+    def test_kv_expire(self, temp_dir):
+        """测试键值过期"""
+        store = SharedStateDB(str(temp_dir / "state.sqlite"))
+        store.kv_set("forever", b"1")
+        store.kv_set("expired", b"2", expire=-1)
+
+        assert store.kv_get("forever") == (-1, b"1")
+        assert store.kv_get("expired") == (0, None)
+
+    def test_kv_delete_prefix(self, temp_dir):
+        """测试按前缀删除（_ 与 % 不作为通配符）"""
+        store = SharedStateDB(str(temp_dir / "state.sqlite"))
+        store.kv_set("cache:a_1", b"1")
+        store.kv_set("cache:a_2", b"2")
+        store.kv_set("cache:ab", b"3")
+
+        assert store.kv_delete(prefix="cache:a_") == 2
+        assert store.kv_get("cache:ab")[1] == b"3"
+
+
+class TestSharedCaches:
+    """测试缓存单例切换到共享存储"""
+
+    def test_url_cache_visible_across_processes(self, temp_dir):
+        """测试共享存储中的 URL 对其他 worker 可见"""
+        db_path = str(temp_dir / "state.sqlite")
+        cache = URLCache()
+        cache.clear()
+        try:
+            cache.use_shared_store(SharedStateDB(db_path))
+            cache.add_batch(["https://a.com/1", "https://a.com/2"])
+
+            # 模拟另一个 worker 直接读取共享库
+            other = SharedStateDB(db_path)
+            assert other.dedup_exists("url", "https://a.com/1", date.today().isoformat())
+            assert cache.count == 2
+        finally:
+            cache.clear()
+            cache.use_shared_store(None)
+
+    @pytest.mark.asyncio
+    async def test_cache_backend(self, temp_dir):
+        """测试 fastapi-cache 共享后端"""
+        backend = SQLiteCacheBackend(SharedStateDB(str(temp_dir / "state.sqlite")))
+        await backend.set("sfapi-cache:articles:1", b"{}", expire=60)
+
+        ttl, value = await backend.get_with_ttl("sfapi-cache:articles:1")
+        assert value == b"{}"
+        assert 0 < ttl <= 60
+
+        assert await backend.clear(namespace="sfapi-cache:articles") == 1
+        assert await backend.get("sfapi-cache:articles:1") is None
+
+
+class TestCrawlLease:
+    """测试跨 worker 抓取互斥"""
+
+    @pytest.mark.asyncio
+    async def test_skipped_when_other_worker_crawling(self, temp_dir):
+        """测试其他 worker 持有抓取租约时任务被跳过"""
+        db_path = str(temp_dir / "scheduler.sqlite")
+        LeaseLock(db_path, "crawl", owner="worker-b").acquire()
+
+        calls = []
+
+        async def runner(source_id=None, progress=None):
+            calls.append(source_id)
+            return {}
+
+        manager = CrawlJobManager(runner=runner, lease=LeaseLock(db_path, "crawl", owner="worker-a"))
+        job, _ = manager.submit()
+        await manager.wait(job)
+
+        assert job.status == "skipped"
+        assert "worker-b" in job.error
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_trigger_wait_skipped(self, temp_dir, monkeypatch):
+        """测试等待的手动触发被其他 worker 跳过时返回 409，而不是报错"""
+        from src.api import crawl
+
+        db_path = str(temp_dir / "scheduler.sqlite")
+        LeaseLock(db_path, "crawl", owner="worker-b").acquire()
+
+        async def runner(source_id=None, progress=None):
+            return {"total_saved": 1}
+
+        manager = CrawlJobManager(runner=runner, lease=LeaseLock(db_path, "crawl", owner="worker-a"))
+        monkeypatch.setattr(crawl, "crawl_jobs", manager)
+        monkeypatch.setattr(crawl, "_set_last_crawl_time", lambda value: None)
+
+        response = await crawl.trigger_crawl(force=True, wait=True)
+        assert response["code"] == 409
+        assert "worker-b" in response["message"]
+        assert response["data"]["status"] == "skipped"
+
+    @pytest.mark.asyncio
+    async def test_lease_released_after_crawl(self, temp_dir):
+        """测试抓取结束后释放租约"""
+        db_path = str(temp_dir / "scheduler.sqlite")
+        lease = LeaseLock(db_path, "crawl", owner="worker-a")
+
+        async def runner(source_id=None, progress=None):
+            assert lease.held is True
+            await asyncio.sleep(0)
+            return {"total_saved": 0}
+
+        manager = CrawlJobManager(runner=runner, lease=lease)
+        job, _ = manager.submit()
+        await manager.wait(job)
+
+        assert job.status == "success"
+        assert lease.current_owner() is None
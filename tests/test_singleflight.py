@@ -0,0 +1,119 @@
+"""单飞请求合并测试"""
+
+import asyncio
+
+import pytest
+
+from src.tools import SingleFlight, single_flight
+
+
+class TestSingleFlight:
+    """测试 SingleFlight"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        """测试并发相同 key 只执行一次"""
+        flight = SingleFlight()
+        calls = []
+
+        async def compute(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        results = await asyncio.gather(*[flight.do("k", compute, 21) for _ in range(10)])
+        assert results == [42] * 10
+        assert calls == [21]
+        assert flight.inflight == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """测试不同 key 分别执行"""
+        flight = SingleFlight()
+        calls = []
+
+        async def compute(value):
+            calls.append(value)
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(flight.do("a", compute, 1), flight.do("b", compute, 2))
+        assert results == [1, 2]
+        assert sorted(calls) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_key_released_after_completion(self):
+        """测试执行结束后重新计算"""
+        flight = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert await flight.do("k", compute) == 1
+        assert await flight.do("k", compute) == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_shared(self):
+        """测试异常传递给所有等待者"""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *[flight.do("k", fail) for _ in range(3)], return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.inflight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_work(self):
+        """测试调用者取消不影响其他等待者"""
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", compute))
+        second = asyncio.ensure_future(flight.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+
+
+class TestSingleFlightDecorator:
+    """测试 single_flight 装饰器"""
+
+    @pytest.mark.asyncio
+    async def test_normalized_arguments(self):
+        """测试位置参数、关键字参数和默认值规范化为同一个 key"""
+        calls = []
+
+        @single_flight()
+        async def handler(limit: int = 100, legend: str = None):
+            calls.append((limit, legend))
+            await asyncio.sleep(0.01)
+            return {"limit": limit}
+
+        results = await asyncio.gather(handler(), handler(100), handler(limit=100, legend=None))
+        assert results == [{"limit": 100}] * 3
+        assert calls == [(100, None)]
+
+        await asyncio.gather(handler(10), handler(20))
+        assert len(calls) == 3
+
+    def test_preserves_signature(self):
+        """测试保留函数签名（FastAPI 依赖注入需要）"""
+        import inspect
+
+        @single_flight()
+        async def handler(limit: int = 100):
+            return limit
+
+        assert list(inspect.signature(handler).parameters) == ["limit"]
+        assert handler.__name__ == "handler"
@@ -0,0 +1,118 @@
+"""新闻源并发测试与健康历史测试"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import yaml
+
+from src.crawlers import spec_engine
+from src.crawlers.resilience import create_client
+from src.crawlers.source_tester import SourceTester
+from src.scheduler.source_health import SourceHealthStore, parse_window
+from src.tools.parse_executor import ParseExecutor
+
+NOW = datetime(2025, 3, 8, 12, 0, 0)
+
+
+def result(source_id: str, total_ms: float, status: str = "ok") -> dict:
+    return {
+        "id": source_id,
+        "status": status,
+        "count": 20,
+        "timings": {"total_ms": total_ms, "connect_ms": 10.0, "ttfb_ms": total_ms / 2, "parse_ms": 1.0, "bytes": 2048},
+    }
+
+
+class TestHealthHistory:
+    """测试健康历史统计"""
+
+    def test_parse_window(self):
+        assert parse_window("7d") == timedelta(days=7)
+        assert parse_window("12H") == timedelta(hours=12)
+        for value in ("", "7", "0d", "1w"):
+            with pytest.raises(ValueError):
+                parse_window(value)
+
+    def test_percentiles_and_daily(self, tmp_path):
+        """测试 p50 / p95、出错不计入延迟、按天趋势与窗口外的记录"""
+        store = SourceHealthStore(str(tmp_path / "scheduler.db"))
+        store.record([result("a", 100), result("b", 0, "error")], tested_at=NOW - timedelta(days=1))
+        store.record([result("a", 300)], tested_at=NOW - timedelta(hours=1))
+        store.record([result("a", 9999)], tested_at=NOW - timedelta(days=30))
+
+        history = store.history(timedelta(days=7), now=NOW)
+        a = history["sources"]["a"]
+        assert a["samples"] == 2 and a["errors"] == 0
+        assert a["p50_ms"] == 200 and a["p95_ms"] == 290
+        assert a["connect_p50_ms"] == 10 and a["avg_bytes"] == 2048
+        assert [day["date"] for day in a["daily"]] == ["2025-03-07", "2025-03-08"]
+        b = history["sources"]["b"]
+        assert b["samples"] == 1 and b["errors"] == 1 and b["p50_ms"] is None
+        assert history["slowing"] == []
+
+    def test_slowing(self, tmp_path):
+        """测试窗口最后四分之一的 p50 明显变高时标记变慢，样本不足时不标记"""
+        store = SourceHealthStore(str(tmp_path / "scheduler.db"))
+        for day in range(6, 2, -1):
+            store.record([result("slow", 100), result("steady", 100)], tested_at=NOW - timedelta(days=day))
+        for hour in (30, 20, 10):
+            store.record([result("slow", 400), result("steady", 110)], tested_at=NOW - timedelta(hours=hour))
+        store.record([result("sparse", 100)], tested_at=NOW - timedelta(days=5))
+        store.record([result("sparse", 900)], tested_at=NOW - timedelta(hours=1))
+
+        history = store.history(timedelta(days=7), now=NOW)
+        slow = history["sources"]["slow"]
+        assert slow["previous_p50_ms"] == 100 and slow["recent_p50_ms"] == 400
+        assert history["slowing"] == ["slow"]
+
+
+class TestConcurrentTester:
+    """测试并发探测与耗时分解"""
+
+    @pytest.mark.asyncio
+    async def test_test_all(self, tmp_path, monkeypatch):
+        """测试各源并发探测，结果带耗时分解"""
+        monkeypatch.setattr(spec_engine, "parse_executor", ParseExecutor(mode="inline"))
+        spec = {
+            "list": {"format": "json", "path": "data.items"},
+            "fields": {"title": "title", "url": "url", "publish_time": "ctime"},
+        }
+        sources = [
+            {"id": f"health-{i}", "name": f"源{i}", "type": "financial", "url": f"https://s{i}.example.com/list", "spec": spec}
+            for i in range(4)
+        ]
+        (tmp_path / "news_sources.yaml").write_text(yaml.safe_dump({"sources": sources}), encoding="utf-8")
+
+        in_flight, peak = 0, 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            items = [{"title": f"标题{n}", "url": f"https://{request.url.host}/{n}", "ctime": 1741400000} for n in range(3)]
+            return httpx.Response(200, json={"data": {"items": items}})
+
+        tester = SourceTester(str(tmp_path))
+        await tester.close()
+        tester.client = create_client(transport=httpx.MockTransport(handler), limiter=None)
+        async with tester:
+            data = await tester.test_all()
+
+        assert peak > 1
+        assert [s["id"] for s in data["sources"]] == [s["id"] for s in sources]
+        for source in data["sources"]:
+            assert source["status"] == "ok" and source["count"] == 3
+            timings = source["timings"]
+            assert timings["total_ms"] >= 50
+            assert timings["requests"] == 1 and timings["bytes"] > 0
+            assert timings["parse_ms"] is not None
+            # MockTransport 不经过 httpcore，没有建连 / 首字节样本
+            assert timings["connect_ms"] == 0.0 and timings["ttfb_ms"] is None
+
+        store = SourceHealthStore(str(tmp_path / "scheduler.db"))
+        assert store.record(data["sources"]) == 4
+        assert set(store.history(timedelta(hours=1))["sources"]) == {s["id"] for s in sources}
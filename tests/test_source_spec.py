@@ -0,0 +1,233 @@
+"""声明式新闻源（spec）引擎测试"""
+
+from datetime import datetime
+
+import httpx
+import pytest
+
+from src.config import ConfigReader
+from src.config.models import NewsSource, SourceSpec
+from src.crawlers import spec_engine
+from src.crawlers.spec_engine import ExtractionPlan, FieldExpr, ParserRegistry, SpecParser
+from src.tools.parse_executor import ParseExecutor
+
+
+@pytest.fixture(autouse=True)
+def inline_executor(monkeypatch):
+    """测试中在事件循环内直接解析，不启动进程池"""
+    monkeypatch.setattr(spec_engine, "parse_executor", ParseExecutor(mode="inline", html_engine="auto"))
+
+
+def make_spec(**overrides) -> SourceSpec:
+    data = {
+        "list": {"format": "json", "path": "data.roll_data"},
+        "fields": {
+            "title": "title|brief",
+            "url": "shareurl|https://www.cls.cn/detail/{id}",
+            "publish_time": "ctime",
+        },
+        "exclude": {"is_ad": True},
+        "body": {"containers": [["div", "content"], ["article", None]]},
+    }
+    data.update(overrides)
+    return SourceSpec(**data)
+
+
+def mock_client(routes: dict) -> httpx.AsyncClient:
+    """按 URL 返回固定响应的客户端"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = routes.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        if isinstance(body, (dict, list)):
+            return httpx.Response(200, json=body)
+        return httpx.Response(200, content=body.encode("utf-8"), headers={"content-type": "text/html; charset=utf-8"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestFieldExpr:
+    """测试字段表达式"""
+
+    def test_path_and_alternatives(self):
+        """测试点号路径与候选"""
+        expr = FieldExpr("resource.title|resource.content_short")
+        assert expr({"resource": {"title": "标题"}}) == "标题"
+        assert expr({"resource": {"title": "", "content_short": "摘要"}}) == "摘要"
+        assert expr({"resource": None}) is None
+
+    def test_template(self):
+        """测试模板：占位值缺失时尝试下一个候选"""
+        expr = FieldExpr("shareurl|https://www.cls.cn/detail/{id}")
+        assert expr({"shareurl": "https://a/1"}) == "https://a/1"
+        assert expr({"id": 42}) == "https://www.cls.cn/detail/42"
+        assert expr({}) is None
+
+    def test_list_index(self):
+        """测试列表下标"""
+        assert FieldExpr("items.1.name")({"items": [{"name": "a"}, {"name": "b"}]}) == "b"
+        assert FieldExpr("items.5.name")({"items": []}) is None
+
+
+class TestExtractionPlan:
+    """测试提取计划"""
+
+    def test_extract(self):
+        """测试排除规则、必填字段与时间解析"""
+        plan = ExtractionPlan("cls-telegraph", make_spec())
+        records = [
+            {"id": 1, "title": "电报一", "ctime": 1700000000},
+            {"id": 2, "brief": "电报二", "shareurl": "https://s/2", "ctime": "1700000060"},
+            {"id": 3, "title": "广告", "ctime": 1700000000, "is_ad": 1},
+            {"id": 4, "title": "无时间"},
+            {"id": 5, "title": "坏时间", "ctime": "abc"},
+        ]
+
+        articles = plan.extract(records)
+
+        assert [a.title for a in articles] == ["电报一", "电报二"]
+        assert articles[0].url == "https://www.cls.cn/detail/1"
+        assert articles[0].source == "cls-telegraph"
+        assert articles[0].publish_time == datetime.fromtimestamp(1700000000)
+        assert articles[1].url == "https://s/2"
+
+    def test_time_formats(self):
+        """测试多个 strptime 格式依次尝试与相对时间"""
+        plan = ExtractionPlan("ifeng", make_spec(time_format=["%Y-%m-%d %H:%M:%S", "%Y%m%d%H%M%S"]))
+        assert plan.parse_time("2025-01-28 10:00:00") == datetime(2025, 1, 28, 10, 0, 0)
+        assert plan.parse_time("20250128100000") == datetime(2025, 1, 28, 10, 0, 0)
+        assert plan.parse_time("昨天") is None
+
+        relative = ExtractionPlan("36kr", make_spec(time_format="relative"))
+        assert (datetime.now() - relative.parse_time("3小时前")).total_seconds() == pytest.approx(3 * 3600, abs=5)
+
+    def test_exclude_values(self):
+        """测试按值列表排除"""
+        plan = ExtractionPlan("wallstreetcn-news", make_spec(exclude={"resource.type": ["live"]}))
+        records = [
+            {"title": "a", "id": 1, "ctime": 1700000000, "resource": {"type": "live"}},
+            {"title": "b", "id": 2, "ctime": 1700000000, "resource": {"type": "article"}},
+        ]
+        assert [a.title for a in plan.extract(records)] == ["b"]
+
+    @pytest.mark.parametrize("overrides, message", [
+        ({"fields": {"title": "title"}}, "缺少"),
+        ({"time_format": "unix"}, "未知的时间格式"),
+        ({"list": {"format": "html"}}, "selector"),
+        ({"list": {"format": "json_var"}}, "pattern"),
+        ({"body": {"containers": [[]]}}, "containers"),
+    ])
+    def test_invalid_spec(self, overrides, message):
+        """测试编译期发现配置错误"""
+        with pytest.raises(ValueError, match=message):
+            ExtractionPlan("bad", make_spec(**overrides))
+
+
+class TestSpecParser:
+    """测试 SpecParser 抓取"""
+
+    @pytest.mark.asyncio
+    async def test_json_channels_and_limit(self):
+        """测试 {channel} 展开、每频道条数限制与单个频道失败"""
+        url = "https://example.com/{channel}/list.json"
+        spec = make_spec(list={"format": "json", "path": "list"}, exclude={})
+        rows = [{"id": i, "title": f"新闻{i}", "ctime": 1700000000 + i} for i in range(1, 6)]
+        client = mock_client({"https://example.com/a/list.json": {"list": rows}})
+
+        parser = SpecParser("demo", spec)
+        articles = await parser.parse(None, {"url": url, "channels": ["a", "missing"]}, client, limit=3)
+        await client.aclose()
+
+        assert [a.title for a in articles] == ["新闻1", "新闻2", "新闻3"]
+
+    @pytest.mark.asyncio
+    async def test_html_list_and_body(self):
+        """测试 HTML 列表页与正文提取"""
+        spec = make_spec(
+            list={
+                "format": "html",
+                "selector": ".newsflash-item",
+                "fields": {"title": "a.item-title", "href": "a.item-title@href", "time": ".time"},
+            },
+            fields={"title": "title", "url": "https://www.36kr.com{href}", "publish_time": "time"},
+            time_format="relative",
+            exclude={},
+            body={"containers": [["div", "newsflash-detail-content"]], "body_fallback": 1},
+        )
+        client = mock_client({
+            "https://www.36kr.com/newsflashes": (
+                '<div class="newsflash-item"><a class="item-title" href="/p/1">快讯一</a><span class="time">5分钟前</span></div>'
+                '<div class="newsflash-item"><a class="item-title" href="/p/2">无时间</a></div>'
+            ),
+            "https://www.36kr.com/p/1": '<div class="newsflash-detail-content"><p>正文</p></div>',
+            "https://www.36kr.com/p/2": "<body><p>第一段</p><p>第二段</p></body>",
+        })
+
+        parser = SpecParser("36kr", spec)
+        articles = await parser.parse(None, {"url": "https://www.36kr.com/newsflashes"}, client)
+
+        assert [(a.title, a.url) for a in articles] == [("快讯一", "https://www.36kr.com/p/1")]
+        assert await parser.fetch_content("https://www.36kr.com/p/1", client) == "正文"
+        assert await parser.fetch_content("https://www.36kr.com/p/2", client) == "第一段"
+        assert (await parser.fetch_content("https://www.36kr.com/p/3", client)).startswith("获取内容失败")
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_json_var(self):
+        """测试页面脚本中的 JSON 变量"""
+        spec = make_spec(
+            list={"format": "json_var", "pattern": r"var\s+allData\s*=\s*(\{[\s\S]*?\});", "path": "hotNews1"},
+            fields={"title": "title", "url": "url", "publish_time": "newsTime"},
+            time_format="%Y-%m-%d %H:%M:%S",
+            exclude={},
+        )
+        page = '<script>var allData = {"hotNews1": [{"title": "凤凰", "url": "https://i/1", "newsTime": "2025-01-28 10:00:00"}]};</script>'
+        client = mock_client({"https://www.ifeng.com/": page})
+
+        articles = await SpecParser("ifeng", spec).parse(None, {"url": "https://www.ifeng.com/"}, client)
+        await client.aclose()
+
+        assert [(a.title, a.source) for a in articles] == [("凤凰", "ifeng")]
+
+
+class TestParserRegistry:
+    """测试解析器注册表"""
+
+    def test_spec_and_module(self):
+        """测试 spec 编译缓存与解析器模块回退"""
+        registry = ParserRegistry()
+        spec_source = NewsSource(id="brand-new", name="新源", type="tech", url="https://x", spec=make_spec())
+        module_source = NewsSource(id="toutiao", name="今日头条", type="portal", url="https://x")
+
+        parser = registry.get(spec_source)
+        assert isinstance(parser, SpecParser)
+        assert registry.get(spec_source) is parser
+
+        module = registry.get(module_source)
+        assert module.__name__ == "src.crawlers.parsers.toutiao"
+
+    def test_spec_change_recompiles(self):
+        """测试 spec 变更后重新编译"""
+        registry = ParserRegistry()
+        source = NewsSource(id="demo", name="演示", type="tech", url="https://x", spec=make_spec())
+        parser = registry.get(source)
+
+        changed = NewsSource(id="demo", name="演示", type="tech", url="https://x", spec=make_spec(time_format="timestamp_ms"))
+        assert registry.get(changed) is not parser
+
+    def test_missing_parser(self):
+        """测试无 spec 且无解析器模块"""
+        registry = ParserRegistry()
+        source = NewsSource(id="no-such-source", name="无", type="tech", url="https://x")
+
+        with pytest.raises(ImportError):
+            registry.get(source)
+        assert "解析器不存在" in registry.load([source])["no-such-source"]
+
+    def test_configured_sources_compile(self):
+        """测试 news_sources.yaml 中的全部新闻源都能加载"""
+        sources = ConfigReader("config").load_news_sources_config().sources
+        loaded = ParserRegistry().load(sources)
+
+        assert loaded["toutiao"] == "module"
+        assert all(kind in ("spec", "module") for kind in loaded.values())
@@ -0,0 +1,197 @@
+"""新闻源抓取状态测试（条件请求校验信息、高水位）"""
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from src.config.models import SourceSpec
+from src.crawlers import spec_engine
+from src.crawlers.spec_engine import SpecParser
+from src.scheduler.source_state import SourceStateStore, body_hash
+from src.tools.parse_executor import ParseExecutor
+
+URL = "https://example.com/list.json"
+
+SPEC = SourceSpec(
+    list={"format": "json", "path": "list"},
+    fields={"title": "title", "url": "url", "publish_time": "ctime"},
+)
+
+
+@pytest.fixture(autouse=True)
+def inline_executor(monkeypatch):
+    monkeypatch.setattr(spec_engine, "parse_executor", ParseExecutor(mode="inline"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SourceStateStore(str(tmp_path / "scheduler.sqlite"))
+
+
+class ListServer:
+    """模拟支持 ETag 的列表接口"""
+
+    def __init__(self, etag: bool = True):
+        self.etag = etag
+        self.version = 1
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        tag = f'"v{self.version}"'
+        if self.etag and request.headers.get("if-none-match") == tag:
+            return httpx.Response(304)
+        body = {"list": [{"title": f"新闻 v{self.version}", "url": f"https://e/{self.version}", "ctime": 1700000000}]}
+        headers = {"ETag": tag} if self.etag else {}
+        return httpx.Response(200, json=body, headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+async def crawl(store: SourceStateStore, server: ListServer):
+    """模拟一次抓取：解析后提交校验信息"""
+    session = store.session()
+    async with server.client() as client:
+        articles = await SpecParser("demo", SPEC).parse(None, {"url": URL}, client, state=session)
+    session.commit(["demo"])
+    return articles, session.not_modified("demo")
+
+
+class TestSourceStateStore:
+    """测试抓取状态存储"""
+
+    def test_persist(self, store):
+        """测试写入后新实例可读取（重启后保留）"""
+        store.save({("demo", URL): {"etag": '"a"', "last_modified": None, "body_hash": "h"}})
+
+        reopened = SourceStateStore(store.db_path)
+        assert reopened.get("demo", URL)["etag"] == '"a"'
+        assert reopened.clear("demo") == 1
+        assert reopened.get("demo", URL) is None
+
+    def test_session_commit_only_selected(self, store):
+        """测试只提交指定新闻源，未提交的不写入"""
+        session = store.session()
+        response = httpx.Response(200, content=b"{}", request=httpx.Request("GET", URL))
+        assert not session.unchanged("a", URL, response)
+        assert not session.unchanged("b", URL, response)
+
+        assert session.commit(["a"]) == 1
+        assert store.get("a", URL)["body_hash"] == body_hash(b"{}")
+        assert store.get("b", URL) is None
+
+
+class TestConditionalFetch:
+    """测试条件请求跳过解析"""
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, store):
+        """测试 304 时跳过解析，内容变化后重新解析"""
+        server = ListServer()
+
+        articles, not_modified = await crawl(store, server)
+        assert len(articles) == 1 and not not_modified
+
+        articles, not_modified = await crawl(store, server)
+        assert articles == [] and not_modified
+        assert server.requests[-1].headers["if-none-match"] == '"v1"'
+
+        server.version = 2
+        articles, not_modified = await crawl(store, server)
+        assert [a.title for a in articles] == ["新闻 v2"] and not not_modified
+
+    @pytest.mark.asyncio
+    async def test_identical_body(self, store):
+        """测试无 ETag 时按响应体哈希判断"""
+        server = ListServer(etag=False)
+
+        await crawl(store, server)
+        articles, not_modified = await crawl(store, server)
+
+        assert articles == [] and not_modified
+        assert "if-none-match" not in server.requests[-1].headers
+
+    @pytest.mark.asyncio
+    async def test_uncommitted_session(self, store):
+        """测试未提交（抓取中途失败）时下次仍完整解析"""
+        server = ListServer()
+        async with server.client() as client:
+            await SpecParser("demo", SPEC).parse(None, {"url": URL}, client, state=store.session())
+
+        articles, not_modified = await crawl(store, server)
+        assert len(articles) == 1 and not not_modified
+
+
+WATERMARK_SPEC = SourceSpec(
+    list={"format": "json", "path": "list"},
+    fields={"title": "title", "url": "url", "publish_time": "ctime"},
+    watermark={"overlap": 60},
+)
+
+
+def telegraph(times):
+    """按时间倒序的电报列表"""
+    return {"list": [{"title": f"电报{t}", "url": f"https://e/{t}", "ctime": t} for t in sorted(times, reverse=True)]}
+
+
+async def incremental_crawl(store, body, spec=WATERMARK_SPEC, commit=True):
+    """模拟一次增量抓取（不使用条件请求）"""
+    session = store.session(conditional=False)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+    async with httpx.AsyncClient(transport=transport) as client:
+        articles = await SpecParser("cls-telegraph", spec).parse(None, {"url": URL}, client, state=session)
+    if commit:
+        session.commit()
+    return [a.title for a in articles]
+
+
+class TestWatermark:
+    """测试高水位增量解析"""
+
+    @pytest.mark.asyncio
+    async def test_only_new_tail(self, store):
+        """测试只解析高水位之后（含重叠窗口）的条目"""
+        base = 1700000000
+        assert len(await incremental_crawl(store, telegraph([base, base + 100, base + 200]))) == 3
+        assert store.get_watermark("cls-telegraph", URL) == datetime.fromtimestamp(base + 200)
+
+        # 新增 base+300；base+200 在 60 秒重叠窗口内，重新解析（由去重兜底）；更早的不再解析
+        titles = await incremental_crawl(store, telegraph([base, base + 100, base + 200, base + 300]))
+        assert titles == [f"电报{base + 300}", f"电报{base + 200}"]
+        assert store.get_watermark("cls-telegraph", URL) == datetime.fromtimestamp(base + 300)
+
+    @pytest.mark.asyncio
+    async def test_unordered_skips(self, store):
+        """测试非有序列表逐条跳过而不是停止"""
+        spec = SourceSpec(**{**WATERMARK_SPEC.model_dump(), "watermark": {"overlap": 0, "ordered": False}})
+        base = 1700000000
+        await incremental_crawl(store, {"list": [{"title": "a", "url": "u", "ctime": base}]}, spec)
+
+        body = {"list": [
+            {"title": "旧", "url": "u1", "ctime": base - 100},
+            {"title": "新", "url": "u2", "ctime": base + 100},
+        ]}
+        assert await incremental_crawl(store, body, spec) == ["新"]
+
+    @pytest.mark.asyncio
+    async def test_watermark_only_advances_on_commit(self, store):
+        """测试未提交时高水位不前进，且高水位不会后退"""
+        base = 1700000000
+        await incremental_crawl(store, telegraph([base + 500]), commit=False)
+        assert store.get_watermark("cls-telegraph", URL) is None
+
+        await incremental_crawl(store, telegraph([base + 500]))
+        await incremental_crawl(store, telegraph([base]))
+        assert store.get_watermark("cls-telegraph", URL) == datetime.fromtimestamp(base + 500)
+
+    def test_since(self, store):
+        """测试增量起点与关闭增量"""
+        mark = datetime(2025, 1, 1, 12, 0, 0)
+        store.save({}, {("s", URL): mark})
+
+        assert store.session().since("s", URL, 300) == mark - timedelta(seconds=300)
+        assert store.session(incremental=False).since("s", URL, 300) is None
+        assert store.clear("s") == 1
+        assert store.session().since("s", URL, 300) is None
@@ -0,0 +1,170 @@
+"""抓取阶段计时测试"""
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from src.config.models import NewsSource, SourceSpec
+from src.crawlers import spec_engine, universal
+from src.crawlers.resilience import RetryTransport, circuit_breakers
+from src.crawlers.spec_engine import SpecParser
+from src.crawlers.universal import UniversalCrawler
+from src.models import Article
+from src.tools.parse_executor import ParseExecutor
+from src.tools.stage_timer import StageTimer, current_source, current_timer, percentile, timed
+
+SPEC = SourceSpec(
+    list={"format": "json", "path": "list"},
+    fields={"title": "title", "url": "url", "publish_time": "ctime"},
+)
+
+
+@pytest.fixture
+def timer():
+    """设为当前计时器，结束后恢复"""
+    timer = StageTimer()
+    token = current_timer.set(timer)
+    yield timer
+    current_timer.reset(token)
+
+
+class TestStageTimer:
+    """测试样本收集与统计"""
+
+    def test_percentile(self):
+        """测试线性插值分位数"""
+        assert percentile([], 50) == 0.0
+        assert percentile([3.0], 95) == 3.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+        assert percentile(list(range(101)), 95) == 95
+
+    def test_summary(self):
+        """测试按阶段汇总（毫秒）"""
+        timer = StageTimer()
+        for seconds in (0.01, 0.02, 0.03):
+            timer.add("body_fetch", seconds)
+        with pytest.raises(RuntimeError):
+            with timer.stage("db_write"):
+                raise RuntimeError("入库失败")
+
+        summary = timer.summary()
+        assert summary["body_fetch"] == {
+            "count": 3, "total_ms": 60.0, "p50_ms": 20.0, "p95_ms": 29.0, "max_ms": 30.0,
+        }
+        # 异常时同样记录
+        assert summary["db_write"]["count"] == 1
+
+    def test_timed_without_timer(self):
+        """测试没有当前计时器时不计时"""
+        assert current_timer.get() is None
+        with timed("parse"):
+            pass
+        assert current_timer.get() is None
+
+    def test_tasks_inherit_timer(self, timer):
+        """测试计时器设置后创建的任务记入同一计时器"""
+        async def work():
+            with timed("body_fetch"):
+                await asyncio.sleep(0)
+
+        async def main():
+            await asyncio.gather(*[work() for _ in range(3)])
+
+        asyncio.run(main())
+        assert timer.summary()["body_fetch"]["count"] == 3
+
+
+class TestCrawlerStages:
+    """测试抓取各阶段的计时点"""
+
+    @pytest.mark.asyncio
+    async def test_spec_parser_stages(self, timer, monkeypatch):
+        """测试 SpecParser 分别记录列表请求与解析"""
+        monkeypatch.setattr(spec_engine, "parse_executor", ParseExecutor(mode="inline"))
+        body = {"list": [{"title": "新闻", "url": "https://e/1", "ctime": 1700000000}]}
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+        async with httpx.AsyncClient(transport=transport) as client:
+            articles = await SpecParser("demo", SPEC).parse(None, {"url": "https://e/list.json"}, client)
+
+        assert len(articles) == 1
+        summary = timer.summary()
+        assert summary["list_fetch"]["count"] == 1
+        assert summary["parse"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_module_parser_stages(self, timer, monkeypatch):
+        """测试解析器模块整体计为列表抓取，正文逐篇计时"""
+        class ModuleParser:
+            async def parse(self, response, source_config, client=None, limit=20):
+                return [
+                    Article(title=f"新闻{i}", url=f"https://e/{i}", source="demo", publish_time=datetime(2025, 1, 1))
+                    for i in range(3)
+                ]
+
+            async def fetch_content(self, url, client):
+                return f"正文 {url}"
+
+        circuit_breakers.reset()
+        monkeypatch.setattr(universal.parser_registry, "get", lambda s: ModuleParser())
+        crawler = UniversalCrawler(NewsSource(id="timer-demo", name="计时", type="tech", url="https://e/list"))
+        crawler.body_cache = None
+        try:
+            await crawler.fetch()
+        finally:
+            await crawler.close()
+            circuit_breakers.reset()
+
+        summary = timer.summary()
+        assert summary["list_fetch"]["count"] == 1
+        assert summary["body_fetch"]["count"] == 3
+        assert "parse" not in summary
+
+
+class TestCounters:
+    """测试按新闻源的计数"""
+
+    def test_profile_rows(self):
+        """测试 profile 给出合计行与各新闻源的行"""
+        timer = StageTimer()
+        timer.add("body_fetch", 0.01, "a")
+        timer.add("body_fetch", 0.03, "b")
+        timer.count("keyword_front", 2, "a")
+        timer.count("keyword_front", 1, "b")
+
+        profile = timer.profile()
+        stages = {(row["source"], row["stage"]): row["count"] for row in profile["stages"]}
+        assert stages == {("", "body_fetch"): 2, ("a", "body_fetch"): 1, ("b", "body_fetch"): 1}
+        counters = {(row["source"], row["name"]): row["value"] for row in profile["counters"]}
+        assert counters == {("", "keyword_front"): 3, ("a", "keyword_front"): 2, ("b", "keyword_front"): 1}
+
+    @pytest.mark.asyncio
+    async def test_http_counters(self, timer):
+        """测试请求数（含重试）与响应字节数记到当前新闻源"""
+        class Body(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"abc"
+                yield b"de"
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(503)
+            if request.url.path == "/stream":
+                return httpx.Response(200, stream=Body())
+            return httpx.Response(200, content=b"x" * 10)
+
+        token = current_source.set("demo")
+        try:
+            transport = RetryTransport(httpx.MockTransport(handler), retries=1, delay=0, limiter=None)
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.get("https://e/list")
+                await client.get("https://e/stream")
+        finally:
+            current_source.reset(token)
+
+        assert timer.counters[("demo", "http_requests")] == 3
+        assert timer.counters[("demo", "http_bytes")] == 15
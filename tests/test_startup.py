@@ -0,0 +1,44 @@
+"""启动耗时分析测试"""
+
+from src.tools.startup_profile import StartupProfiler, profile_imports
+
+
+class TestStartupProfiler:
+    """测试 StartupProfiler"""
+
+    def test_disabled_records_nothing(self):
+        """测试未启用时不记录"""
+        profiler = StartupProfiler(enabled=False)
+        with profiler.phase("init"):
+            pass
+        profiler.mark("ready")
+        assert profiler.report() == {}
+
+    def test_phases_recorded_in_order(self):
+        """测试按顺序记录阶段耗时"""
+        profiler = StartupProfiler(enabled=True)
+        with profiler.phase("config"):
+            pass
+        with profiler.phase("scheduler"):
+            pass
+        profiler.mark("ready")
+
+        report = profiler.report()
+        assert list(report) == ["config", "scheduler", "ready"]
+        assert all(ms >= 0 for ms in report.values())
+
+    def test_reset(self):
+        """测试重置"""
+        profiler = StartupProfiler(enabled=False)
+        profiler.reset(enabled=True)
+        profiler.mark("ready")
+        assert list(profiler.report()) == ["ready"]
+
+
+def test_profile_imports():
+    """测试导入耗时统计（子进程 -X importtime）"""
+    rows = profile_imports("json", top=5)
+
+    assert rows[0]["module"] == "json"
+    assert rows[0]["cumulative_ms"] >= rows[-1]["cumulative_ms"]
+    assert {"module", "self_ms", "cumulative_ms", "depth"} <= set(rows[0])
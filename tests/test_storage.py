@@ -39,3 +39,62 @@ class TestTimelineDB:
         """测试获取不存在的文章"""
         result = test_db.get_article("nonexistent-id")
         assert result is None
+
+
+class TestFieldProjection:
+    """测试列表字段投影"""
+
+    def _article(self, **kwargs):
+        data = {
+            "title": "英伟达发布新一代芯片",
+            "url": "https://example.com/nvidia",
+            "source": SourceType.THEPAPER,
+            "publish_time": datetime.now(),
+            "tags": ["AI"],
+            "file_path": "data/articles/x.md",
+        }
+        data.update(kwargs)
+        return Article(**data)
+
+    def test_parse_fields_default(self):
+        """测试默认返回精简字段"""
+        assert TimelineDB.parse_fields(None) == TimelineDB.LIST_FIELDS
+        assert TimelineDB.parse_fields("") == TimelineDB.LIST_FIELDS
+
+    def test_parse_fields_all(self):
+        """测试 * 返回全部列"""
+        assert TimelineDB.parse_fields("*") is None
+
+    def test_parse_fields_custom(self):
+        """测试自定义字段（去重、去空格）"""
+        assert TimelineDB.parse_fields("title, url,title") == ("title", "url")
+
+    def test_parse_fields_unknown(self):
+        """测试未知字段被拒绝"""
+        with pytest.raises(ValueError, match="未知字段"):
+            TimelineDB.parse_fields("title,1=1")
+
+    def test_list_articles_projection(self, test_db):
+        """测试投影只返回请求的字段"""
+        test_db.insert_article(self._article())
+
+        articles = test_db.list_articles(limit=10, fields=TimelineDB.LIST_FIELDS)
+        assert len(articles) == 1
+        assert set(articles[0]) == set(TimelineDB.LIST_FIELDS)
+        assert "file_path" not in articles[0]
+        assert "timestamp" not in articles[0]
+
+    def test_list_articles_latest_projection(self, test_db):
+        """测试最新列表投影"""
+        test_db.insert_article(self._article())
+
+        articles = test_db.list_articles_latest(limit=10, fields=("title", "tags"))
+        assert articles == [{"title": "英伟达发布新一代芯片", "tags": '["AI"]'}]
+
+    def test_list_articles_without_projection(self, test_db):
+        """测试不投影时保持原有返回结构"""
+        test_db.insert_article(self._article())
+
+        articles = test_db.list_articles(limit=10)
+        assert articles[0]["file_path"] == "data/articles/x.md"
+        assert articles[0]["timestamp"] == articles[0]["publish_time"]